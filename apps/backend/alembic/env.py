@@ -13,6 +13,8 @@ from app.models.base import Base
 
 # Ensure models are imported so metadata is complete.
 from app.models.academic_record import AcademicRecord  # noqa: F401
+from app.models.import_job import ImportJob  # noqa: F401
+from app.models.prediction_audit import PredictionAuditEvent  # noqa: F401
 from app.models.refresh_token import RefreshToken  # noqa: F401
 from app.models.user import User  # noqa: F401
 
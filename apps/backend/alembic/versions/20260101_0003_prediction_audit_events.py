@@ -0,0 +1,49 @@
+"""add prediction audit events
+
+Revision ID: 20260101_0003
+Revises: 20260101_0002
+Create Date: 2026-01-01
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20260101_0003"
+down_revision = "20260101_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "prediction_audit_events",
+        sa.Column("id", sa.Uuid(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("endpoint", sa.String(length=32), nullable=False),
+        sa.Column("caller_user_id", sa.Uuid(as_uuid=True), nullable=False),
+        sa.Column("caller_role", sa.String(length=16), nullable=False),
+        sa.Column("student_user_id", sa.Uuid(as_uuid=True), nullable=True),
+        sa.Column("academic_record_id", sa.Uuid(as_uuid=True), nullable=True),
+        sa.Column("model_version", sa.String(length=64), nullable=False),
+        sa.Column("inference_mode", sa.String(length=16), nullable=False),
+        sa.Column("degraded", sa.Boolean(), nullable=False),
+        # Null when the caller saw a probability without a threshold (/ml/explain, ensemble mode).
+        sa.Column("threshold", sa.Float(), nullable=True),
+        sa.Column("risk_probability", sa.Float(), nullable=False),
+        sa.Column("classification", sa.String(length=16), nullable=True),
+        sa.Column("inputs", sa.JSON(), nullable=False),
+    )
+    op.create_index("ix_prediction_audit_events_created_at", "prediction_audit_events", ["created_at"])
+    op.create_index("ix_prediction_audit_events_caller_user_id", "prediction_audit_events", ["caller_user_id"])
+    op.create_index("ix_prediction_audit_events_student_user_id", "prediction_audit_events", ["student_user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_prediction_audit_events_student_user_id", table_name="prediction_audit_events")
+    op.drop_index("ix_prediction_audit_events_caller_user_id", table_name="prediction_audit_events")
+    op.drop_index("ix_prediction_audit_events_created_at", table_name="prediction_audit_events")
+    op.drop_table("prediction_audit_events")
@@ -0,0 +1,29 @@
+"""add users.password_setup_required
+
+Revision ID: 20260101_0004
+Revises: 20260101_0003
+Create Date: 2026-01-01
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20260101_0004"
+down_revision = "20260101_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("password_setup_required", sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "password_setup_required")
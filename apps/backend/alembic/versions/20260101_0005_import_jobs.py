@@ -0,0 +1,64 @@
+"""add import jobs
+
+Revision ID: 20260101_0005
+Revises: 20260101_0004
+Create Date: 2026-01-01
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20260101_0005"
+down_revision = "20260101_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "import_jobs",
+        sa.Column("id", sa.Uuid(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column(
+            "created_by_user_id",
+            sa.Uuid(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "status",
+            sa.Enum("queued", "running", "succeeded", "failed", name="import_job_status"),
+            nullable=False,
+        ),
+        sa.Column("filename", sa.String(length=255), nullable=False),
+        sa.Column("staged_path", sa.String(length=1024), nullable=False),
+        sa.Column("total_bytes", sa.Integer(), nullable=False),
+        sa.Column("dry_run", sa.Boolean(), nullable=False),
+        sa.Column("allow_create_students", sa.Boolean(), nullable=False),
+        sa.Column("units_done", sa.Integer(), nullable=False),
+        sa.Column("rows_processed", sa.Integer(), nullable=False),
+        sa.Column("bytes_processed", sa.Integer(), nullable=False),
+        sa.Column("created", sa.Integer(), nullable=False),
+        sa.Column("error_count", sa.Integer(), nullable=False),
+        sa.Column("errors", sa.JSON(), nullable=False),
+        sa.Column("failure", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        # Worker holding the job and when it last renewed its claim.
+        sa.Column("claimed_by", sa.String(length=64), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_import_jobs_created_by_user_id", "import_jobs", ["created_by_user_id"])
+    op.create_index("ix_import_jobs_status", "import_jobs", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_jobs_status", table_name="import_jobs")
+    op.drop_index("ix_import_jobs_created_by_user_id", table_name="import_jobs")
+    op.drop_table("import_jobs")
+    # Drop the Postgres ENUM type along with the table (as in the initial migration).
+    sa.Enum(name="import_job_status").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,68 @@
+"""unique academic record per student and term; import upsert counters
+
+Revision ID: 20260101_0006
+Revises: 20260101_0005
+Create Date: 2026-01-01
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20260101_0006"
+down_revision = "20260101_0005"
+branch_labels = None
+depends_on = None
+
+
+# Duplicates removed by the upgrade are kept here, and put back by the downgrade.
+BACKUP_TABLE = "academic_records_dedup_0006"
+_COLUMNS = (
+    "id, student_user_id, attendance_pct, assignments_pct, quizzes_pct, exams_pct, gpa, term, created_at, updated_at"
+)
+
+
+def upgrade() -> None:
+    # Re-imports used to duplicate records; keep the most recent one per (student, term).
+    op.execute(
+        f"""
+        CREATE TABLE {BACKUP_TABLE} AS
+        SELECT {_COLUMNS} FROM academic_records
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT
+                    id,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY student_user_id, term
+                        ORDER BY updated_at DESC, created_at DESC, id DESC
+                    ) AS rn
+                FROM academic_records
+                WHERE term IS NOT NULL
+            ) ranked
+            WHERE rn > 1
+        )
+        """
+    )
+    op.execute(f"DELETE FROM academic_records WHERE id IN (SELECT id FROM {BACKUP_TABLE})")
+    op.create_index(
+        "uq_academic_records_student_term",
+        "academic_records",
+        ["student_user_id", "term"],
+        unique=True,
+    )
+
+    op.add_column("import_jobs", sa.Column("upsert", sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.add_column("import_jobs", sa.Column("updated", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("import_jobs", sa.Column("unchanged", sa.Integer(), server_default="0", nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("import_jobs", "unchanged")
+    op.drop_column("import_jobs", "updated")
+    op.drop_column("import_jobs", "upsert")
+    op.drop_index("uq_academic_records_student_term", table_name="academic_records")
+    op.execute(f"INSERT INTO academic_records ({_COLUMNS}) SELECT {_COLUMNS} FROM {BACKUP_TABLE}")
+    op.drop_table(BACKUP_TABLE)
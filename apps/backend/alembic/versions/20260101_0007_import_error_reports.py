@@ -0,0 +1,30 @@
+"""import job error counts and error reports
+
+Revision ID: 20260101_0007
+Revises: 20260101_0006
+Create Date: 2026-01-01
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "20260101_0007"
+down_revision = "20260101_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("import_jobs", sa.Column("error_counts", sa.JSON(), server_default=sa.text("'{}'"), nullable=False))
+    op.add_column("import_jobs", sa.Column("error_report_id", sa.Uuid(as_uuid=True), nullable=True))
+    op.add_column("import_jobs", sa.Column("error_report_bytes", sa.Integer(), server_default="0", nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("import_jobs", "error_report_bytes")
+    op.drop_column("import_jobs", "error_report_id")
+    op.drop_column("import_jobs", "error_counts")
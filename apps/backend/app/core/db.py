@@ -2,18 +2,11 @@ from __future__ import annotations
 
 from functools import lru_cache
 
-from pathlib import Path
-
 from urllib.parse import urlparse
 
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
-from app.core.settings import get_settings
-
-
-def _backend_root() -> Path:
-    # apps/backend/app/core/db.py -> parents[2] == apps/backend
-    return Path(__file__).resolve().parents[2]
+from app.core.settings import backend_root, get_settings
 
 
 def _normalize_database_url(database_url: str) -> str:
@@ -39,7 +32,7 @@ def _normalize_database_url(database_url: str) -> str:
     p = parsed.path or ""
     if p.startswith("/./") or p.startswith("/../"):
         rel = p.lstrip("/")  # './edupredict.db'
-        abs_path = (_backend_root() / rel).resolve().as_posix()
+        abs_path = (backend_root() / rel).resolve().as_posix()
         return f"{parsed.scheme}:///{abs_path}"
 
     return database_url
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import hashlib
+import secrets
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, Literal
@@ -17,6 +18,11 @@ pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
 TokenType = Literal["access", "refresh"]
 
+# Stored instead of a hash for accounts that have never set a password (e.g. students
+# auto-created by a CSV import). No password verifies against it, and producing one
+# costs nothing, unlike hashing a throwaway random password.
+UNUSABLE_PASSWORD_PREFIX = "!"
+
 
 def utcnow() -> datetime:
     return datetime.now(timezone.utc)
@@ -27,9 +33,20 @@ def hash_password(password: str) -> str:
 
 
 def verify_password(password: str, password_hash: str) -> bool:
+    if not is_password_usable(password_hash):
+        return False
     return pwd_context.verify(password, password_hash)
 
 
+def make_unusable_password() -> str:
+    # The random suffix keeps marker values distinct, like real hashes.
+    return UNUSABLE_PASSWORD_PREFIX + secrets.token_hex(16)
+
+
+def is_password_usable(password_hash: str | None) -> bool:
+    return password_hash is not None and not password_hash.startswith(UNUSABLE_PASSWORD_PREFIX)
+
+
 def _base_claims() -> dict[str, Any]:
     settings = get_settings()
     return {
@@ -7,10 +7,16 @@ from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+def backend_root() -> Path:
+    """apps/backend; relative paths in the settings are resolved against it."""
+    # apps/backend/app/core/settings.py -> parents[2] == apps/backend
+    return Path(__file__).resolve().parents[2]
+
+
 class Settings(BaseSettings):
     # Load env from apps/backend/.env regardless of the process working directory.
     model_config = SettingsConfigDict(
-        env_file=str(Path(__file__).resolve().parents[2] / ".env"),
+        env_file=str(backend_root() / ".env"),
         env_prefix="",
         extra="ignore",
     )
@@ -42,6 +48,58 @@ class Settings(BaseSettings):
     # ML artifact registry
     model_registry_path: str = "ml_registry"
 
+    # Pinned-version inference: how many registry versions stay loaded in memory, and how
+    # many cold versions may be loaded from disk at the same time.
+    model_cache_size: int = 4
+    model_max_concurrent_loads: int = 2
+
+    # Degraded mode for /ml/predict and /ml/explain: default per-request latency budget
+    # (0 = none unless the request sets latency_budget_ms), how many inference calls may be
+    # in flight before new ones are shed to the fallback, and the inference pool size.
+    ml_latency_budget_ms: int = 0
+    inference_max_inflight: int = 32
+    inference_workers: int = 4
+    explain_cache_size: int = 1024
+
+    # Shadow scoring: fraction of /ml/predict calls also scored by the SHADOW version,
+    # and how many shadow jobs may queue before new samples are dropped.
+    shadow_sample_rate: float = 0.1
+    shadow_max_pending: int = 64
+
+    # Prediction audit log (write-behind): events are queued in memory and bulk-inserted
+    # every `audit_flush_interval_ms` or once `audit_flush_batch` are pending. When
+    # `audit_queue_size` events are waiting, requests wait for a flush (backpressure).
+    audit_enabled: bool = True
+    audit_queue_size: int = 10000
+    audit_flush_batch: int = 500
+    audit_flush_interval_ms: int = 1000
+
+    # CSV import: rows parsed, validated and inserted per chunk (each chunk is committed),
+    # and how many row errors are returned in the response as a sample (all of them go to
+    # the downloadable error report).
+    import_chunk_size: int = 1000
+    import_max_reported_errors: int = 100
+
+    # Import error reports (NDJSON): directory (empty: the system temp dir; relative paths are
+    # under apps/backend) and how long they are kept.
+    import_report_path: str = ""
+    import_report_ttl_hours: int = 24
+
+    # Uploads of at least IMPORT_PARALLEL_MIN_BYTES are split into shards of about
+    # IMPORT_SHARD_BYTES and parsed in a pool of IMPORT_PARSE_WORKERS processes
+    # (0: one per CPU core; 1: always parse in-process).
+    import_parse_workers: int = 0
+    import_parallel_min_bytes: int = 32 * 1024 * 1024
+    import_shard_bytes: int = 8 * 1024 * 1024
+
+    # Import jobs (job mode of /academics/import): where uploads are staged on disk
+    # (relative paths are under apps/backend) and how many jobs run at once per worker.
+    # A running job that has not checkpointed for IMPORT_JOB_LEASE_SECONDS is taken to
+    # have lost its worker and may be resumed by another one when it starts.
+    import_staging_path: str = "import_staging"
+    import_max_concurrent_jobs: int = 1
+    import_job_lease_seconds: int = 600
+
     @field_validator("cors_allow_origins", mode="before")
     @classmethod
     def _parse_cors_allow_origins(cls, v):
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from fastapi import Request
+
+from app.services.import_jobs import ImportJobRunner
+from app.services.import_parsing import ParsePool
+
+
+def get_import_jobs(request: Request) -> ImportJobRunner:
+    """Per-app background import runner (job mode of `/academics/import`)."""
+    runner: ImportJobRunner = request.app.state.import_jobs
+    return runner
+
+
+def get_import_parse_pool(request: Request) -> ParsePool:
+    """Per-app process pool for parsing large imports."""
+    pool: ParsePool = request.app.state.import_parse_pool
+    return pool
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from fastapi import Request
+
+from app.ml.similarity import SimilarityIndex
+from app.services.prediction_audit import PredictionAuditLog
+
+
+def get_similarity_index(request: Request) -> SimilarityIndex:
+    """Per-app similar-students index (built on first use, see `/ml/similar`)."""
+    index: SimilarityIndex = request.app.state.similarity_index
+    return index
+
+
+def get_prediction_audit(request: Request) -> PredictionAuditLog:
+    audit: PredictionAuditLog = request.app.state.prediction_audit
+    return audit
@@ -1,8 +1,40 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.settings import get_settings
+from app.ml.degrade import get_inference_gate
+from app.ml.inference import get_version_cache
+from app.ml.shadow import get_shadow_scorer
+from app.ml.similarity import SimilarityIndex
 from app.routers import academics, admin, auth, bootstrap, health, ml, users
+from app.services.import_jobs import create_import_job_runner
+from app.services.import_parsing import create_parse_pool
+from app.services.prediction_audit import create_prediction_audit
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    # Pick up import jobs interrupted by the last shutdown (or crash).
+    try:
+        await app.state.import_jobs.resume_pending()
+    except Exception:
+        logger.exception("Could not resume pending import jobs")
+    yield
+    # Stop running import jobs (they resume on the next start).
+    await app.state.import_jobs.close()
+    await asyncio.to_thread(app.state.import_parse_pool.shutdown)
+    # Write out audit events still queued in memory.
+    await app.state.prediction_audit.close()
+    # Stop the ML worker threads.
+    get_shadow_scorer().shutdown()
+    get_version_cache().shutdown()
+    get_inference_gate().shutdown()
 
 
 def create_app() -> FastAPI:
@@ -11,6 +43,18 @@ def create_app() -> FastAPI:
         title="EduPredict API",
         version="0.1.0",
         description="EduPredict backend: RBAC + ML prediction + explainability.",
+        lifespan=_lifespan,
+    )
+
+    # Similar-students k-NN index; built on first /ml/similar call, then kept in sync on writes.
+    app.state.similarity_index = SimilarityIndex()
+    # Write-behind log of every prediction served by /ml/predict and /ml/assess.
+    app.state.prediction_audit = create_prediction_audit()
+    # Worker processes for parsing large CSV imports; started on first use.
+    app.state.import_parse_pool = create_parse_pool()
+    # Background CSV imports (job mode of /academics/import); resumed on startup.
+    app.state.import_jobs = create_import_job_runner(
+        similarity=app.state.similarity_index, parse_pool=app.state.import_parse_pool
     )
 
     @app.get("/", tags=["meta"])
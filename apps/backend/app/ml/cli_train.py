@@ -13,6 +13,7 @@ def main() -> int:
     parser.add_argument("--csv", required=True, help="Path to CSV with academic record columns.")
     parser.add_argument("--label-column", default="at_risk", help="Optional label column name.")
     parser.add_argument("--notes", default="", help="Optional notes stored in metadata.")
+    parser.add_argument("--distill", action="store_true", help="Also fit a small student model for fast inference.")
 
     args = parser.parse_args()
 
@@ -20,12 +21,14 @@ def main() -> int:
     version, meta = train_from_dataframe(
         df,
         dataset_cfg=DatasetConfig(label_column=args.label_column),
-        train_cfg=TrainConfig(),
+        train_cfg=TrainConfig(distill=args.distill),
         notes=args.notes,
     )
 
     print(f"Trained and saved model version: {version}")
     print(f"Metrics: {meta.metrics}")
+    if meta.distilled_fidelity:
+        print(f"Distilled student fidelity: {meta.distilled_fidelity}")
     return 0
 
 
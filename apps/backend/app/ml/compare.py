@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.ml.metrics import evaluate_binary
+
+DELTA_QUANTILES: tuple[float, ...] = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+DELTA_HIST_EDGES: tuple[float, ...] = (-1.0, -0.2, -0.1, -0.05, -0.01, 0.01, 0.05, 0.1, 0.2, 1.0)
+
+
+def delta_distribution(delta: np.ndarray) -> dict[str, Any]:
+    """Summary of `p_candidate - p_baseline` over a batch."""
+    if delta.size == 0:
+        return {"mean": 0.0, "std": 0.0, "mean_abs": 0.0, "min": 0.0, "max": 0.0, "quantiles": {}, "histogram": []}
+
+    qs = np.quantile(delta, DELTA_QUANTILES)
+    counts, edges = np.histogram(delta, bins=np.asarray(DELTA_HIST_EDGES))
+    return {
+        "mean": float(delta.mean()),
+        "std": float(delta.std()),
+        "mean_abs": float(np.abs(delta).mean()),
+        "min": float(delta.min()),
+        "max": float(delta.max()),
+        "quantiles": {f"p{int(round(q * 100))}": float(v) for q, v in zip(DELTA_QUANTILES, qs, strict=True)},
+        "histogram": [
+            {"low": float(lo), "high": float(hi), "count": int(c)}
+            for lo, hi, c in zip(edges[:-1], edges[1:], counts, strict=True)
+        ],
+    }
+
+
+def compare_probabilities(
+    p_base: np.ndarray,
+    p_cand: np.ndarray,
+    *,
+    threshold: float,
+    y_true: np.ndarray | None = None,
+    group_ids: np.ndarray | None = None,
+) -> dict[str, Any]:
+    """Compare two score vectors computed on the same rows.
+
+    - `y_true` enables metric deltas (candidate minus baseline).
+    - `group_ids` (e.g. student ids) additionally counts distinct groups with any flip.
+    """
+
+    p_base = np.asarray(p_base, dtype=float)
+    p_cand = np.asarray(p_cand, dtype=float)
+    flag_base = p_base >= threshold
+    flag_cand = p_cand >= threshold
+    flipped = flag_base != flag_cand
+
+    out: dict[str, Any] = {
+        "rows": int(p_base.size),
+        "threshold": float(threshold),
+        "delta": delta_distribution(p_cand - p_base),
+        "flagged_baseline": int(flag_base.sum()),
+        "flagged_candidate": int(flag_cand.sum()),
+        "flips_to_at_risk": int((flag_cand & ~flag_base).sum()),
+        "flips_to_not_at_risk": int((flag_base & ~flag_cand).sum()),
+        "flipped_rows": int(flipped.sum()),
+        "flipped_students": None,
+        "metrics_baseline": None,
+        "metrics_candidate": None,
+        "metric_deltas": None,
+    }
+
+    if group_ids is not None and p_base.size:
+        out["flipped_students"] = int(np.unique(np.asarray(group_ids)[flipped]).size)
+
+    if y_true is not None and p_base.size:
+        mb = evaluate_binary(y_true, p_base)
+        mc = evaluate_binary(y_true, p_cand)
+        out["metrics_baseline"] = mb
+        out["metrics_candidate"] = mc
+        out["metric_deltas"] = {k: float(mc[k] - mb[k]) for k in mb if k in mc}
+
+    return out
+
+
+def score_pair(baseline: Any, candidate: Any, x: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Score one preprocessed matrix with two artifacts (one batched call each)."""
+    return (
+        np.asarray(baseline.predict_proba(x), dtype=float),
+        np.asarray(candidate.predict_proba(x), dtype=float),
+    )
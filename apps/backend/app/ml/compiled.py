@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# Missing-value handling codes (LightGBM semantics).
+_MISSING_NONE = 0  # NaN is treated as 0.0
+_MISSING_ZERO = 1  # 0.0 and NaN follow default_left
+_MISSING_NAN = 2  # NaN follows default_left
+
+
+@dataclass(frozen=True)
+class FlatForest:
+    """A tree ensemble flattened into parallel NumPy arrays.
+
+    Node `i` is a leaf when `feature[i] < 0`; otherwise rows with
+    `x[feature[i]] <= threshold[i]` go to `left[i]` and the rest to `right[i]`.
+    Children indices are global, so every tree is evaluated at once: each
+    traversal step advances the (rows x trees) matrix of current nodes by one
+    level, and leaves point to themselves so finished trees stay put.
+    """
+
+    feature: np.ndarray  # int32
+    threshold: np.ndarray  # float64
+    left: np.ndarray  # int32
+    right: np.ndarray  # int32
+    value: np.ndarray  # float64 (leaf output, 0 for internal nodes)
+    default_left: np.ndarray  # bool
+    missing: np.ndarray  # int8, see _MISSING_*
+    roots: np.ndarray  # int32
+    depth: int
+    scale: float = 1.0
+    base: float = 0.0
+    float32_inputs: bool = False
+
+    @property
+    def n_trees(self) -> int:
+        return int(self.roots.size)
+
+    def raw_predict(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float32 if self.float32_inputs else np.float64)
+        n = x.shape[0]
+        if n == 0:
+            return np.zeros(0, dtype=float)
+
+        # children[:, 0] is the left child, children[:, 1] the right one.
+        children = np.stack([self.left, self.right], axis=1)
+        # Missing-value routing is only needed when some input could trigger it.
+        needs_missing = bool(np.isnan(x).any()) or bool((self.missing == _MISSING_ZERO).any())
+
+        rows = np.arange(n)[:, None]
+        idx = np.broadcast_to(self.roots, (n, self.n_trees)).copy()
+        for _ in range(self.depth):
+            feat = self.feature[idx]
+            if not (feat >= 0).any():
+                break
+            # Leaves have feature -1 (reads the last column) but point to themselves,
+            # so whatever the comparison says they stay where they are.
+            xv = x[rows, feat]
+            if needs_missing:
+                miss = self.missing[idx]
+                isnan = np.isnan(xv)
+                xv = np.where(isnan & (miss == _MISSING_NONE), 0.0, xv)
+                is_missing = (isnan & (miss != _MISSING_NONE)) | ((miss == _MISSING_ZERO) & (xv == 0.0))
+                go_right = np.where(is_missing, ~self.default_left[idx], ~(xv <= self.threshold[idx]))
+            else:
+                go_right = ~(xv <= self.threshold[idx])
+            idx = children[idx, go_right.astype(np.intp)]
+
+        return np.asarray(self.base + self.scale * self.value[idx].sum(axis=1), dtype=float)
+
+    @classmethod
+    def from_lightgbm(cls, booster: Any) -> tuple[FlatForest, float]:
+        """Flatten a LightGBM binary booster; returns (forest, sigmoid scale)."""
+        dump = booster.dump_model()
+        if int(dump.get("num_tree_per_iteration", 1)) != 1 or dump.get("average_output"):
+            raise NotImplementedError("Only single-output, non-averaged boosters are supported")
+
+        sigmoid = 1.0
+        for tok in str(dump.get("objective", "")).split():
+            if tok.startswith("sigmoid:"):
+                sigmoid = float(tok.split(":", 1)[1])
+
+        b = _Builder()
+        for tree in dump["tree_info"]:
+            b.add_root(b.add_lgbm_node(tree["tree_structure"]))
+        return b.build(), sigmoid
+
+    @classmethod
+    def from_sklearn_gbr(cls, model: Any) -> FlatForest:
+        """Flatten a fitted sklearn GradientBoostingRegressor (squared-error loss)."""
+        if getattr(model, "init_", None) is None or model.init_ == "zero":
+            raise NotImplementedError("GradientBoostingRegressor without a fitted init estimator")
+
+        b = _Builder()
+        for est in np.asarray(model.estimators_).reshape(-1):
+            b.add_root(b.add_sklearn_tree(est.tree_))
+        base = float(np.asarray(model.init_.constant_).reshape(-1)[0])
+        return b.build(scale=float(model.learning_rate), base=base, float32_inputs=True)
+
+
+class _Builder:
+    def __init__(self) -> None:
+        self.feature: list[int] = []
+        self.threshold: list[float] = []
+        self.left: list[int] = []
+        self.right: list[int] = []
+        self.value: list[float] = []
+        self.default_left: list[bool] = []
+        self.missing: list[int] = []
+        self.roots: list[int] = []
+        self.depth = 0
+
+    def _new(self) -> int:
+        i = len(self.feature)
+        self.feature.append(-1)
+        self.threshold.append(0.0)
+        self.left.append(i)
+        self.right.append(i)
+        self.value.append(0.0)
+        self.default_left.append(True)
+        self.missing.append(_MISSING_NONE)
+        return i
+
+    def add_root(self, root: int) -> None:
+        self.roots.append(root)
+
+    def add_lgbm_node(self, node: dict[str, Any], depth: int = 0) -> int:
+        i = self._new()
+        self.depth = max(self.depth, depth)
+        if "leaf_value" in node:
+            self.value[i] = float(node["leaf_value"])
+            return i
+
+        if node.get("decision_type", "<=") != "<=":
+            raise NotImplementedError("Categorical splits are not supported")
+
+        self.feature[i] = int(node["split_feature"])
+        self.threshold[i] = float(node["threshold"])
+        self.default_left[i] = bool(node.get("default_left", True))
+        self.missing[i] = {"None": _MISSING_NONE, "Zero": _MISSING_ZERO, "NaN": _MISSING_NAN}[
+            str(node.get("missing_type", "None"))
+        ]
+        self.left[i] = self.add_lgbm_node(node["left_child"], depth + 1)
+        self.right[i] = self.add_lgbm_node(node["right_child"], depth + 1)
+        return i
+
+    def add_sklearn_tree(self, tree: Any) -> int:
+        offset = len(self.feature)
+        n = int(tree.node_count)
+        for _ in range(n):
+            self._new()
+
+        is_leaf = tree.children_left == -1
+        for j in range(n):
+            i = offset + j
+            if is_leaf[j]:
+                self.value[i] = float(tree.value[j].reshape(-1)[0])
+            else:
+                self.feature[i] = int(tree.feature[j])
+                self.threshold[i] = float(tree.threshold[j])
+                self.left[i] = offset + int(tree.children_left[j])
+                self.right[i] = offset + int(tree.children_right[j])
+                # sklearn trees see no NaN after preprocessing; keep the "None" default.
+        self.depth = max(self.depth, int(tree.max_depth))
+        return offset
+
+    def build(self, *, scale: float = 1.0, base: float = 0.0, float32_inputs: bool = False) -> FlatForest:
+        return FlatForest(
+            feature=np.asarray(self.feature, dtype=np.int32),
+            threshold=np.asarray(self.threshold, dtype=np.float64),
+            left=np.asarray(self.left, dtype=np.int32),
+            right=np.asarray(self.right, dtype=np.int32),
+            value=np.asarray(self.value, dtype=np.float64),
+            default_left=np.asarray(self.default_left, dtype=bool),
+            missing=np.asarray(self.missing, dtype=np.int8),
+            roots=np.asarray(self.roots, dtype=np.int32),
+            depth=self.depth,
+            scale=scale,
+            base=base,
+            float32_inputs=float32_inputs,
+        )
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return np.asarray(1.0 / (1.0 + np.exp(-z)), dtype=float)
+
+
+@dataclass(frozen=True)
+class CompiledEnsemble:
+    """Wrapper-free scorer for an `EnsembleArtifact`.
+
+    - logistic half: standardization + dot product from the stored coefficients
+    - LightGBM half: vectorized traversal of the flattened booster
+    - optional distilled student: flattened the same way
+
+    Mirrors the `EnsembleArtifact` scoring API so it can be used interchangeably.
+    It wins at small batch sizes (request path), where sklearn/LightGBM wrapper
+    overhead dominates; for bulk scoring the native LightGBM path is faster.
+    """
+
+    feature_names: list[str]
+    lr_mean: np.ndarray
+    lr_scale: np.ndarray
+    lr_coef: np.ndarray
+    lr_intercept: float
+    forest: FlatForest
+    sigmoid: float = 1.0
+    student: FlatForest | None = None
+
+    @classmethod
+    def from_artifact(cls, artifact: Any) -> CompiledEnsemble:
+        scaler = artifact.logistic.named_steps["scaler"]
+        clf = artifact.logistic.named_steps["clf"]
+        if np.asarray(clf.coef_).shape[0] != 1:
+            raise NotImplementedError("Only binary logistic models are supported")
+
+        forest, sigmoid = FlatForest.from_lightgbm(artifact.lgbm.booster_)
+        student = getattr(artifact, "student", None)
+
+        mean = getattr(scaler, "mean_", None)
+        scale = getattr(scaler, "scale_", None)
+        n = len(artifact.feature_names)
+        return cls(
+            feature_names=list(artifact.feature_names),
+            lr_mean=np.zeros(n) if mean is None else np.asarray(mean, dtype=float),
+            lr_scale=np.ones(n) if scale is None else np.asarray(scale, dtype=float),
+            lr_coef=np.asarray(clf.coef_, dtype=float).reshape(-1),
+            lr_intercept=float(np.asarray(clf.intercept_).reshape(-1)[0]),
+            forest=forest,
+            sigmoid=sigmoid,
+            student=FlatForest.from_sklearn_gbr(student) if student is not None else None,
+        )
+
+    def matrix(self, x: pd.DataFrame | np.ndarray) -> np.ndarray:
+        if isinstance(x, pd.DataFrame):
+            return np.asarray(x[self.feature_names].to_numpy(dtype=np.float64))
+        return np.asarray(x, dtype=np.float64)
+
+    def logistic_margin(self, x: pd.DataFrame | np.ndarray) -> np.ndarray:
+        z = ((self.matrix(x) - self.lr_mean) / self.lr_scale) @ self.lr_coef + self.lr_intercept
+        return np.asarray(z, dtype=float)
+
+    def lgbm_margin(self, x: pd.DataFrame | np.ndarray) -> np.ndarray:
+        return self.forest.raw_predict(self.matrix(x))
+
+    def predict_proba(self, x: pd.DataFrame | np.ndarray) -> np.ndarray:
+        m = self.matrix(x)
+        p1 = _sigmoid(self.logistic_margin(m))
+        p2 = _sigmoid(self.sigmoid * self.lgbm_margin(m))
+        return np.clip(0.5 * p1 + 0.5 * p2, 0.0, 1.0)
+
+    def predict_proba_logistic(self, x: pd.DataFrame | np.ndarray) -> np.ndarray:
+        return np.asarray(np.clip(_sigmoid(self.logistic_margin(x)), 0.0, 1.0), dtype=float)
+
+    @property
+    def has_student(self) -> bool:
+        return self.student is not None
+
+    def predict_proba_fast(self, x: pd.DataFrame | np.ndarray) -> np.ndarray:
+        if self.student is None:
+            return self.predict_proba(x)
+        return np.asarray(np.clip(self.student.raw_predict(self.matrix(x)), 0.0, 1.0), dtype=float)
+
+    def predict_label(self, x: pd.DataFrame | np.ndarray, *, threshold: float = 0.5) -> np.ndarray:
+        return (self.predict_proba(x) >= threshold).astype(int)
+
+
+def compile_artifact(artifact: Any) -> CompiledEnsemble | None:
+    """Best-effort compilation; returns None when the artifact has an unsupported shape."""
+    try:
+        return CompiledEnsemble.from_artifact(artifact)
+    except (AttributeError, KeyError, NotImplementedError, TypeError, ValueError):
+        return None
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.ml.preprocess import PreprocessConfig, preprocess_records
+
+PCT_FEATURES: tuple[str, ...] = ("attendance_pct", "assignments_pct", "quizzes_pct", "exams_pct")
+GPA_FEATURE = "gpa"
+
+
+@dataclass(frozen=True)
+class FeatureChange:
+    feature: str
+    current_value: float
+    # None when no value in the feature's range crosses the threshold on its own.
+    required_value: float | None
+    delta: float | None
+    probability: float | None
+
+
+@dataclass(frozen=True)
+class CounterfactualResult:
+    probability: float
+    at_risk: bool
+    changes: list[FeatureChange]
+    variants_scored: int
+
+
+def _candidates(current: float, *, step: float, low: float, high: float, upward: bool) -> np.ndarray:
+    """Values from `current` towards `high` (or `low`) in `step` increments, ending on the bound."""
+    if upward:
+        vals = np.arange(current + step, high, step)
+        vals = np.append(vals, high) if current < high else vals
+    else:
+        vals = np.arange(current - step, low, -step)
+        vals = np.append(vals, low) if current > low else vals
+    return np.round(vals, 6)
+
+
+def build_grid(
+    row: pd.Series,
+    *,
+    upward: bool,
+    pct_step: float = 5.0,
+    gpa_step: float = 0.1,
+    cfg: PreprocessConfig | None = None,
+) -> tuple[pd.DataFrame, list[tuple[str, np.ndarray]]]:
+    """Raw feature grid: row 0 is the current record, then one block per feature
+    where only that feature moves. Returns (grid, [(feature, candidate values)])."""
+
+    cfg = cfg or PreprocessConfig()
+    bounds: dict[str, tuple[float, float, float]] = {feat: (cfg.pct_clip_low, cfg.pct_clip_high, pct_step) for feat in PCT_FEATURES}
+    bounds[GPA_FEATURE] = (cfg.gpa_clip_low, cfg.gpa_clip_high, gpa_step)
+    blocks = [
+        (feat, _candidates(float(row[feat]), step=step, low=low, high=high, upward=upward))
+        for feat, (low, high, step) in bounds.items()
+    ]
+
+    cols = [*PCT_FEATURES, GPA_FEATURE]
+    n = 1 + sum(len(v) for _, v in blocks)
+    grid = np.tile(row[cols].to_numpy(dtype=float), (n, 1))
+    start = 1
+    for feat, vals in blocks:
+        grid[start : start + len(vals), cols.index(feat)] = vals
+        start += len(vals)
+    return pd.DataFrame(grid, columns=cols), blocks
+
+
+def counterfactuals(
+    scorer: Any,
+    x_raw: pd.DataFrame,
+    *,
+    threshold: float = 0.5,
+    pct_step: float = 5.0,
+    gpa_step: float = 0.1,
+) -> CounterfactualResult:
+    """Smallest single-feature change that moves the record across `threshold`.
+
+    At-risk records are searched upwards (improvements needed to drop below the
+    threshold); other records downwards (how much slack is left). The whole grid
+    is preprocessed and scored with one batched `predict_proba` call.
+    """
+
+    row = preprocess_records(x_raw).iloc[0]
+    # The search direction depends on the current score, which is not known yet:
+    # stack the upward and downward grids (sharing the current row) and score once.
+    up, up_blocks = build_grid(row, upward=True, pct_step=pct_step, gpa_step=gpa_step)
+    down, down_blocks = build_grid(row, upward=False, pct_step=pct_step, gpa_step=gpa_step)
+    grid = pd.concat([up, down.iloc[1:]], ignore_index=True)
+    proba = np.asarray(scorer.predict_proba(preprocess_records(grid)), dtype=float)
+
+    p_now = float(proba[0])
+    at_risk = p_now >= threshold
+    blocks = up_blocks if at_risk else down_blocks
+    block_proba = proba[1:] if at_risk else proba[len(up) :]
+
+    changes: list[FeatureChange] = []
+    start = 0
+    for feat, vals in blocks:
+        p = block_proba[start : start + len(vals)]
+        start += len(vals)
+        crossed = (p < threshold) if at_risk else (p >= threshold)
+        current = float(row[feat])
+        if not crossed.any():
+            changes.append(FeatureChange(feat, current, None, None, None))
+            continue
+        # Candidates are ordered by distance from the current value.
+        i = int(np.argmax(crossed))
+        changes.append(FeatureChange(feat, current, float(vals[i]), float(vals[i] - current), float(p[i])))
+
+    return CounterfactualResult(probability=p_now, at_risk=at_risk, changes=changes, variants_scored=int(len(grid)))
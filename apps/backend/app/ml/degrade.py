@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from app.core.settings import get_settings
+
+T = TypeVar("T")
+
+REASON_BUDGET = "budget"
+REASON_QUEUE = "queue"
+
+
+@dataclass
+class EndpointCounters:
+    requests: int = 0
+    degraded: int = 0
+    by_reason: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "degraded": self.degraded,
+            "fallback_rate": self.degraded / self.requests if self.requests else 0.0,
+            "by_reason": dict(self.by_reason),
+        }
+
+
+class InferenceGate:
+    """Latency budgets and load shedding for the ML request path.
+
+    Every predict/explain call holds a slot while its model work runs. When
+    more than `max_inflight` calls are already running (including ones that
+    overran their budget and are still finishing in the background), new
+    calls skip the full model and are served by the caller's fallback.
+    """
+
+    def __init__(self, *, max_inflight: int, workers: int):
+        self.max_inflight = max(1, int(max_inflight))
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="ml-infer")
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self._counters: dict[str, EndpointCounters] = {}
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def _try_enter(self) -> bool:
+        with self._lock:
+            if self._inflight >= self.max_inflight:
+                return False
+            self._inflight += 1
+            return True
+
+    def _leave(self, fut: Future | None = None) -> None:
+        with self._lock:
+            self._inflight -= 1
+        if fut is not None and not fut.cancelled():
+            # Retrieve late failures so they are not reported as "never retrieved".
+            fut.exception()
+
+    def _record(self, endpoint: str, reason: str | None) -> None:
+        with self._lock:
+            c = self._counters.setdefault(endpoint, EndpointCounters())
+            c.requests += 1
+            if reason is not None:
+                c.degraded += 1
+                c.by_reason[reason] = c.by_reason.get(reason, 0) + 1
+
+    async def run(
+        self,
+        endpoint: str,
+        primary: Callable[[], T],
+        fallback: Callable[[], T],
+        *,
+        budget_ms: int | None,
+    ) -> tuple[T, bool]:
+        """Run `primary` within `budget_ms`; returns (result, degraded).
+
+        The primary always runs on the inference pool, so calls waiting for a
+        worker count towards `max_inflight` and the event loop stays free. With
+        a budget it is abandoned, not cancelled, on timeout: the slot is
+        released only when it actually finishes. The fallback runs off the
+        event loop too, outside the (possibly saturated) inference pool.
+        """
+
+        if not self._try_enter():
+            self._record(endpoint, REASON_QUEUE)
+            return await asyncio.to_thread(fallback), True
+
+        fut = self._executor.submit(primary)
+        fut.add_done_callback(self._leave)
+        if not budget_ms:
+            result = await asyncio.wrap_future(fut)
+            self._record(endpoint, None)
+            return result, False
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(fut)), timeout=budget_ms / 1000.0)
+        except TimeoutError:
+            self._record(endpoint, REASON_BUDGET)
+            return await asyncio.to_thread(fallback), True
+
+        self._record(endpoint, None)
+        return result, False
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "inflight": self._inflight,
+                "max_inflight": self.max_inflight,
+                "endpoints": {k: v.as_dict() for k, v in self._counters.items()},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+    def shutdown(self) -> None:
+        """Stop the inference threads (app shutdown) without waiting for calls still running."""
+        self._executor.shutdown(wait=False)
+
+
+@lru_cache
+def get_inference_gate() -> InferenceGate:
+    settings = get_settings()
+    return InferenceGate(max_inflight=settings.inference_max_inflight, workers=settings.inference_workers)
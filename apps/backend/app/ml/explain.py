@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
+from typing import Any
+from weakref import WeakKeyDictionary
 
 import numpy as np
 import pandas as pd
@@ -17,35 +20,124 @@ class FactorContribution:
     direction: str  # "increases_risk" | "decreases_risk"
 
 
-def explain_with_shap_tree(
-    artifact: EnsembleArtifact,
-    x_row: pd.DataFrame,
-    *,
-    top_k: int = 5,
-) -> list[FactorContribution]:
-    """SHAP-style explanation using the LightGBM component.
+_EXPLAINERS: WeakKeyDictionary[Any, Any] = WeakKeyDictionary()
+_EXPLAINERS_LOCK = threading.Lock()
 
-    Notes:
-    - Uses TreeExplainer for speed.
-    - Returns top-k absolute impacts.
+
+def tree_explainer(artifact: EnsembleArtifact) -> Any:
+    """TreeExplainer for the LightGBM component, built once per loaded model.
+
+    Construction parses every tree (~100ms for 300 trees), far more than the
+    per-row SHAP pass itself, so it is cached for as long as the model lives.
     """
 
-    x_row = x_row[artifact.feature_names]
+    with _EXPLAINERS_LOCK:
+        explainer = _EXPLAINERS.get(artifact.lgbm)
+        if explainer is None:
+            explainer = shap.TreeExplainer(artifact.lgbm)
+            _EXPLAINERS[artifact.lgbm] = explainer
+        return explainer
+
+
+def tree_contributions(artifact: EnsembleArtifact, x: pd.DataFrame) -> tuple[np.ndarray, float]:
+    """Per-feature SHAP values (n_rows x n_features) and base value, in LightGBM margin space.
+
+    `base + contributions.sum(axis=1)` reproduces the LightGBM raw score.
+    """
 
-    explainer = shap.TreeExplainer(artifact.lgbm)
-    shap_values = explainer.shap_values(x_row)
+    x = x[artifact.feature_names]
+    explainer = tree_explainer(artifact)
+    shap_values = explainer.shap_values(x)
 
     # Binary classification: shap may return list[class0, class1] or array.
     if isinstance(shap_values, list):
-        sv = np.asarray(shap_values[1]).reshape(-1)
+        sv = np.asarray(shap_values[1])
     else:
-        sv = np.asarray(shap_values).reshape(-1)
+        sv = np.asarray(shap_values)
+    sv = sv.reshape(len(x), len(artifact.feature_names))
 
-    values = x_row.iloc[0].to_dict()
+    base = np.asarray(explainer.expected_value, dtype=float).reshape(-1)
+    return sv, float(base[-1])
+
+
+def linear_contributions(artifact: EnsembleArtifact, x: pd.DataFrame) -> tuple[np.ndarray, float]:
+    """Exact per-feature contributions of the logistic component, in logit space.
+
+    `coef_j * (x_j - mean_j) / scale_j` for every row at once; the base value is
+    the intercept (the logit at the training mean), so `base + sum` is the
+    logistic margin.
+    """
 
+    scaler = artifact.logistic.named_steps["scaler"]
+    clf = artifact.logistic.named_steps["clf"]
+    coef = np.asarray(clf.coef_, dtype=float).reshape(-1)
+    m = x[artifact.feature_names].to_numpy(dtype=float)
+    mean = getattr(scaler, "mean_", None)
+    scale = getattr(scaler, "scale_", None)
+    z = (m - (0.0 if mean is None else mean)) / (1.0 if scale is None else scale)
+    return z * coef, float(np.asarray(clf.intercept_).reshape(-1)[0])
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return np.asarray(1.0 / (1.0 + np.exp(-z)), dtype=float)
+
+
+def to_probability_space(
+    contributions: np.ndarray,
+    base: float,
+    *,
+    scale: float = 1.0,
+) -> tuple[np.ndarray, float, np.ndarray]:
+    """Map margin-space contributions onto the probability `sigmoid(scale * margin)`.
+
+    Each row is rescaled by the secant slope between the base and the row's
+    margin, so the result still sums exactly to `p - p_base`. Returns
+    (contributions, p_base, p).
+    """
+
+    margin = base + contributions.sum(axis=1)
+    p_base = float(_sigmoid(np.asarray(scale * base)))
+    p = _sigmoid(scale * margin)
+    dm = margin - base
+    # Where the margin barely moves, the secant degenerates to the derivative.
+    tangent = scale * p_base * (1.0 - p_base)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(np.abs(dm) > 1e-12, (p - p_base) / dm, tangent)
+    return contributions * slope[:, None], p_base, p
+
+
+def ensemble_contributions(
+    artifact: EnsembleArtifact,
+    x: pd.DataFrame,
+    *,
+    sigmoid: float = 1.0,
+    tree: tuple[np.ndarray, float] | None = None,
+) -> tuple[np.ndarray, float, np.ndarray]:
+    """Per-feature contributions to the ensemble probability (n_rows x n_features).
+
+    Both halves are moved to probability space and averaged with the ensemble's
+    50/50 weights, so `p_base + contributions.sum(axis=1) == p` for every row.
+    `tree` reuses an already computed `tree_contributions` result. Returns
+    (contributions, p_base, p).
+    """
+
+    sv, tree_base = tree if tree is not None else tree_contributions(artifact, x)
+    phi, lr_base = linear_contributions(artifact, x)
+    psi_lr, p0_lr, p_lr = to_probability_space(phi, lr_base)
+    psi_tree, p0_tree, p_tree = to_probability_space(sv, tree_base, scale=sigmoid)
+    return 0.5 * psi_lr + 0.5 * psi_tree, 0.5 * p0_lr + 0.5 * p0_tree, 0.5 * p_lr + 0.5 * p_tree
+
+
+def factors_from_contributions(
+    feature_names: list[str],
+    values: dict[str, float],
+    contributions: np.ndarray,
+    *,
+    top_k: int = 5,
+) -> list[FactorContribution]:
     pairs = []
-    for idx, feat in enumerate(artifact.feature_names):
-        impact = float(sv[idx])
+    for idx, feat in enumerate(feature_names):
+        impact = float(contributions[idx])
         pairs.append(
             FactorContribution(
                 feature=feat,
@@ -57,3 +149,80 @@ def explain_with_shap_tree(
 
     pairs.sort(key=lambda p: abs(p.impact), reverse=True)
     return pairs[: max(1, top_k)]
+
+
+def explain_with_shap_tree(
+    artifact: EnsembleArtifact,
+    x_row: pd.DataFrame,
+    *,
+    top_k: int = 5,
+) -> list[FactorContribution]:
+    """SHAP-style explanation using the LightGBM component.
+
+    Notes:
+    - Uses TreeExplainer for speed (cached per model).
+    - Returns top-k absolute impacts.
+    """
+
+    x_row = x_row[artifact.feature_names]
+    sv, _ = tree_contributions(artifact, x_row)
+    return factors_from_contributions(artifact.feature_names, x_row.iloc[0].to_dict(), sv[0], top_k=top_k)
+
+
+def explain_ensemble(
+    artifact: EnsembleArtifact,
+    x_row: pd.DataFrame,
+    *,
+    top_k: int = 5,
+    sigmoid: float = 1.0,
+) -> tuple[list[FactorContribution], float]:
+    """Explanation of the full ensemble probability; returns (factors, base probability).
+
+    Impacts are in probability units and, over all features, add up to the
+    predicted probability minus the base probability.
+    """
+
+    x_row = x_row[artifact.feature_names]
+    contrib, p_base, _ = ensemble_contributions(artifact, x_row, sigmoid=sigmoid)
+    factors = factors_from_contributions(artifact.feature_names, x_row.iloc[0].to_dict(), contrib[0], top_k=top_k)
+    return factors, p_base
+
+
+def global_importance_factors(
+    artifact: EnsembleArtifact,
+    x_row: pd.DataFrame,
+    *,
+    top_k: int = 5,
+    weights: dict[str, float] | None = None,
+) -> list[FactorContribution]:
+    """Model-level fallback explanation that needs no per-row tree work.
+
+    Impacts are the version's precomputed mean |impact| (`weights`) when given,
+    otherwise LightGBM split-gain importances normalized to sum to 1; the
+    direction comes from the sign of the feature's standardized contribution in
+    the logistic component. Used only when a per-row explanation is too slow.
+    """
+
+    x_row = x_row[artifact.feature_names]
+    if weights is not None:
+        w = np.asarray([weights.get(f, 0.0) for f in artifact.feature_names], dtype=float)
+    else:
+        gains = np.asarray(artifact.lgbm.booster_.feature_importance(importance_type="gain"), dtype=float)
+        total = float(gains.sum())
+        w = gains / total if total > 0 else np.full(len(gains), 1.0 / max(1, len(gains)))
+
+    phi, _ = linear_contributions(artifact, x_row)
+    signs = np.sign(phi[0])
+
+    values = x_row.iloc[0].to_dict()
+    pairs = [
+        FactorContribution(
+            feature=feat,
+            value=float(values[feat]),
+            impact=float(w[idx] * (signs[idx] if signs[idx] != 0 else 1.0)),
+            direction="increases_risk" if signs[idx] >= 0 else "decreases_risk",
+        )
+        for idx, feat in enumerate(artifact.feature_names)
+    ]
+    pairs.sort(key=lambda p: abs(p.impact), reverse=True)
+    return pairs[: max(1, top_k)]
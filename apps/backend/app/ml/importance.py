@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.ml.explain import ensemble_contributions
+from app.ml.registry import load_importance
+
+
+def compute_global_importance(
+    artifact: Any,
+    x: pd.DataFrame,
+    *,
+    sigmoid: float = 1.0,
+) -> dict[str, Any]:
+    """Model-level importance from one batched attribution pass over `x`.
+
+    - `mean_abs_impact`: mean |contribution| to the ensemble probability
+    - `share`: the same, normalized to sum to 1
+    - `direction`: whether higher values of the feature tend to raise risk, from
+      the sign of the correlation between the feature and its contribution
+    """
+
+    names = list(artifact.feature_names)
+    x = x[names]
+    contrib, p_base, _ = ensemble_contributions(artifact, x, sigmoid=sigmoid)
+
+    mean_abs = np.abs(contrib).mean(axis=0)
+    total = float(mean_abs.sum())
+    share = mean_abs / total if total > 0 else np.full(len(names), 1.0 / max(1, len(names)))
+
+    values = x.to_numpy(dtype=float)
+    xc = values - values.mean(axis=0)
+    cc = contrib - contrib.mean(axis=0)
+    # Sign of the covariance is the sign of the correlation; no need to normalize.
+    cov = (xc * cc).sum(axis=0)
+
+    features = [
+        {
+            "feature": feat,
+            "mean_abs_impact": float(mean_abs[i]),
+            "share": float(share[i]),
+            "direction": "higher_increases_risk" if cov[i] >= 0 else "higher_decreases_risk",
+        }
+        for i, feat in enumerate(names)
+    ]
+    features.sort(key=lambda f: f["mean_abs_impact"], reverse=True)
+    return {"rows": int(len(x)), "base_probability": float(p_base), "features": features}
+
+
+@lru_cache(maxsize=32)
+def global_importance(version: str) -> dict[str, Any]:
+    """Stored importance of a version (read once; versions are immutable).
+
+    Raises FileNotFoundError for versions trained before importance was stored.
+    """
+
+    return load_importance(version)
+
+
+def importance_weights(version: str) -> dict[str, float] | None:
+    """`feature -> mean_abs_impact`, or None when the version has no (readable) stored importance."""
+    try:
+        data = global_importance(version)
+        return {f["feature"]: float(f["mean_abs_impact"]) for f in data["features"]}
+    except (FileNotFoundError, ValueError, KeyError, TypeError):
+        return None
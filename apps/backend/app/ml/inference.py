@@ -1,23 +1,84 @@
 from __future__ import annotations
 
-import uuid
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from functools import lru_cache
+from typing import Literal, Protocol
 
+import numpy as np
 import pandas as pd
 from fastapi import HTTPException, status
+from sqlalchemy import Row
 
-from app.ml.explain import FactorContribution, explain_with_shap_tree
+from app.core.settings import get_settings
+from app.ml.compiled import CompiledEnsemble, compile_artifact
+from app.ml.counterfactual import CounterfactualResult, counterfactuals
+from app.ml.degrade import get_inference_gate
+from app.ml.explain import (
+    FactorContribution,
+    ensemble_contributions,
+    explain_ensemble,
+    explain_with_shap_tree,
+    factors_from_contributions,
+    global_importance_factors,
+    tree_contributions,
+)
+from app.ml.importance import importance_weights
+from app.ml.model import EnsembleArtifact
 from app.ml.preprocess import preprocess_records
-from app.ml.registry import latest_version, load_latest_artifact, load_metadata
+from app.ml.registry import (
+    ModelMetadata,
+    latest_version,
+    load_artifact,
+    load_latest_artifact,
+    load_metadata,
+    version_exists,
+)
+from app.ml.shadow import get_shadow_scorer
+from app.ml.version_cache import VersionCache
 from app.models.academic_record import AcademicRecord
 
+# Above this batch size native LightGBM beats the compiled NumPy traversal.
+COMPILED_MAX_BATCH = 16
+
+# "lgbm": SHAP values of the LightGBM half (raw-score units).
+# "ensemble": both halves in probability units; they add up to probability - base.
+ExplainMode = Literal["lgbm", "ensemble"]
+Explanation = tuple[list[FactorContribution], float | None]
+
+
+class Scorer(Protocol):
+    """What the request path calls on a model: an `EnsembleArtifact` or its `CompiledEnsemble`."""
+
+    @property
+    def feature_names(self) -> list[str]: ...
+
+    def predict_proba(self, x: pd.DataFrame) -> np.ndarray: ...
+
+    def predict_proba_logistic(self, x: pd.DataFrame) -> np.ndarray: ...
+
+    def predict_proba_fast(self, x: pd.DataFrame) -> np.ndarray: ...
+
 
 @dataclass(frozen=True)
 class LoadedModel:
     version: str
-    artifact: object
-    metadata: object
+    artifact: EnsembleArtifact
+    metadata: ModelMetadata
+    # Wrapper-free scorer for the request path (None if the artifact can't be compiled).
+    compiled: CompiledEnsemble | None = None
+
+    def scorer(self, n_rows: int = 1) -> Scorer:
+        """Fastest scorer for a batch of `n_rows` (see scripts/benchmark_inference.py)."""
+        if self.compiled is not None and n_rows <= COMPILED_MAX_BATCH:
+            return self.compiled
+        return self.artifact
+
+    @property
+    def sigmoid(self) -> float:
+        """LightGBM sigmoid scale (probability = sigmoid(scale * raw score))."""
+        return self.compiled.sigmoid if self.compiled is not None else 1.0
 
 
 def _service_unavailable(detail: str) -> HTTPException:
@@ -33,18 +94,66 @@ def get_loaded_model() -> LoadedModel:
     try:
         artifact = load_latest_artifact()
         meta = load_metadata(v)
-    except FileNotFoundError:
-        raise _service_unavailable("Model registry is missing artifacts. Retrain the model.")
+    except FileNotFoundError as e:
+        raise _service_unavailable("Model registry is missing artifacts. Retrain the model.") from e
+
+    return LoadedModel(version=v, artifact=artifact, metadata=meta, compiled=compile_artifact(artifact))
+
+
+def _load_version(version: str) -> LoadedModel:
+    artifact = load_artifact(version)
+    return LoadedModel(
+        version=version,
+        artifact=artifact,
+        metadata=load_metadata(version),
+        compiled=compile_artifact(artifact),
+    )
+
+
+@lru_cache
+def get_version_cache() -> VersionCache[LoadedModel]:
+    settings = get_settings()
+    return VersionCache(
+        _load_version,
+        capacity=settings.model_cache_size,
+        max_concurrent_loads=settings.model_max_concurrent_loads,
+    )
+
+
+async def get_model_for_version(version: str | None) -> LoadedModel:
+    """Resolve a pinned registry version (or LATEST when `version` is None).
+
+    Pinned versions are served from the in-memory LRU; cold ones are loaded once
+    in the background without blocking the event loop.
+    """
+
+    if version is None:
+        return get_loaded_model()
+
+    if latest_version() == version:
+        loaded = get_loaded_model()
+        if loaded.version == version:
+            return loaded
 
-    return LoadedModel(version=v, artifact=artifact, metadata=meta)
+    if not version_exists(version):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model version not found")
+
+    try:
+        return await get_version_cache().get(version)
+    except FileNotFoundError as e:
+        raise _service_unavailable("Model registry is missing artifacts for this version.") from e
 
 
 def clear_model_cache() -> None:
     # Test / ops utility
     get_loaded_model.cache_clear()
+    get_version_cache().clear()
+    get_explanation_cache().clear()
+    get_shadow_scorer().reload()
 
 
-def df_from_record(record: AcademicRecord) -> pd.DataFrame:
+def df_from_record(record: AcademicRecord | Row) -> pd.DataFrame:
+    """One-row input frame from an ORM record or a column-projected row with the same names."""
     return pd.DataFrame(
         [
             {
@@ -72,15 +181,294 @@ def df_from_features(*, attendance_pct: int, assignments_pct: int, quizzes_pct:
     )
 
 
-def predict_proba_from_raw_df(df_raw: pd.DataFrame) -> tuple[float, str]:
-    loaded = get_loaded_model()
+@dataclass(frozen=True)
+class PredictOutcome:
+    probability: float
+    version: str
+    mode: str  # "full" | "fast" | "logistic" (degraded fallback)
+    degraded: bool = False
+
+
+def _score(x: pd.DataFrame, *, loaded: LoadedModel, threshold: float, mode: str, mirror: bool) -> tuple[float, str]:
+    scorer = loaded.scorer(len(x))
+    if mode == "fast" and getattr(loaded.artifact, "student", None) is not None:
+        return float(scorer.predict_proba_fast(x)[0]), "fast"
+
+    p = float(scorer.predict_proba(x)[0])
+    if mirror:
+        # Mirror onto the shadow model (sampled, background thread; never blocks the caller).
+        get_shadow_scorer().maybe_submit(x, active_proba=p, active_version=loaded.version, threshold=threshold)
+    return p, "full"
+
+
+def _budget_ms(budget_ms: int | None) -> int | None:
+    if budget_ms is not None:
+        return budget_ms
+    return get_settings().ml_latency_budget_ms or None
+
+
+def predict_proba_from_raw_df(
+    df_raw: pd.DataFrame,
+    *,
+    threshold: float = 0.5,
+    loaded: LoadedModel | None = None,
+    mode: str = "full",
+) -> tuple[float, str, str]:
+    """Score one raw record; returns (probability, model version, inference mode used).
+
+    `mode="fast"` serves the distilled student when the artifact carries one and
+    silently falls back to the full ensemble otherwise.
+    """
+
+    pinned = loaded is not None
+    loaded = loaded or get_loaded_model()
+    x = preprocess_records(df_raw)
+    p, used = _score(x, loaded=loaded, threshold=threshold, mode=mode, mirror=not pinned)
+    return p, loaded.version, used
+
+
+async def predict_with_deadline(
+    df_raw: pd.DataFrame,
+    *,
+    threshold: float = 0.5,
+    loaded: LoadedModel | None = None,
+    mode: str = "full",
+    budget_ms: int | None = None,
+) -> PredictOutcome:
+    """Like `predict_proba_from_raw_df`, but never slower than the latency budget.
+
+    Over budget (or when too many inference calls are in flight) the logistic
+    component alone answers and the outcome is flagged `degraded`.
+    """
+
+    pinned = loaded is not None
+    loaded = loaded or get_loaded_model()
+    x = preprocess_records(df_raw)
+
+    def _fallback() -> tuple[float, str]:
+        return float(loaded.scorer(len(x)).predict_proba_logistic(x)[0]), "logistic"
+
+    (p, used), degraded = await get_inference_gate().run(
+        "predict",
+        lambda: _score(x, loaded=loaded, threshold=threshold, mode=mode, mirror=not pinned),
+        _fallback,
+        budget_ms=_budget_ms(budget_ms),
+    )
+    return PredictOutcome(probability=p, version=loaded.version, mode=used, degraded=degraded)
+
+
+class _ExplanationCache:
+    """Small LRU of full (all-feature) explanations keyed by version + mode + feature row.
+
+    Values are (factors, base probability); the base is None for the LightGBM-only mode.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(0, int(capacity))
+        self._items: OrderedDict[tuple, Explanation] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(version: str, x: pd.DataFrame, mode: ExplainMode = "lgbm") -> tuple:
+        return (version, mode, *np.round(x.iloc[0].to_numpy(dtype=float), 6).tolist())
+
+    def get(self, key: tuple) -> Explanation | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def put(self, key: tuple, explanation: Explanation) -> None:
+        if self.capacity == 0:
+            return
+        with self._lock:
+            self._items[key] = explanation
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+@lru_cache
+def get_explanation_cache() -> _ExplanationCache:
+    return _ExplanationCache(get_settings().explain_cache_size)
+
+
+def _explain_all(loaded: LoadedModel, x: pd.DataFrame, mode: ExplainMode = "lgbm") -> Explanation:
+    cache = get_explanation_cache()
+    key = cache.key(loaded.version, x, mode)
+    explanation = cache.get(key)
+    if explanation is None:
+        n_features = len(loaded.artifact.feature_names)
+        if mode == "ensemble":
+            explanation = explain_ensemble(loaded.artifact, x.iloc[[0]], top_k=n_features, sigmoid=loaded.sigmoid)
+        else:
+            explanation = (explain_with_shap_tree(loaded.artifact, x.iloc[[0]], top_k=n_features), None)
+        cache.put(key, explanation)
+    return explanation
+
+
+def _explain_fallback(loaded: LoadedModel, x: pd.DataFrame, mode: ExplainMode) -> Explanation:
+    cache = get_explanation_cache()
+    cached = cache.get(cache.key(loaded.version, x, mode))
+    if cached is not None:
+        return cached
+    factors = global_importance_factors(
+        loaded.artifact,
+        x.iloc[[0]],
+        top_k=len(loaded.artifact.feature_names),
+        weights=importance_weights(loaded.version),
+    )
+    return factors, None
+
+
+def explain_from_raw_df(
+    df_raw: pd.DataFrame,
+    *,
+    top_k: int = 5,
+    loaded: LoadedModel | None = None,
+    mode: ExplainMode = "lgbm",
+) -> tuple[list[FactorContribution], str]:
+    loaded = loaded or get_loaded_model()
+    x = preprocess_records(df_raw)
+    factors, _ = _explain_all(loaded, x, mode)
+    return factors[: max(1, top_k)], loaded.version
+
+
+@dataclass(frozen=True)
+class ExplainOutcome:
+    factors: list[FactorContribution]
+    version: str
+    degraded: bool = False
+    # Ensemble mode only: probability the factors are measured from.
+    base_probability: float | None = None
+
+
+async def explain_with_deadline(
+    df_raw: pd.DataFrame,
+    *,
+    top_k: int = 5,
+    loaded: LoadedModel | None = None,
+    mode: ExplainMode = "lgbm",
+    budget_ms: int | None = None,
+) -> ExplainOutcome:
+    """Explain within the latency budget.
+
+    The fallback serves a cached explanation for the same inputs if one exists,
+    otherwise the model's global importances.
+    """
+
+    loaded = loaded or get_loaded_model()
     x = preprocess_records(df_raw)
-    p = float(loaded.artifact.predict_proba(x)[0])
-    return p, loaded.version
 
+    (factors, base), degraded = await get_inference_gate().run(
+        "explain",
+        lambda: _explain_all(loaded, x, mode),
+        lambda: _explain_fallback(loaded, x, mode),
+        budget_ms=_budget_ms(budget_ms),
+    )
+    return ExplainOutcome(factors=factors[: max(1, top_k)], version=loaded.version, degraded=degraded, base_probability=base)
+
+
+@dataclass(frozen=True)
+class AssessOutcome:
+    probability: float
+    factors: list[FactorContribution]
+    version: str
+    mode: str = "full"  # "full" | "logistic" (degraded fallback)
+    degraded: bool = False
+    base_probability: float | None = None
+
+
+def _assess(
+    loaded: LoadedModel,
+    x: pd.DataFrame,
+    *,
+    threshold: float,
+    mode: ExplainMode,
+    mirror: bool,
+) -> tuple[float, Explanation]:
+    """Probability and full explanation from one SHAP pass.
+
+    The LightGBM half comes from the SHAP base value plus contributions (the
+    tree work is done once, for both outputs); the logistic half is a dot product.
+    """
+
+    artifact = loaded.artifact
+    tree = tree_contributions(artifact, x)
+    contrib, p_base, p_rows = ensemble_contributions(artifact, x, sigmoid=loaded.sigmoid, tree=tree)
+    p = float(np.clip(p_rows[0], 0.0, 1.0))
 
-def explain_from_raw_df(df_raw: pd.DataFrame, *, top_k: int = 5) -> tuple[list[FactorContribution], str]:
-    loaded = get_loaded_model()
+    values = x.iloc[0].to_dict()
+    n_features = len(artifact.feature_names)
+    cache = get_explanation_cache()
+    explanations: dict[ExplainMode, Explanation] = {
+        "lgbm": (factors_from_contributions(artifact.feature_names, values, tree[0][0], top_k=n_features), None),
+        "ensemble": (factors_from_contributions(artifact.feature_names, values, contrib[0], top_k=n_features), p_base),
+    }
+    # Both modes fall out of the same pass; cache them for follow-up /ml/explain calls.
+    for m, explanation in explanations.items():
+        cache.put(cache.key(loaded.version, x, m), explanation)
+
+    if mirror:
+        get_shadow_scorer().maybe_submit(x, active_proba=p, active_version=loaded.version, threshold=threshold)
+    return p, explanations[mode]
+
+
+async def assess_with_deadline(
+    df_raw: pd.DataFrame,
+    *,
+    threshold: float = 0.5,
+    top_k: int = 5,
+    loaded: LoadedModel | None = None,
+    mode: ExplainMode = "lgbm",
+    budget_ms: int | None = None,
+) -> AssessOutcome:
+    """Predict + explain for one record with a single preprocessing and model pass."""
+
+    pinned = loaded is not None
+    loaded = loaded or get_loaded_model()
     x = preprocess_records(df_raw)
-    factors = explain_with_shap_tree(loaded.artifact, x.iloc[[0]], top_k=top_k)
-    return factors, loaded.version
+
+    def _fallback() -> tuple[tuple[float, Explanation], str]:
+        p = float(loaded.scorer(len(x)).predict_proba_logistic(x)[0])
+        return (p, _explain_fallback(loaded, x, mode)), "logistic"
+
+    ((p, (factors, base)), used), degraded = await get_inference_gate().run(
+        "assess",
+        lambda: (_assess(loaded, x, threshold=threshold, mode=mode, mirror=not pinned), "full"),
+        _fallback,
+        budget_ms=_budget_ms(budget_ms),
+    )
+    return AssessOutcome(
+        probability=p,
+        factors=factors[: max(1, top_k)],
+        version=loaded.version,
+        mode=used,
+        degraded=degraded,
+        base_probability=base,
+    )
+
+
+def counterfactuals_from_raw_df(
+    df_raw: pd.DataFrame,
+    *,
+    threshold: float = 0.5,
+    pct_step: float = 5.0,
+    gpa_step: float = 0.1,
+    loaded: LoadedModel | None = None,
+) -> tuple[CounterfactualResult, str]:
+    loaded = loaded or get_loaded_model()
+    # Grids run to hundreds of rows: the native batch scorer is the fast path here.
+    result = counterfactuals(
+        loaded.artifact,
+        df_raw,
+        threshold=threshold,
+        pct_step=pct_step,
+        gpa_step=gpa_step,
+    )
+    return result, loaded.version
@@ -13,11 +13,15 @@ class EnsembleArtifact:
 
     - logistic: sklearn model implementing predict_proba
     - lgbm: LightGBM model implementing predict_proba
+    - student: optional small regressor distilled from the ensemble's probabilities,
+      served by `predict_proba_fast` when strict latency budgets apply
     """
 
     logistic: Any
     lgbm: Any
     feature_names: list[str]
+    student: Any = None
+    student_fidelity: dict[str, float] | None = None
 
     def predict_proba(self, x: pd.DataFrame) -> np.ndarray:
         x = x[self.feature_names]
@@ -26,5 +30,21 @@ class EnsembleArtifact:
         p = 0.5 * p1 + 0.5 * p2
         return np.clip(p, 0.0, 1.0)
 
+    def predict_proba_logistic(self, x: pd.DataFrame) -> np.ndarray:
+        """Logistic component alone (cheap degraded-mode fallback)."""
+        x = x[self.feature_names]
+        return np.asarray(np.clip(np.asarray(self.logistic.predict_proba(x))[:, 1], 0.0, 1.0), dtype=float)
+
+    @property
+    def has_student(self) -> bool:
+        return self.student is not None
+
+    def predict_proba_fast(self, x: pd.DataFrame) -> np.ndarray:
+        """Distilled single-model probabilities; falls back to the full ensemble."""
+        if self.student is None:
+            return self.predict_proba(x)
+        x = x[self.feature_names]
+        return np.asarray(np.clip(np.asarray(self.student.predict(x)), 0.0, 1.0), dtype=float)
+
     def predict_label(self, x: pd.DataFrame, *, threshold: float = 0.5) -> np.ndarray:
         return (self.predict_proba(x) >= threshold).astype(int)
@@ -2,14 +2,15 @@ from __future__ import annotations
 
 import json
 import os
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 import joblib
+import numpy as np
 
-from app.core.settings import get_settings
+from app.core.settings import backend_root, get_settings
 
 
 @dataclass(frozen=True)
@@ -19,6 +20,8 @@ class ModelMetadata:
     metrics: dict[str, float]
     feature_names: list[str]
     notes: str = ""
+    # Agreement of the distilled student with the full ensemble on the holdout (empty if none).
+    distilled_fidelity: dict[str, float] = field(default_factory=dict)
 
 
 def utc_version() -> str:
@@ -31,17 +34,12 @@ def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
-def _backend_root() -> Path:
-    # apps/backend/app/ml/registry.py -> parents[2] == apps/backend
-    return Path(__file__).resolve().parents[2]
-
-
 def registry_root(default: str = "ml_registry") -> Path:
     settings = get_settings()
 
     p = Path(os.getenv("MODEL_REGISTRY_PATH", settings.model_registry_path or default))
     if not p.is_absolute():
-        p = _backend_root() / p
+        p = backend_root() / p
     return p.resolve()
 
 
@@ -49,6 +47,12 @@ def version_dir(version: str) -> Path:
     return registry_root() / "models" / version
 
 
+def version_exists(version: str) -> bool:
+    """A registered version; rejects path tricks like "../x" (it must be a direct child of models/)."""
+    d = version_dir(version)
+    return d.parent == version_dir("_").parent and (d / "metadata.json").exists()
+
+
 def save_artifact(*, version: str, artifact: Any, metadata: ModelMetadata) -> Path:
     d = version_dir(version)
     ensure_dir(d)
@@ -67,6 +71,42 @@ def save_artifact(*, version: str, artifact: Any, metadata: ModelMetadata) -> Pa
     return model_path
 
 
+def save_holdout(
+    version: str,
+    *,
+    x: np.ndarray,
+    y: np.ndarray,
+    proba: np.ndarray,
+    feature_names: np.ndarray,
+) -> Path:
+    """Persist the evaluation split (compact .npz) next to the version's artifact."""
+    d = version_dir(version)
+    ensure_dir(d)
+    path = d / "holdout.npz"
+    np.savez_compressed(path, x=x, y=y, proba=proba, feature_names=feature_names)
+    return path
+
+
+def load_holdout(version: str) -> dict[str, np.ndarray]:
+    with np.load(version_dir(version) / "holdout.npz", allow_pickle=False) as data:
+        return {k: data[k] for k in data.files}
+
+
+def save_importance(version: str, importance: dict[str, Any]) -> Path:
+    """Persist precomputed global feature importance next to `metadata.json`."""
+    d = version_dir(version)
+    ensure_dir(d)
+    path = d / "importance.json"
+    path.write_text(json.dumps(importance, indent=2), encoding="utf-8")
+    return path
+
+
+def load_importance(version: str) -> dict[str, Any]:
+    path = version_dir(version) / "importance.json"
+    data: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    return data
+
+
 def load_metadata(version: str) -> ModelMetadata:
     meta_path = version_dir(version) / "metadata.json"
     data = json.loads(meta_path.read_text(encoding="utf-8"))
@@ -93,6 +133,30 @@ def set_latest_version(version: str) -> None:
     latest_path.write_text(version, encoding="utf-8")
 
 
+def shadow_version() -> str | None:
+    """Return the version currently scored in shadow next to LATEST, if any."""
+    p = registry_root() / "SHADOW"
+    if not p.exists():
+        return None
+    v = p.read_text(encoding="utf-8").strip()
+    return v or None
+
+
+def set_shadow_version(version: str) -> None:
+    """Point the shadow slot at a specific version (never served to clients)."""
+    meta_path = version_dir(version) / "metadata.json"
+    if not meta_path.exists():
+        raise FileNotFoundError(f"Model version not found: {version}")
+
+    shadow_path = registry_root() / "SHADOW"
+    ensure_dir(shadow_path.parent)
+    shadow_path.write_text(version, encoding="utf-8")
+
+
+def clear_shadow_version() -> None:
+    (registry_root() / "SHADOW").unlink(missing_ok=True)
+
+
 def list_versions(*, limit: int = 200) -> list[str]:
     """List available model versions in descending order (newest first)."""
     root = registry_root() / "models"
@@ -111,8 +175,12 @@ def list_versions(*, limit: int = 200) -> list[str]:
     return versions[: max(0, int(limit))]
 
 
+def load_artifact(version: str) -> Any:
+    return joblib.load(version_dir(version) / "model.joblib")
+
+
 def load_latest_artifact() -> Any:
     v = latest_version()
     if not v:
         raise FileNotFoundError("No model available in registry")
-    return joblib.load(version_dir(v) / "model.joblib")
+    return load_artifact(v)
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.core.settings import get_settings
+from app.ml.registry import load_artifact, shadow_version
+
+# Upper edges of the |p_shadow - p_active| histogram buckets.
+DELTA_BUCKETS: tuple[float, ...] = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+
+_UNSET = object()
+
+
+@dataclass
+class ShadowStats:
+    """Aggregate disagreement between the active and shadow model.
+
+    Only running sums are kept so the memory footprint is constant no matter
+    how much traffic is mirrored.
+    """
+
+    shadow_version: str | None = None
+    scored: int = 0
+    dropped: int = 0
+    errors: int = 0
+    sum_delta: float = 0.0
+    sum_abs_delta: float = 0.0
+    sum_sq_delta: float = 0.0
+    max_abs_delta: float = 0.0
+    flips_to_at_risk: int = 0
+    flips_to_not_at_risk: int = 0
+    active_versions: dict[str, int] = field(default_factory=dict)
+    delta_histogram: list[int] = field(default_factory=lambda: [0] * len(DELTA_BUCKETS))
+
+    def as_dict(self) -> dict[str, Any]:
+        n = self.scored
+        mean = self.sum_delta / n if n else 0.0
+        var = max(0.0, self.sum_sq_delta / n - mean * mean) if n else 0.0
+        flips = self.flips_to_at_risk + self.flips_to_not_at_risk
+        return {
+            "shadow_version": self.shadow_version,
+            "scored": n,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "mean_delta": mean,
+            "mean_abs_delta": self.sum_abs_delta / n if n else 0.0,
+            "std_delta": float(np.sqrt(var)),
+            "max_abs_delta": self.max_abs_delta,
+            "label_flips": flips,
+            "flips_to_at_risk": self.flips_to_at_risk,
+            "flips_to_not_at_risk": self.flips_to_not_at_risk,
+            "flip_rate": flips / n if n else 0.0,
+            "active_versions": dict(self.active_versions),
+            "delta_histogram": [
+                {"le": edge, "count": c} for edge, c in zip(DELTA_BUCKETS, self.delta_histogram, strict=True)
+            ],
+        }
+
+
+class ShadowScorer:
+    """Mirror a sample of live predictions onto the SHADOW registry version.
+
+    The request path only pays for a random draw and an executor submit; loading
+    the shadow artifact and scoring it happen on a background thread. When the
+    backlog reaches `max_pending` new samples are dropped (and counted) rather
+    than queued, so a slow shadow model can never push back on clients.
+    """
+
+    def __init__(self, *, sample_rate: float, max_pending: int, max_workers: int = 1):
+        self.sample_rate = float(sample_rate)
+        self.max_pending = int(max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ml-shadow")
+        self._lock = threading.Lock()
+        self._pending: set[Future] = set()
+        self._version: object = _UNSET
+        self._artifact: tuple[str, Any] | None = None
+        self._stats = ShadowStats()
+
+    @property
+    def version(self) -> str | None:
+        if self._version is _UNSET:
+            self._set_version(shadow_version())
+        version = self._version
+        return version if isinstance(version, str) else None
+
+    def _set_version(self, version: str | None) -> None:
+        with self._lock:
+            self._version = version
+            if self._stats.shadow_version != version:
+                self._stats = ShadowStats(shadow_version=version)
+
+    def set_version(self, version: str | None) -> None:
+        self._set_version(version)
+
+    def reload(self) -> None:
+        """Forget the cached pointer; it is re-read from the registry on next use."""
+        with self._lock:
+            self._version = _UNSET
+            self._artifact = None
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = ShadowStats(shadow_version=self._stats.shadow_version)
+
+    def maybe_submit(
+        self,
+        x: pd.DataFrame,
+        *,
+        active_proba: np.ndarray | float,
+        active_version: str,
+        threshold: float,
+    ) -> bool:
+        version = self.version
+        if version is None or version == active_version:
+            return False
+        if self.sample_rate <= 0.0 or random.random() >= self.sample_rate:
+            return False
+
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self._stats.dropped += 1
+                return False
+            fut = self._executor.submit(
+                self._score,
+                version,
+                x,
+                np.atleast_1d(np.asarray(active_proba, dtype=float)),
+                active_version,
+                float(threshold),
+            )
+            self._pending.add(fut)
+        fut.add_done_callback(self._discard)
+        return True
+
+    def _discard(self, fut: Future) -> None:
+        with self._lock:
+            self._pending.discard(fut)
+
+    def _shadow_artifact(self, version: str) -> Any:
+        cached = self._artifact
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        artifact = load_artifact(version)
+        self._artifact = (version, artifact)
+        return artifact
+
+    def _score(
+        self,
+        version: str,
+        x: pd.DataFrame,
+        active: np.ndarray,
+        active_version: str,
+        threshold: float,
+    ) -> None:
+        try:
+            shadow = np.asarray(self._shadow_artifact(version).predict_proba(x), dtype=float)
+        except Exception:
+            with self._lock:
+                if self._stats.shadow_version == version:
+                    self._stats.errors += 1
+            return
+
+        delta = shadow - active
+        abs_delta = np.abs(delta)
+        active_flag = active >= threshold
+        shadow_flag = shadow >= threshold
+        buckets = np.searchsorted(DELTA_BUCKETS, abs_delta, side="left")
+        buckets = np.minimum(buckets, len(DELTA_BUCKETS) - 1)
+
+        with self._lock:
+            st = self._stats
+            if st.shadow_version != version:
+                # Shadow slot changed while this job was queued.
+                return
+            st.scored += int(delta.size)
+            st.sum_delta += float(delta.sum())
+            st.sum_abs_delta += float(abs_delta.sum())
+            st.sum_sq_delta += float((delta * delta).sum())
+            st.max_abs_delta = max(st.max_abs_delta, float(abs_delta.max(initial=0.0)))
+            st.flips_to_at_risk += int((shadow_flag & ~active_flag).sum())
+            st.flips_to_not_at_risk += int((active_flag & ~shadow_flag).sum())
+            st.active_versions[active_version] = st.active_versions.get(active_version, 0) + int(delta.size)
+            for b in buckets:
+                st.delta_histogram[int(b)] += 1
+
+    def shutdown(self) -> None:
+        """Stop the scoring threads (app shutdown) without waiting for queued jobs."""
+        self._executor.shutdown(wait=False)
+
+    def drain(self, timeout: float | None = None) -> None:
+        """Wait for queued shadow jobs (tests / graceful shutdown)."""
+        with self._lock:
+            pending = list(self._pending)
+        if pending:
+            wait(pending, timeout=timeout)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            out = self._stats.as_dict()
+            out["pending"] = len(self._pending)
+        out["sample_rate"] = self.sample_rate
+        return out
+
+
+@lru_cache
+def get_shadow_scorer() -> ShadowScorer:
+    settings = get_settings()
+    return ShadowScorer(
+        sample_rate=min(1.0, max(0.0, settings.shadow_sample_rate)),
+        max_pending=max(1, settings.shadow_max_pending),
+    )
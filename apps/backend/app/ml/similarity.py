@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import uuid
+from dataclasses import dataclass
+
+import numpy as np
+from sklearn.neighbors import KDTree
+
+SIMILARITY_COLUMNS: tuple[str, ...] = ("attendance_pct", "assignments_pct", "quizzes_pct", "exams_pct", "gpa")
+
+
+@dataclass(frozen=True)
+class Neighbor:
+    record_id: uuid.UUID
+    student_user_id: uuid.UUID
+    distance: float
+
+
+class SimilarityIndex:
+    """k-nearest-neighbour index over standardized academic signals.
+
+    - A KD-tree holds the vectors present at the last (re)build; queries are
+      O(log n) instead of a scan of `academic_records`.
+    - Writes are applied incrementally: new or updated records go to a small
+      buffer searched by brute force, and replaced or deleted ones are
+      tombstoned in the tree. Once the buffer plus tombstones exceed
+      `rebuild_fraction` of the tree, the tree is rebuilt from memory.
+    - Standardization (mean/std) is fixed at build time so buffered rows and
+      tree rows share one distance metric.
+    - Before the first build, writes are ignored unless a build is under way
+      (`begin_build()`, called before its rows are read): those are journaled
+      and replayed by `build()`, so nothing written between the read and the
+      build is lost. `build_lock` serializes lazy builds across requests.
+    """
+
+    def __init__(self, *, rebuild_fraction: float = 0.1, min_rebuild: int = 256, leaf_size: int = 40):
+        self.rebuild_fraction = rebuild_fraction
+        self.min_rebuild = min_rebuild
+        self.leaf_size = leaf_size
+        self._lock = threading.Lock()
+        self.build_lock = asyncio.Lock()
+        self._built = False
+        # Writes seen while a build is pending: (record_id, (student_id, raw row) or None for a removal).
+        self._journal: list[tuple[uuid.UUID, tuple[uuid.UUID, np.ndarray] | None]] | None = None
+        self._reset_state()
+
+    def _reset_state(self) -> None:
+        n = len(SIMILARITY_COLUMNS)
+        self._mean = np.zeros(n)
+        self._std = np.ones(n)
+        self._tree: KDTree | None = None
+        self._tree_x = np.zeros((0, n))
+        self._tree_ids: list[uuid.UUID] = []
+        self._tree_students: list[uuid.UUID] = []
+        self._tree_pos: dict[uuid.UUID, int] = {}
+        self._tombstones: set[int] = set()
+        self._buffer: dict[uuid.UUID, tuple[uuid.UUID, np.ndarray]] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self._built
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return len(self._tree_ids) - len(self._tombstones) + len(self._buffer)
+
+    def begin_build(self) -> None:
+        """Start journaling writes; call before reading the rows passed to `build()`."""
+        with self._lock:
+            if self._journal is None:
+                self._journal = []
+
+    def abort_build(self) -> None:
+        with self._lock:
+            self._journal = None
+
+    def build(self, record_ids: list[uuid.UUID], student_ids: list[uuid.UUID], raw: np.ndarray) -> None:
+        """(Re)build from raw (rows x SIMILARITY_COLUMNS) signals, then replay journaled writes."""
+        raw = np.asarray(raw, dtype=float).reshape(-1, len(SIMILARITY_COLUMNS))
+        with self._lock:
+            self._reset_state()
+            if len(raw):
+                self._mean = raw.mean(axis=0)
+                std = raw.std(axis=0)
+                self._std = np.where(std > 0, std, 1.0)
+            self._set_tree(list(record_ids), list(student_ids), self._standardize(raw))
+            journal, self._journal = self._journal or [], None
+            # Replays are idempotent, so writes the read already saw are harmless.
+            for record_id, write in journal:
+                if write is None:
+                    self._remove(record_id)
+                else:
+                    self._upsert(record_id, *write)
+            self._built = True
+
+    def _standardize(self, raw: np.ndarray) -> np.ndarray:
+        return (np.asarray(raw, dtype=float) - self._mean) / self._std
+
+    def _set_tree(self, ids: list[uuid.UUID], students: list[uuid.UUID], z: np.ndarray) -> None:
+        self._tree_ids = ids
+        self._tree_students = students
+        self._tree_x = z
+        self._tree_pos = {rid: i for i, rid in enumerate(ids)}
+        self._tombstones = set()
+        self._buffer = {}
+        self._tree = KDTree(z, leaf_size=self.leaf_size) if len(ids) else None
+
+    def _maybe_rebuild(self) -> None:
+        pending = len(self._buffer) + len(self._tombstones)
+        if pending < max(self.min_rebuild, self.rebuild_fraction * len(self._tree_ids)):
+            return
+        keep = [i for i in range(len(self._tree_ids)) if i not in self._tombstones]
+        ids = [self._tree_ids[i] for i in keep] + list(self._buffer)
+        students = [self._tree_students[i] for i in keep] + [s for s, _ in self._buffer.values()]
+        parts = [self._tree_x[keep]] + [z[None, :] for _, z in self._buffer.values()]
+        self._set_tree(ids, students, np.vstack(parts))
+
+    def upsert(self, record_id: uuid.UUID, student_id: uuid.UUID, raw_row: np.ndarray) -> None:
+        with self._lock:
+            if not self._built:
+                if self._journal is not None:
+                    self._journal.append((record_id, (student_id, np.asarray(raw_row, dtype=float).reshape(-1))))
+                return
+            self._upsert(record_id, student_id, raw_row)
+
+    def remove(self, record_id: uuid.UUID) -> None:
+        with self._lock:
+            if not self._built:
+                if self._journal is not None:
+                    self._journal.append((record_id, None))
+                return
+            self._remove(record_id)
+
+    def _upsert(self, record_id: uuid.UUID, student_id: uuid.UUID, raw_row: np.ndarray) -> None:
+        pos = self._tree_pos.get(record_id)
+        if pos is not None:
+            self._tombstones.add(pos)
+        self._buffer[record_id] = (student_id, self._standardize(np.asarray(raw_row, dtype=float).reshape(-1)))
+        self._maybe_rebuild()
+
+    def _remove(self, record_id: uuid.UUID) -> None:
+        pos = self._tree_pos.get(record_id)
+        if pos is not None:
+            self._tombstones.add(pos)
+        self._buffer.pop(record_id, None)
+        self._maybe_rebuild()
+
+    def query(
+        self,
+        raw_row: np.ndarray,
+        *,
+        k: int = 5,
+        exclude_student: uuid.UUID | None = None,
+    ) -> list[Neighbor]:
+        """The `k` nearest live records, optionally skipping one student's own records."""
+        with self._lock:
+            z = self._standardize(np.asarray(raw_row, dtype=float).reshape(1, -1))
+            found: list[tuple[float, uuid.UUID, uuid.UUID]] = []
+
+            n_tree = len(self._tree_ids)
+            if self._tree is not None:
+                # Over-fetch to make up for tombstoned and excluded hits; widen until
+                # enough survive or the tree is exhausted.
+                want = k + len(self._tombstones)
+                while True:
+                    kk = min(n_tree, want)
+                    dist, idx = self._tree.query(z, k=kk)
+                    found = [
+                        (float(d), self._tree_ids[i], self._tree_students[i])
+                        for d, i in zip(dist[0], idx[0], strict=True)
+                        if i not in self._tombstones and self._tree_students[i] != exclude_student
+                    ]
+                    if len(found) >= k or kk == n_tree:
+                        break
+                    want *= 2
+
+            if self._buffer:
+                ids = list(self._buffer)
+                bz = np.vstack([self._buffer[r][1] for r in ids])
+                bd = np.sqrt(((bz - z) ** 2).sum(axis=1))
+                found.extend(
+                    (float(d), rid, self._buffer[rid][0])
+                    for d, rid in zip(bd, ids, strict=True)
+                    if self._buffer[rid][0] != exclude_student
+                )
+
+        found.sort(key=lambda t: t[0])
+        return [Neighbor(record_id=r, student_user_id=s, distance=d) for d, r, s in found[:k]]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset_state()
+            self._journal = None
+            self._built = False
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.ml.compare import delta_distribution
+from app.ml.preprocess import preprocess_records
+
+RAW_COLUMNS: tuple[str, ...] = ("attendance_pct", "assignments_pct", "quizzes_pct", "exams_pct", "gpa")
+
+# Cap on bootstrap weight-matrix cells held at once (replicates x rows).
+_BOOTSTRAP_CHUNK_CELLS = 4_000_000
+
+
+@dataclass(frozen=True)
+class FeatureTransform:
+    feature: str
+    op: str  # "add" | "scale" | "set" | "floor" | "cap"
+    value: float
+
+
+def apply_transforms(raw: np.ndarray, transforms: list[FeatureTransform]) -> np.ndarray:
+    """Apply column transforms, in order, to a copy of a (rows x RAW_COLUMNS) matrix.
+
+    Out-of-range results are clipped later by `preprocess_records`.
+    """
+
+    out = np.array(raw, dtype=float, copy=True)
+    for t in transforms:
+        col = RAW_COLUMNS.index(t.feature)
+        if t.op == "add":
+            out[:, col] += t.value
+        elif t.op == "scale":
+            out[:, col] *= t.value
+        elif t.op == "set":
+            out[:, col] = t.value
+        elif t.op == "floor":
+            np.maximum(out[:, col], t.value, out=out[:, col])
+        elif t.op == "cap":
+            np.minimum(out[:, col], t.value, out=out[:, col])
+        else:
+            raise ValueError(f"Unknown transform op: {t.op}")
+    return out
+
+
+def bootstrap_intervals(
+    columns: dict[str, np.ndarray],
+    *,
+    replicates: int,
+    confidence: float = 0.95,
+    seed: int | None = None,
+) -> dict[str, dict[str, float]]:
+    """Percentile bootstrap intervals for the means of per-row columns.
+
+    Resampling rows with replacement is drawing multinomial row counts, so every
+    replicate's mean is one weighted sum: all replicates are a single
+    (replicates x rows) @ (rows x stats) product, done in memory-bounded chunks.
+    """
+
+    names = list(columns)
+    m = np.column_stack([np.asarray(columns[k], dtype=float) for k in names])
+    n = m.shape[0]
+    rng = np.random.default_rng(seed)
+    uniform = np.full(n, 1.0 / n)
+
+    chunk = max(1, _BOOTSTRAP_CHUNK_CELLS // max(1, n))
+    means = np.empty((replicates, len(names)))
+    for start in range(0, replicates, chunk):
+        size = min(chunk, replicates - start)
+        weights = rng.multinomial(n, uniform, size=size)
+        means[start : start + size] = weights @ m / n
+
+    alpha = (1.0 - confidence) / 2.0
+    low, high = np.quantile(means, [alpha, 1.0 - alpha], axis=0)
+    estimate = m.mean(axis=0)
+    return {
+        k: {"estimate": float(estimate[i]), "low": float(low[i]), "high": float(high[i])}
+        for i, k in enumerate(names)
+    }
+
+
+def simulate_intervention(
+    scorer: Any,
+    raw: pd.DataFrame,
+    transforms: list[FeatureTransform],
+    *,
+    threshold: float = 0.5,
+    group_ids: np.ndarray | None = None,
+    bootstrap: int = 0,
+    confidence: float = 0.95,
+    seed: int | None = None,
+) -> dict[str, Any]:
+    """Score a cohort as-is and under `transforms`, in one batched call.
+
+    `group_ids` (student ids) additionally counts distinct students leaving the
+    At-Risk group; `bootstrap` > 0 adds percentile intervals for the rates.
+    """
+
+    base = raw[list(RAW_COLUMNS)].to_numpy(dtype=float)
+    scenario = apply_transforms(base, transforms)
+    n = base.shape[0]
+
+    stacked = pd.DataFrame(np.vstack([base, scenario]), columns=list(RAW_COLUMNS))
+    proba = np.asarray(scorer.predict_proba(preprocess_records(stacked)), dtype=float)
+    p_base, p_scen = proba[:n], proba[n:]
+
+    flag_base = p_base >= threshold
+    flag_scen = p_scen >= threshold
+    leaving = flag_base & ~flag_scen
+    entering = flag_scen & ~flag_base
+
+    out: dict[str, Any] = {
+        "rows": int(n),
+        "students": int(np.unique(group_ids).size) if group_ids is not None else None,
+        "baseline_at_risk": int(flag_base.sum()),
+        "scenario_at_risk": int(flag_scen.sum()),
+        "leaving_at_risk": int(leaving.sum()),
+        "entering_at_risk": int(entering.sum()),
+        "students_leaving_at_risk": int(np.unique(group_ids[leaving]).size) if group_ids is not None else None,
+        "mean_probability_baseline": float(p_base.mean()) if n else 0.0,
+        "mean_probability_scenario": float(p_scen.mean()) if n else 0.0,
+        "delta": delta_distribution(p_scen - p_base),
+        "intervals": None,
+    }
+
+    if bootstrap > 0 and n:
+        out["intervals"] = bootstrap_intervals(
+            {
+                "at_risk_rate_baseline": flag_base,
+                "at_risk_rate_scenario": flag_scen,
+                "at_risk_rate_reduction": flag_base.astype(float) - flag_scen.astype(float),
+                "leaving_rate": leaving,
+                "mean_delta": p_scen - p_base,
+            },
+            replicates=bootstrap,
+            confidence=confidence,
+            seed=seed,
+        )
+    return out
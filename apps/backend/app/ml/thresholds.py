@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from app.ml.registry import load_holdout
+
+
+@dataclass(frozen=True)
+class ThresholdCurve:
+    """Holdout scores pre-sorted for O(log n) metrics at any threshold.
+
+    `cum_pos[i]` is the number of positives among the i lowest scores, so for a
+    threshold t the flagged rows (score >= t) and their true positives fall out
+    of one `searchsorted` plus two prefix-sum lookups. No model is involved.
+    """
+
+    scores: np.ndarray  # ascending
+    cum_pos: np.ndarray  # len(scores) + 1
+
+    @classmethod
+    def from_arrays(cls, y_true: np.ndarray, proba: np.ndarray) -> ThresholdCurve:
+        proba = np.asarray(proba, dtype="float64").reshape(-1)
+        y = np.asarray(y_true).reshape(-1).astype("int64")
+        order = np.argsort(proba, kind="stable")
+        cum_pos = np.concatenate([[0], np.cumsum(y[order])])
+        return cls(scores=proba[order], cum_pos=cum_pos)
+
+    @property
+    def n(self) -> int:
+        return int(self.scores.size)
+
+    @property
+    def positives(self) -> int:
+        return int(self.cum_pos[-1])
+
+    def evaluate(self, thresholds: np.ndarray) -> dict[str, np.ndarray]:
+        t = np.asarray(thresholds, dtype="float64").reshape(-1)
+        below = np.searchsorted(self.scores, t, side="left")
+
+        flagged = self.n - below
+        tp = self.positives - self.cum_pos[below]
+        fp = flagged - tp
+        fn = self.positives - tp
+        tn = self.n - flagged - fn
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            precision = np.where(flagged > 0, tp / np.maximum(flagged, 1), 0.0)
+            recall = np.where(self.positives > 0, tp / max(self.positives, 1), 0.0)
+            denom = precision + recall
+            f1 = np.where(denom > 0, 2 * precision * recall / np.where(denom > 0, denom, 1.0), 0.0)
+            accuracy = (tp + tn) / max(self.n, 1)
+
+        return {
+            "threshold": t,
+            "flagged": flagged,
+            "true_positives": tp,
+            "false_positives": fp,
+            "false_negatives": fn,
+            "precision": precision,
+            "recall": recall,
+            "f1": f1,
+            "accuracy": accuracy,
+        }
+
+
+@lru_cache(maxsize=32)
+def threshold_curve(version: str) -> ThresholdCurve:
+    """Load (once) the stored holdout predictions of a version.
+
+    Raises FileNotFoundError for versions trained before holdout predictions were stored.
+    """
+
+    holdout = load_holdout(version)
+    if "proba" not in holdout:
+        raise FileNotFoundError(f"No stored holdout predictions for version {version}")
+    return ThresholdCurve.from_arrays(holdout["y"], holdout["proba"])
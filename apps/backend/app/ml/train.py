@@ -5,6 +5,7 @@ from dataclasses import dataclass
 import numpy as np
 import pandas as pd
 from lightgbm import LGBMClassifier
+from sklearn.ensemble import GradientBoostingRegressor
 from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
@@ -12,9 +13,16 @@ from sklearn.preprocessing import StandardScaler
 
 from app.ml.dataset import DatasetConfig, build_training_matrices
 from app.ml.features import feature_names
+from app.ml.importance import compute_global_importance
 from app.ml.metrics import evaluate_binary
 from app.ml.model import EnsembleArtifact
-from app.ml.registry import ModelMetadata, save_artifact, utc_version
+from app.ml.registry import (
+    ModelMetadata,
+    save_artifact,
+    save_holdout,
+    save_importance,
+    utc_version,
+)
 
 
 @dataclass(frozen=True)
@@ -30,6 +38,39 @@ class TrainConfig:
     lgbm_learning_rate: float = 0.05
     lgbm_n_estimators: int = 300
 
+    # Optional distilled student (a few shallow regression trees fit to the ensemble's
+    # probabilities) for low-latency "fast" inference.
+    distill: bool = False
+    distill_n_estimators: int = 40
+    distill_max_depth: int = 3
+    distill_learning_rate: float = 0.2
+
+    # Global feature importance is computed on (at most) this many training rows.
+    importance_max_rows: int = 5000
+
+
+def distill_student(artifact: EnsembleArtifact, x_train: pd.DataFrame, *, cfg: TrainConfig) -> GradientBoostingRegressor:
+    """Fit a small tree ensemble that mimics the full ensemble's probabilities."""
+    x_train = x_train[artifact.feature_names]
+    student = GradientBoostingRegressor(
+        n_estimators=cfg.distill_n_estimators,
+        max_depth=cfg.distill_max_depth,
+        learning_rate=cfg.distill_learning_rate,
+        random_state=cfg.random_state,
+    )
+    student.fit(x_train, artifact.predict_proba(x_train))
+    return student
+
+
+def fidelity_metrics(teacher_proba: np.ndarray, student_proba: np.ndarray) -> dict[str, float]:
+    err = np.abs(np.asarray(student_proba) - np.asarray(teacher_proba))
+    agree = (np.asarray(student_proba) >= 0.5) == (np.asarray(teacher_proba) >= 0.5)
+    return {
+        "mae": float(err.mean()) if err.size else 0.0,
+        "max_abs_error": float(err.max()) if err.size else 0.0,
+        "label_agreement": float(agree.mean()) if agree.size else 1.0,
+    }
+
 
 def train_from_dataframe(
     df: pd.DataFrame,
@@ -80,6 +121,12 @@ def train_from_dataframe(
     proba = artifact.predict_proba(x_test)
     metrics = evaluate_binary(y_test, proba)
 
+    fidelity: dict[str, float] = {}
+    if train_cfg.distill:
+        artifact.student = distill_student(artifact, x_train, cfg=train_cfg)
+        fidelity = fidelity_metrics(proba, artifact.predict_proba_fast(x_test))
+        artifact.student_fidelity = fidelity
+
     version = utc_version()
     metadata = ModelMetadata(
         version=version,
@@ -87,7 +134,23 @@ def train_from_dataframe(
         metrics=metrics,
         feature_names=artifact.feature_names,
         notes=notes,
+        distilled_fidelity=fidelity,
+    )
+
+    # Write the extras first: save_artifact moves LATEST, so a reader that
+    # follows the pointer always finds the holdout and importance files.
+    save_holdout(
+        version,
+        x=x_test[artifact.feature_names].to_numpy(dtype="float64"),
+        y=np.asarray(y_test, dtype="int8"),
+        proba=np.asarray(proba, dtype="float32"),
+        feature_names=np.asarray(artifact.feature_names),
     )
 
+    x_imp = x_train
+    if len(x_imp) > train_cfg.importance_max_rows:
+        x_imp = x_imp.sample(n=train_cfg.importance_max_rows, random_state=train_cfg.random_state)
+    save_importance(version, compute_global_importance(artifact, x_imp))
+
     save_artifact(version=version, artifact=artifact, metadata=metadata)
     return version, metadata
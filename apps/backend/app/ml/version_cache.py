@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class VersionCache(Generic[T]):
+    """In-memory LRU of loaded model versions.
+
+    - Hits move the version to the most-recently-used end, so versions that are
+      requested often stay resident while cold ones are evicted first.
+    - Misses are loaded on a small thread pool, which bounds the number of
+      concurrent loads (`max_concurrent_loads`) and keeps joblib I/O off the
+      event loop.
+    - Concurrent requests for the same cold version share a single load.
+
+    Plain `concurrent.futures` primitives are used (rather than asyncio ones) so
+    the cache is safe to share across event loops and worker threads.
+    """
+
+    def __init__(self, loader: Callable[[str], T], *, capacity: int, max_concurrent_loads: int):
+        self._loader = loader
+        self.capacity = max(1, int(capacity))
+        self._items: OrderedDict[str, T] = OrderedDict()
+        self._inflight: dict[str, Future[T]] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(max_concurrent_loads)),
+            thread_name_prefix="ml-version-load",
+        )
+
+    def peek(self, version: str) -> T | None:
+        with self._lock:
+            item = self._items.get(version)
+            if item is not None:
+                self._items.move_to_end(version)
+            return item
+
+    def _load_future(self, version: str) -> Future[T]:
+        with self._lock:
+            fut = self._inflight.get(version)
+            if fut is None:
+                fut = self._executor.submit(self._load, version)
+                self._inflight[version] = fut
+            return fut
+
+    def _load(self, version: str) -> T:
+        try:
+            item = self._loader(version)
+            with self._lock:
+                self._items[version] = item
+                self._items.move_to_end(version)
+                while len(self._items) > self.capacity:
+                    self._items.popitem(last=False)
+            return item
+        finally:
+            with self._lock:
+                self._inflight.pop(version, None)
+
+    async def get(self, version: str) -> T:
+        item = self.peek(version)
+        if item is not None:
+            return item
+        return await asyncio.wrap_future(self._load_future(version))
+
+    def resident(self) -> list[str]:
+        """Resident versions, least- to most-recently used."""
+        with self._lock:
+            return list(self._items)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def shutdown(self) -> None:
+        """Stop the loader threads (app shutdown) without waiting for loads in progress."""
+        self._executor.shutdown(wait=False)
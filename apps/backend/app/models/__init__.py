@@ -1,5 +1,7 @@
 from .academic_record import AcademicRecord
+from .import_job import ImportJob, ImportJobStatus
+from .prediction_audit import PredictionAuditEvent
 from .refresh_token import RefreshToken
 from .user import User, UserRole
 
-__all__ = ["AcademicRecord", "RefreshToken", "User", "UserRole"]
+__all__ = ["AcademicRecord", "ImportJob", "ImportJobStatus", "PredictionAuditEvent", "RefreshToken", "User", "UserRole"]
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Float, Integer, Uuid, func
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Float, Index, Integer, Uuid, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -33,7 +33,8 @@ class AcademicRecord(Base):
     # GPA on 0.0 - 4.0 scale (float for compatibility with common SIS exports)
     gpa: Mapped[float] = mapped_column(Float)
 
-    # Optional metadata for longitudinal analysis.
+    # Optional metadata for longitudinal analysis. At most one record per student and term
+    # (records without a term are not deduplicated: NULLs never conflict).
     term: Mapped[str | None] = mapped_column(default=None)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -49,4 +50,6 @@ class AcademicRecord(Base):
         CheckConstraint("quizzes_pct >= 0 AND quizzes_pct <= 100", name="ck_quizzes_pct"),
         CheckConstraint("exams_pct >= 0 AND exams_pct <= 100", name="ck_exams_pct"),
         CheckConstraint("gpa >= 0.0 AND gpa <= 4.0", name="ck_gpa_range"),
+        # Conflict target of the import upsert (`AcademicsService.bulk_upsert`).
+        Index("uq_academic_records_student_term", "student_user_id", "term", unique=True),
     )
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import enum
+import uuid
+from datetime import datetime
+
+from sqlalchemy import JSON, Boolean, DateTime, Enum, ForeignKey, Integer, String, Text, Uuid, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ImportJobStatus(enum.StrEnum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class ImportJob(Base):
+    """A background CSV import of academic records (see `POST /academics/import` job mode).
+
+    The upload is staged on disk; progress is checkpointed in the same
+    transaction as each committed chunk, so an interrupted job resumes from
+    `units_done` instead of starting over.
+    """
+
+    __tablename__ = "import_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    created_by_user_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+
+    status: Mapped[ImportJobStatus] = mapped_column(
+        Enum(ImportJobStatus, name="import_job_status"), default=ImportJobStatus.queued, index=True
+    )
+    filename: Mapped[str] = mapped_column(String(255), default="")
+    staged_path: Mapped[str] = mapped_column(String(1024))
+    total_bytes: Mapped[int] = mapped_column(Integer, default=0)
+    dry_run: Mapped[bool] = mapped_column(Boolean, default=False)
+    upsert: Mapped[bool] = mapped_column(Boolean, default=False)
+    allow_create_students: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    # Checkpoint: data rows consumed (summary files) or groups written (RUET course-marks files).
+    units_done: Mapped[int] = mapped_column(Integer, default=0)
+    rows_processed: Mapped[int] = mapped_column(Integer, default=0)
+    bytes_processed: Mapped[int] = mapped_column(Integer, default=0)
+    created: Mapped[int] = mapped_column(Integer, default=0)
+    updated: Mapped[int] = mapped_column(Integer, default=0)
+    unchanged: Mapped[int] = mapped_column(Integer, default=0)
+    error_count: Mapped[int] = mapped_column(Integer, default=0)
+    error_counts: Mapped[dict] = mapped_column(JSON, default=dict)
+    # Sample of the errors; all of them are in the error report (id == job id).
+    errors: Mapped[list] = mapped_column(JSON, default=list)
+    error_report_id: Mapped[uuid.UUID | None] = mapped_column(Uuid(as_uuid=True), default=None)
+    # Report size at the checkpoint (lines after it are dropped on resume).
+    error_report_bytes: Mapped[int] = mapped_column(Integer, default=0)
+    failure: Mapped[str | None] = mapped_column(Text, default=None)
+    # Worker running the job and when it last checkpointed (see `ImportJobRunner`).
+    claimed_by: Mapped[str | None] = mapped_column(String(64), default=None)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=None)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import JSON, Boolean, DateTime, Float, String, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class PredictionAuditEvent(Base):
+    """One risk prediction served by the API (who asked, for whom, with what inputs and model).
+
+    User ids are deliberately not foreign keys: audit rows must outlive the users
+    they mention, and write-behind bulk inserts should not pay for FK checks.
+    """
+
+    __tablename__ = "prediction_audit_events"
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # When the prediction was served (not when the event was flushed).
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+
+    endpoint: Mapped[str] = mapped_column(String(32))
+    caller_user_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), index=True)
+    caller_role: Mapped[str] = mapped_column(String(16))
+    student_user_id: Mapped[uuid.UUID | None] = mapped_column(Uuid(as_uuid=True), index=True, nullable=True)
+    academic_record_id: Mapped[uuid.UUID | None] = mapped_column(Uuid(as_uuid=True), nullable=True)
+
+    model_version: Mapped[str] = mapped_column(String(64))
+    inference_mode: Mapped[str] = mapped_column(String(16))
+    degraded: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Null for endpoints that show a probability without classifying it (/ml/explain).
+    threshold: Mapped[float | None] = mapped_column(Float, nullable=True)
+    risk_probability: Mapped[float] = mapped_column(Float)
+    classification: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    inputs: Mapped[dict] = mapped_column(JSON)
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
-import csv
-import io
-import secrets
+import asyncio
+import logging
 import uuid
+from typing import Literal
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
+from fastapi.responses import FileResponse, JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_db_session
+from app.core.settings import get_settings
+from app.deps.academics import get_import_jobs, get_import_parse_pool
 from app.deps.auth import get_current_user, require_roles
+from app.deps.ml import get_similarity_index
+from app.ml.similarity import SimilarityIndex
 from app.models.academic_record import AcademicRecord
 from app.models.user import User, UserRole
 from app.schemas.academic import (
@@ -17,12 +22,18 @@ from app.schemas.academic import (
     AcademicRecordList,
     AcademicRecordPublic,
     AcademicImportResponse,
-    AcademicImportRowError,
     AcademicRecordUpdate,
+    ImportJobPublic,
 )
+from app.services.academic_import import AcademicCsvImporter, ImportFormatError, ImportProgress
 from app.services.academics import AcademicsService
+from app.services.import_jobs import ImportJobRunner
+from app.services.import_parsing import ParsePool
+from app.services.import_reports import ImportErrorReport, find_report, prune_reports
 from app.services.users import UsersService
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/academics", tags=["academics"])
 
 
@@ -30,61 +41,17 @@ def _to_public(r: AcademicRecord) -> AcademicRecordPublic:
     return AcademicRecordPublic.model_validate(r, from_attributes=True)
 
 
-def _parse_int(v: str, *, field: str) -> int:
-    try:
-        return int(v)
-    except Exception as e:
-        raise ValueError(f"{field} must be an integer") from e
-
-
-def _parse_float(v: str, *, field: str) -> float:
-    try:
-        return float(v)
-    except Exception as e:
-        raise ValueError(f"{field} must be a number") from e
-
-
-def _require(row: dict[str, str], key: str) -> str:
-    v = (row.get(key) or "").strip()
-    if not v:
-        raise ValueError(f"Missing required column '{key}'")
-    return v
-
-
-def _opt(row: dict[str, str], key: str) -> str | None:
-    v = (row.get(key) or "").strip()
-    return v or None
-
-
-def _has_fields(fieldnames: list[str] | None, required: set[str]) -> bool:
-    if not fieldnames:
-        return False
-    fields = {f.strip() for f in fieldnames if f}
-    return required.issubset(fields)
-
-
-def _normalize_term(row: dict[str, str]) -> str | None:
-    # RUET datasets often use "semester" like 1-1, 1-2, ...
-    return _opt(row, "term") or _opt(row, "semester")
-
-
-async def _get_or_create_student_by_email(
-    users: UsersService,
-    *,
-    email: str,
-    allow_create: bool,
-) -> User | None:
-    student = await users.get_by_email(email)
-    if student:
-        return student
-
-    if not allow_create:
-        return None
-
-    # Create a non-interactive demo student if missing.
-    # Password is random and not surfaced; admin can reset later if needed.
-    password = secrets.token_urlsafe(18)
-    return await users.create_user(email=email, full_name="", role=UserRole.student, password=password)
+def _log_import_progress(p: ImportProgress) -> None:
+    logger.info(
+        "Academic import: %d rows read, %d created, %d updated, %d unchanged, %d errors (%d/%s bytes)",
+        p.rows_read,
+        p.created,
+        p.updated,
+        p.unchanged,
+        p.errors,
+        p.bytes_read,
+        p.total_bytes if p.total_bytes is not None else "?",
+    )
 
 
 @router.get("/me", response_model=AcademicRecordList)
@@ -139,13 +106,14 @@ async def list_records(
 async def create_record(
     body: AcademicRecordCreate,
     session: AsyncSession = Depends(get_db_session),
+    similarity: SimilarityIndex = Depends(get_similarity_index),
 ) -> AcademicRecordPublic:
     student = await UsersService(session).get_by_id(body.student_user_id)
     if not student or not student.is_active or student.role != UserRole.student:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid student_user_id")
 
     record = AcademicRecord(**body.model_dump())
-    created = await AcademicsService(session).create(record)
+    created = await AcademicsService(session, similarity=similarity).create(record)
     return _to_public(created)
 
 
@@ -158,8 +126,9 @@ async def update_record(
     record_id: uuid.UUID,
     body: AcademicRecordUpdate,
     session: AsyncSession = Depends(get_db_session),
+    similarity: SimilarityIndex = Depends(get_similarity_index),
 ) -> AcademicRecordPublic:
-    svc = AcademicsService(session)
+    svc = AcademicsService(session, similarity=similarity)
     record = svc.forbid_if_none(await svc.get(record_id))
     patch = {k: v for k, v in body.model_dump().items() if v is not None}
     updated = await svc.update(record, patch)
@@ -174,8 +143,9 @@ async def update_record(
 async def delete_record(
     record_id: uuid.UUID,
     session: AsyncSession = Depends(get_db_session),
+    similarity: SimilarityIndex = Depends(get_similarity_index),
 ) -> None:
-    svc = AcademicsService(session)
+    svc = AcademicsService(session, similarity=similarity)
     record = svc.forbid_if_none(await svc.get(record_id))
     await svc.delete(record)
 
@@ -183,15 +153,21 @@ async def delete_record(
 @router.post(
     "/import",
     response_model=AcademicImportResponse,
+    responses={status.HTTP_202_ACCEPTED: {"model": ImportJobPublic, "description": "Job mode: import queued"}},
     dependencies=[Depends(require_roles(UserRole.teacher, UserRole.admin))],
 )
 async def import_records_csv(
     file: UploadFile = File(...),
     dry_run: bool = Form(default=False),
+    upsert: bool = Form(default=False),
+    mode: Literal["sync", "job"] = Form(default="sync"),
     session: AsyncSession = Depends(get_db_session),
     user: User = Depends(get_current_user),
-) -> AcademicImportResponse:
-    """Bulk import academic records from a CSV file.
+    similarity: SimilarityIndex = Depends(get_similarity_index),
+    jobs: ImportJobRunner = Depends(get_import_jobs),
+    parse_pool: ParsePool = Depends(get_import_parse_pool),
+) -> AcademicImportResponse | JSONResponse:
+    """Bulk import academic records from a CSV, Parquet or Arrow IPC file.
 
     Supported formats:
 
@@ -206,226 +182,104 @@ async def import_records_csv(
        - credits, grade_point_4
        - attendance_10, assignments_10, ct_20 (optional), final_60
 
+    Parquet and Arrow IPC files (file or stream format) are detected from their contents and need the
+    optional `pyarrow` package (`pip install .[columnar]`). They use the same column names; numeric columns
+    are validated as typed, and row numbers in errors count data rows from 1 (CSV: the header is row 1).
+
     Notes:
-    - If importing as an admin and a referenced student_email doesn't exist yet, a student user is auto-created.
+    - If importing as an admin and a referenced student_email doesn't exist yet, a student user is auto-created
+      without a password (`password_setup_required`); an admin sets one via `PATCH /admin/users/{id}`.
+    - The upload is streamed: rows are parsed, validated and committed `IMPORT_CHUNK_SIZE` at a time, so
+      chunks before a failure stay imported. Uploads of `IMPORT_PARALLEL_MIN_BYTES` or more are split on
+      record boundaries and parsed/validated in a process pool, so the server keeps serving other requests.
+    - Row errors are counted by type (`error_counts`) and written, raw rows included, to an NDJSON report
+      downloadable from `GET /academics/import/reports/{error_report_id}` for `IMPORT_REPORT_TTL_HOURS`.
+      The response lists only the first `IMPORT_MAX_REPORTED_ERRORS` of them.
+    - A student has at most one record per term. By default a row for an existing (student, term) is
+      rejected; with `upsert=true` it updates that record instead (`updated`), and rows identical to the
+      stored record are skipped without a write (`unchanged`). Re-importing the same file is then a no-op.
+    - `mode=job` stages the upload and imports it in the background instead; the response is
+      `202` with the job, polled via `GET /academics/import/{job_id}`. Interrupted jobs resume
+      from their last committed chunk on the next start.
     """
 
-    raw = await file.read()
-    try:
-        text = raw.decode("utf-8-sig")
-    except UnicodeDecodeError:
-        # Fallback common on Windows exports
-        text = raw.decode("latin-1")
-
-    reader = csv.DictReader(io.StringIO(text))
-    if not reader.fieldnames:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CSV missing header row")
-
-    allow_autocreate_students = user.role == UserRole.admin
-
-    # Detect format from headers
-    is_summary = _has_fields(
-        reader.fieldnames,
-        {"attendance_pct", "assignments_pct", "quizzes_pct", "exams_pct", "gpa"},
+    if mode == "job":
+        job = await jobs.submit(session, file, user=user, dry_run=dry_run, upsert=upsert)
+        body = ImportJobPublic.model_validate(job, from_attributes=True)
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=body.model_dump(mode="json"))
+
+    settings = get_settings()
+    # Same directory as the job runner's reports (IMPORT_REPORT_PATH).
+    await asyncio.to_thread(prune_reports, jobs.report_dir, max_age_seconds=jobs.report_ttl_hours * 3600)
+    report = ImportErrorReport.create(jobs.report_dir, user.id)
+    importer = AcademicCsvImporter(
+        session,
+        allow_create_students=user.role == UserRole.admin,
+        dry_run=dry_run,
+        upsert=upsert,
+        similarity=similarity,
+        chunk_size=settings.import_chunk_size,
+        max_errors=settings.import_max_reported_errors,
+        progress=_log_import_progress,
+        report=report,
+        parse_pool=parse_pool,
+        parallel_min_bytes=settings.import_parallel_min_bytes,
+        shard_bytes=settings.import_shard_bytes,
     )
-    is_ruet_course = _has_fields(
-        reader.fieldnames,
-        {"credits", "grade_point_4", "attendance_10", "assignments_10", "final_60"},
+    try:
+        result = await importer.run(file.file, total_bytes=file.size)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    finally:
+        # The report is written lazily, on the first error; an import without errors leaves none.
+        report.close(keep=importer.progress.errors > 0)
+
+    return AcademicImportResponse(
+        dry_run=result.dry_run,
+        total_rows=result.total_rows,
+        created=result.created,
+        updated=result.updated,
+        unchanged=result.unchanged,
+        error_count=result.error_count,
+        error_counts=result.error_counts,
+        errors=result.errors,
+        error_report_id=result.error_report_id,
     )
 
-    errors: list[AcademicImportRowError] = []
-    records: list[AcademicRecord] = []
-    users = UsersService(session)
-
-    row_num = 1  # header row
-
-    if is_ruet_course and not is_summary:
-        # RUET course-marks import: aggregate multiple rows into one AcademicRecord per student+term.
-        # We aggregate using credit-weighted averages.
-        groups: dict[tuple[str, str], dict[str, float]] = {}
-        group_raw_first: dict[tuple[str, str], dict[str, str]] = {}
-
-        for row in reader:
-            row_num += 1
-            try:
-                student_email = _opt(row, "student_email")
-                if not student_email:
-                    raise ValueError("Missing required column 'student_email'")
-
-                term = _normalize_term(row)
-                if not term:
-                    raise ValueError("Missing required column 'term' (or 'semester')")
-
-                credits = _parse_float(_require(row, "credits"), field="credits")
-                if credits <= 0:
-                    raise ValueError("credits must be > 0")
-
-                gp = _parse_float(_require(row, "grade_point_4"), field="grade_point_4")
-                if gp < 0.0 or gp > 4.0:
-                    raise ValueError("grade_point_4 must be 0.0-4.0")
-
-                a10 = _parse_float(_require(row, "attendance_10"), field="attendance_10")
-                as10 = _parse_float(_require(row, "assignments_10"), field="assignments_10")
-                ct20_raw = _opt(row, "ct_20")
-                ct20 = _parse_float(ct20_raw, field="ct_20") if ct20_raw is not None else 0.0
-                f60 = _parse_float(_require(row, "final_60"), field="final_60")
-
-                # Convert component marks to 0-100 signals expected by the ML model.
-                attendance_pct = (a10 / 10.0) * 100.0
-                assignments_pct = (as10 / 10.0) * 100.0
-                quizzes_pct = (ct20 / 20.0) * 100.0
-                exams_pct = (f60 / 60.0) * 100.0
-
-                for name, val in (
-                    ("attendance_pct", attendance_pct),
-                    ("assignments_pct", assignments_pct),
-                    ("quizzes_pct", quizzes_pct),
-                    ("exams_pct", exams_pct),
-                ):
-                    if val < 0 or val > 100:
-                        raise ValueError(f"{name} derived from marks is out of range")
-
-                key = (student_email.lower().strip(), term)
-                if key not in groups:
-                    groups[key] = {
-                        "w": 0.0,
-                        "attendance": 0.0,
-                        "assignments": 0.0,
-                        "quizzes": 0.0,
-                        "exams": 0.0,
-                        "gpa": 0.0,
-                    }
-                    group_raw_first[key] = {k: (v if v is not None else "") for k, v in row.items()}
-
-                g = groups[key]
-                g["w"] += credits
-                g["attendance"] += attendance_pct * credits
-                g["assignments"] += assignments_pct * credits
-                g["quizzes"] += quizzes_pct * credits
-                g["exams"] += exams_pct * credits
-                g["gpa"] += gp * credits
-            except Exception as e:
-                errors.append(
-                    AcademicImportRowError(
-                        row=row_num,
-                        message=str(e),
-                        raw={k: (v if v is not None else "") for k, v in row.items()},
-                    )
-                )
-
-        for (student_email, term), agg in groups.items():
-            try:
-                student = await _get_or_create_student_by_email(
-                    users,
-                    email=student_email,
-                    allow_create=allow_autocreate_students,
-                )
-                if not student or not student.is_active or student.role != UserRole.student:
-                    raise ValueError("Invalid student reference")
-
-                w = agg["w"]
-                if w <= 0:
-                    raise ValueError("No credit weight found for term")
-
-                attendance_pct = int(round(agg["attendance"] / w))
-                assignments_pct = int(round(agg["assignments"] / w))
-                quizzes_pct = int(round(agg["quizzes"] / w))
-                exams_pct = int(round(agg["exams"] / w))
-                gpa = float(agg["gpa"] / w)
-
-                # Clamp for safety
-                attendance_pct = max(0, min(100, attendance_pct))
-                assignments_pct = max(0, min(100, assignments_pct))
-                quizzes_pct = max(0, min(100, quizzes_pct))
-                exams_pct = max(0, min(100, exams_pct))
-                gpa = max(0.0, min(4.0, gpa))
-
-                records.append(
-                    AcademicRecord(
-                        student_user_id=student.id,
-                        attendance_pct=attendance_pct,
-                        assignments_pct=assignments_pct,
-                        quizzes_pct=quizzes_pct,
-                        exams_pct=exams_pct,
-                        gpa=gpa,
-                        term=term,
-                    )
-                )
-            except Exception as e:
-                errors.append(
-                    AcademicImportRowError(
-                        row=1,
-                        message=f"{student_email} / {term}: {e}",
-                        raw=group_raw_first.get((student_email, term)),
-                    )
-                )
-    else:
-        # Summary import (existing format)
-        for row in reader:
-            row_num += 1
-            try:
-                student_user_id = _opt(row, "student_user_id")
-                student_email = _opt(row, "student_email")
-
-                student: User | None = None
-                if student_user_id:
-                    student = await users.get_by_id(student_user_id)
-                elif student_email:
-                    student = await _get_or_create_student_by_email(
-                        users,
-                        email=student_email,
-                        allow_create=allow_autocreate_students,
-                    )
-                else:
-                    raise ValueError("Provide student_user_id or student_email")
-
-                if not student or not student.is_active or student.role != UserRole.student:
-                    raise ValueError("Invalid student reference")
-
-                attendance_pct = _parse_int(_require(row, "attendance_pct"), field="attendance_pct")
-                assignments_pct = _parse_int(_require(row, "assignments_pct"), field="assignments_pct")
-                quizzes_pct = _parse_int(_require(row, "quizzes_pct"), field="quizzes_pct")
-                exams_pct = _parse_int(_require(row, "exams_pct"), field="exams_pct")
-                gpa = _parse_float(_require(row, "gpa"), field="gpa")
-                term = _normalize_term(row)
-
-                # Range validation (mirrors Pydantic/model constraints)
-                for name, val in (
-                    ("attendance_pct", attendance_pct),
-                    ("assignments_pct", assignments_pct),
-                    ("quizzes_pct", quizzes_pct),
-                    ("exams_pct", exams_pct),
-                ):
-                    if val < 0 or val > 100:
-                        raise ValueError(f"{name} must be 0-100")
-                if gpa < 0.0 or gpa > 4.0:
-                    raise ValueError("gpa must be 0.0-4.0")
-
-                records.append(
-                    AcademicRecord(
-                        student_user_id=student.id,
-                        attendance_pct=attendance_pct,
-                        assignments_pct=assignments_pct,
-                        quizzes_pct=quizzes_pct,
-                        exams_pct=exams_pct,
-                        gpa=gpa,
-                        term=term,
-                    )
-                )
-            except Exception as e:
-                errors.append(
-                    AcademicImportRowError(
-                        row=row_num,
-                        message=str(e),
-                        raw={k: (v if v is not None else "") for k, v in row.items()},
-                    )
-                )
-
-    if dry_run:
-        return AcademicImportResponse(dry_run=True, total_rows=max(0, row_num - 1), created=len(records), errors=errors)
-
-    if records:
-        session.add_all(records)
-        await session.commit()
-
-    return AcademicImportResponse(dry_run=False, total_rows=max(0, row_num - 1), created=len(records), errors=errors)
+
+@router.get(
+    "/import/{job_id}",
+    response_model=ImportJobPublic,
+    dependencies=[Depends(require_roles(UserRole.teacher, UserRole.admin))],
+)
+async def get_import_job(
+    job_id: uuid.UUID,
+    session: AsyncSession = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+    jobs: ImportJobRunner = Depends(get_import_jobs),
+) -> ImportJobPublic:
+    job = await jobs.get(session, job_id)
+    # Teachers only see their own jobs; admins see all.
+    if job is None or (user.role != UserRole.admin and job.created_by_user_id != user.id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+    return ImportJobPublic.model_validate(job, from_attributes=True)
+
+
+@router.get(
+    "/import/reports/{report_id}",
+    response_class=FileResponse,
+    responses={status.HTTP_200_OK: {"content": {"application/x-ndjson": {}}}},
+    dependencies=[Depends(require_roles(UserRole.teacher, UserRole.admin))],
+)
+async def download_import_error_report(
+    report_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    jobs: ImportJobRunner = Depends(get_import_jobs),
+) -> FileResponse:
+    """All row errors of an import, one JSON object (`row`, `code`, `message`, `raw`) per line."""
+    # Teachers only get reports of their own imports; admins get any.
+    owner_id = None if user.role == UserRole.admin else user.id
+    path = await asyncio.to_thread(find_report, jobs.report_dir, report_id, owner_id=owner_id)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Error report not found")
+    return FileResponse(path, media_type="application/x-ndjson", filename=f"import-errors-{report_id}.ndjson")
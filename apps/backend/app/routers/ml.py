@@ -1,83 +1,150 @@
 from __future__ import annotations
 
+import asyncio
 import uuid
+from dataclasses import dataclass
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-
+import numpy as np
 import pandas as pd
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_db_session
 from app.deps.auth import get_current_user, require_roles
+from app.deps.ml import get_prediction_audit, get_similarity_index
+from app.ml.compare import compare_probabilities, score_pair
+from app.ml.dataset import derive_at_risk_label
+from app.ml.degrade import get_inference_gate
 from app.ml.humanize import human_label, human_unit
-from app.ml.inference import df_from_features, df_from_record, explain_from_raw_df, predict_proba_from_raw_df
-from app.ml.registry import load_metadata
+from app.ml.importance import global_importance
+from app.ml.inference import (
+    assess_with_deadline,
+    counterfactuals_from_raw_df,
+    df_from_features,
+    df_from_record,
+    explain_with_deadline,
+    get_loaded_model,
+    get_model_for_version,
+    predict_with_deadline,
+)
+from app.ml.preprocess import preprocess_records
+from app.ml.registry import load_holdout, load_metadata, version_exists
+from app.ml.shadow import get_shadow_scorer
+from app.ml.similarity import SIMILARITY_COLUMNS, SimilarityIndex
+from app.ml.simulate import FeatureTransform, simulate_intervention
+from app.ml.thresholds import threshold_curve
 from app.models.academic_record import AcademicRecord
 from app.models.user import User, UserRole
 from app.schemas.ml import (
+    AssessRequest,
+    AssessResponse,
+    CompareRequest,
+    CompareResponse,
+    CounterfactualChange,
+    CounterfactualRequest,
+    CounterfactualResponse,
     ExplainRequest,
     ExplainResponse,
     FactorPublic,
+    FeatureImportance,
+    GlobalImportanceResponse,
     ModelInfo,
     ModelListResponse,
-    PromoteResponse,
+    PredictFromFeatures,
     PredictionRequest,
     PredictionResponse,
+    PromoteResponse,
+    ServingMetricsResponse,
+    ShadowStatsResponse,
+    SimilarRequest,
+    SimilarStudent,
+    SimilarStudentsResponse,
+    SimulationRequest,
+    SimulationResponse,
+    ThresholdAnalysisResponse,
+    ThresholdPoint,
     TrainRequest,
     TrainResponse,
 )
+from app.services.prediction_audit import PredictionAuditLog
 
 router = APIRouter(prefix="/ml", tags=["ml"])
 
 
+# Just what the ML request path reads: the model inputs plus the ownership column
+# for the RBAC check. Plain rows skip ORM hydration and the identity map.
+_RECORD_INPUT_COLUMNS = (
+    AcademicRecord.id,
+    AcademicRecord.student_user_id,
+    AcademicRecord.attendance_pct,
+    AcademicRecord.assignments_pct,
+    AcademicRecord.quizzes_pct,
+    AcademicRecord.exams_pct,
+    AcademicRecord.gpa,
+)
+
+
 async def _get_record(
     session: AsyncSession,
     *,
     record_id: uuid.UUID,
-) -> AcademicRecord | None:
-    res = await session.execute(select(AcademicRecord).where(AcademicRecord.id == record_id))
-    return res.scalar_one_or_none()
+) -> Row | None:
+    res = await session.execute(select(*_RECORD_INPUT_COLUMNS).where(AcademicRecord.id == record_id))
+    return res.one_or_none()
 
 
 async def _get_latest_record_for_student(
     session: AsyncSession,
     *,
     student_user_id: uuid.UUID,
-) -> AcademicRecord | None:
+) -> Row | None:
     q = (
-        select(AcademicRecord)
+        select(*_RECORD_INPUT_COLUMNS)
         .where(AcademicRecord.student_user_id == student_user_id)
         .order_by(AcademicRecord.created_at.desc())
         .limit(1)
     )
     res = await session.execute(q)
-    return res.scalar_one_or_none()
+    return res.one_or_none()
+
+
+def _require_pin_allowed(user: User, model_version: str | None) -> None:
+    # Comparing versions is a staff tool; students always get the promoted model.
+    if model_version is not None and user.role not in (UserRole.teacher, UserRole.admin):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
 
 def _risk_label(p: float, threshold: float) -> str:
     return "At-Risk" if p >= threshold else "Not-At-Risk"
 
 
-@router.post(
-    "/predict",
-    response_model=PredictionResponse,
-)
-async def predict(
-    body: PredictionRequest,
-    session: AsyncSession = Depends(get_db_session),
-    user: User = Depends(get_current_user),
-) -> PredictionResponse:
-    df_raw = None
+@dataclass(frozen=True)
+class _ResolvedInput:
+    df: pd.DataFrame
+    # Whose record was scored (None for ad-hoc features).
+    academic_record_id: uuid.UUID | None = None
+    student_user_id: uuid.UUID | None = None
 
-    if body.features is not None:
+
+async def _resolve_input(
+    session: AsyncSession,
+    user: User,
+    *,
+    academic_record_id: uuid.UUID | None,
+    student_user_id: uuid.UUID | None,
+    features: PredictFromFeatures | None,
+) -> _ResolvedInput:
+    """Resolve the model input for predict/explain/assess, enforcing RBAC."""
+
+    if features is not None:
         # Teachers/Admins only (to avoid students self-tweaking inputs to "game" the model).
         if user.role not in (UserRole.teacher, UserRole.admin):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-        df_raw = df_from_features(**body.features.model_dump())
+        return _ResolvedInput(df=df_from_features(**features.model_dump()))
 
-    elif body.academic_record_id is not None:
-        record = await _get_record(session, record_id=body.academic_record_id)
+    if academic_record_id is not None:
+        record = await _get_record(session, record_id=academic_record_id)
         if not record:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Academic record not found")
 
@@ -85,33 +152,117 @@ async def predict(
         if user.role == UserRole.student and record.student_user_id != user.id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
-        df_raw = df_from_record(record)
+        return _ResolvedInput(df_from_record(record), record.id, record.student_user_id)
 
-    else:
-        # student_user_id path -> pick latest record
-        target_student_id = body.student_user_id
-        if target_student_id is None:
-            # If caller is a student, default to self.
-            target_student_id = user.id
+    # student_user_id path -> pick latest record
+    target_student_id = student_user_id
+    if target_student_id is None:
+        # If caller is a student, default to self.
+        target_student_id = user.id
 
-        if user.role == UserRole.student and target_student_id != user.id:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-        if user.role not in (UserRole.student, UserRole.teacher, UserRole.admin):
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    if user.role == UserRole.student and target_student_id != user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    if user.role not in (UserRole.student, UserRole.teacher, UserRole.admin):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
-        record = await _get_latest_record_for_student(session, student_user_id=target_student_id)
-        if not record:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No academic record found")
-        df_raw = df_from_record(record)
+    record = await _get_latest_record_for_student(session, student_user_id=target_student_id)
+    if not record:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No academic record found")
+    return _ResolvedInput(df_from_record(record), record.id, record.student_user_id)
+
+
+async def _audit_prediction(
+    audit: PredictionAuditLog,
+    user: User,
+    resolved: _ResolvedInput,
+    *,
+    endpoint: str,
+    version: str,
+    mode: str,
+    degraded: bool,
+    threshold: float | None,
+    p: float,
+) -> None:
+    row = resolved.df.iloc[0]
+    await audit.record(
+        endpoint=endpoint,
+        caller_user_id=user.id,
+        caller_role=user.role.value,
+        student_user_id=resolved.student_user_id,
+        academic_record_id=resolved.academic_record_id,
+        model_version=version,
+        inference_mode=mode,
+        degraded=degraded,
+        threshold=float(threshold) if threshold is not None else None,
+        risk_probability=float(p),
+        classification=_risk_label(p, threshold) if threshold is not None else None,
+        inputs={k: float(v) for k, v in row.items()},
+    )
+
+
+def _factors_public(factors) -> list[FactorPublic]:
+    return [
+        FactorPublic(
+            feature_key=f.feature,
+            feature_label=human_label(f.feature),
+            value=float(f.value),
+            impact=float(f.impact),
+            direction=f.direction,
+            unit=human_unit(f.feature),
+        )
+        for f in factors
+    ]
 
-    p, version = predict_proba_from_raw_df(df_raw)
+
+@router.post(
+    "/predict",
+    response_model=PredictionResponse,
+)
+async def predict(
+    body: PredictionRequest,
+    session: AsyncSession = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+    audit: PredictionAuditLog = Depends(get_prediction_audit),
+) -> PredictionResponse:
+    _require_pin_allowed(user, body.model_version)
+    resolved = await _resolve_input(
+        session,
+        user,
+        academic_record_id=body.academic_record_id,
+        student_user_id=body.student_user_id,
+        features=body.features,
+    )
+    df_raw = resolved.df
+
+    loaded = await get_model_for_version(body.model_version) if body.model_version else None
+    outcome = await predict_with_deadline(
+        df_raw,
+        threshold=body.threshold,
+        loaded=loaded,
+        mode=body.mode,
+        budget_ms=body.latency_budget_ms,
+    )
+    p = outcome.probability
+    await _audit_prediction(
+        audit,
+        user,
+        resolved,
+        endpoint="predict",
+        version=outcome.version,
+        mode=outcome.mode,
+        degraded=outcome.degraded,
+        threshold=body.threshold,
+        p=p,
+    )
 
     return PredictionResponse(
         classification=_risk_label(p, body.threshold),
         risk_probability=float(p),
         confidence=float(max(p, 1.0 - p)),
         threshold=float(body.threshold),
-        model_version=version,
+        model_version=outcome.version,
+        inference_mode=outcome.mode,
+        degraded=outcome.degraded,
     )
 
 
@@ -120,54 +271,282 @@ async def explain(
     body: ExplainRequest,
     session: AsyncSession = Depends(get_db_session),
     user: User = Depends(get_current_user),
+    audit: PredictionAuditLog = Depends(get_prediction_audit),
 ) -> ExplainResponse:
-    df_raw = None
+    _require_pin_allowed(user, body.model_version)
+    resolved = await _resolve_input(
+        session,
+        user,
+        academic_record_id=body.academic_record_id,
+        student_user_id=body.student_user_id,
+        features=body.features,
+    )
+    df_raw = resolved.df
+
+    loaded = await get_model_for_version(body.model_version) if body.model_version else None
+    outcome = await explain_with_deadline(
+        df_raw,
+        top_k=body.top_k,
+        loaded=loaded,
+        mode=body.mode,
+        budget_ms=body.latency_budget_ms,
+    )
+    if outcome.base_probability is not None:
+        # Ensemble mode shows the full model's probability (fresh or cached), without a threshold.
+        await _audit_prediction(
+            audit,
+            user,
+            resolved,
+            endpoint="explain",
+            version=outcome.version,
+            mode="full",
+            degraded=outcome.degraded,
+            threshold=None,
+            p=outcome.base_probability,
+        )
+
+    return ExplainResponse(
+        model_version=outcome.version,
+        factors=_factors_public(outcome.factors),
+        degraded=outcome.degraded,
+        base_probability=outcome.base_probability,
+    )
+
+
+@router.post("/assess", response_model=AssessResponse)
+async def assess(
+    body: AssessRequest,
+    session: AsyncSession = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+    audit: PredictionAuditLog = Depends(get_prediction_audit),
+) -> AssessResponse:
+    """Prediction and top factors together (one record lookup, one preprocessing, one model pass).
+
+    Same access rules as `/ml/predict`; meant for dashboards that would otherwise
+    call `/ml/predict` and `/ml/explain` back to back.
+    """
+
+    _require_pin_allowed(user, body.model_version)
+    resolved = await _resolve_input(
+        session,
+        user,
+        academic_record_id=body.academic_record_id,
+        student_user_id=body.student_user_id,
+        features=body.features,
+    )
+    df_raw = resolved.df
+
+    loaded = await get_model_for_version(body.model_version) if body.model_version else None
+    outcome = await assess_with_deadline(
+        df_raw,
+        threshold=body.threshold,
+        top_k=body.top_k,
+        loaded=loaded,
+        mode=body.mode,
+        budget_ms=body.latency_budget_ms,
+    )
+    p = outcome.probability
+    await _audit_prediction(
+        audit,
+        user,
+        resolved,
+        endpoint="assess",
+        version=outcome.version,
+        mode=outcome.mode,
+        degraded=outcome.degraded,
+        threshold=body.threshold,
+        p=p,
+    )
+
+    return AssessResponse(
+        classification=_risk_label(p, body.threshold),
+        risk_probability=p,
+        confidence=float(max(p, 1.0 - p)),
+        threshold=float(body.threshold),
+        model_version=outcome.version,
+        factors=_factors_public(outcome.factors),
+        degraded=outcome.degraded,
+        base_probability=outcome.base_probability,
+    )
+
+
+@router.post("/counterfactual", response_model=CounterfactualResponse)
+async def counterfactual(
+    body: CounterfactualRequest,
+    session: AsyncSession = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+    audit: PredictionAuditLog = Depends(get_prediction_audit),
+) -> CounterfactualResponse:
+    """What single change would move this record across the threshold.
 
+    Same access rules as `/ml/predict`. Every candidate value of every feature is
+    scored in one batched call.
+    """
+
+    _require_pin_allowed(user, body.model_version)
+    resolved = await _resolve_input(
+        session,
+        user,
+        academic_record_id=body.academic_record_id,
+        student_user_id=body.student_user_id,
+        features=body.features,
+    )
+    df_raw = resolved.df
+    loaded = await get_model_for_version(body.model_version) if body.model_version else get_loaded_model()
+    # The candidate grid runs to thousands of rows: score it off the event loop.
+    result, version = await asyncio.to_thread(
+        counterfactuals_from_raw_df,
+        df_raw,
+        threshold=body.threshold,
+        pct_step=body.pct_step,
+        gpa_step=body.gpa_step,
+        loaded=loaded,
+    )
+    await _audit_prediction(
+        audit,
+        user,
+        resolved,
+        endpoint="counterfactual",
+        version=version,
+        mode="full",
+        degraded=False,
+        threshold=body.threshold,
+        p=result.probability,
+    )
+
+    return CounterfactualResponse(
+        model_version=version,
+        threshold=float(body.threshold),
+        classification=_risk_label(result.probability, body.threshold),
+        risk_probability=result.probability,
+        variants_scored=result.variants_scored,
+        changes=[
+            CounterfactualChange(
+                feature_key=c.feature,
+                feature_label=human_label(c.feature),
+                unit=human_unit(c.feature),
+                current_value=c.current_value,
+                required_value=c.required_value,
+                delta=c.delta,
+                risk_probability=c.probability,
+            )
+            for c in result.changes
+        ],
+    )
+
+
+async def _ensure_similarity_index(session: AsyncSession, index: SimilarityIndex) -> None:
+    if index.ready:
+        return
+    # One lazy build at a time; concurrent first requests wait for it instead of building again.
+    async with index.build_lock:
+        if index.ready:
+            return
+        # Writes from here on are journaled and replayed by build(), so records written
+        # between the SELECT and the build are not lost.
+        index.begin_build()
+        try:
+            res = await session.execute(
+                select(
+                    AcademicRecord.id,
+                    AcademicRecord.student_user_id,
+                    *[getattr(AcademicRecord, c) for c in SIMILARITY_COLUMNS],
+                )
+            )
+            rows = res.all()
+            raw = np.asarray([r[2:] for r in rows], dtype=float).reshape(-1, len(SIMILARITY_COLUMNS))
+            await asyncio.to_thread(index.build, [r[0] for r in rows], [r[1] for r in rows], raw)
+        except BaseException:
+            index.abort_build()
+            raise
+
+
+@router.post(
+    "/similar",
+    response_model=SimilarStudentsResponse,
+    dependencies=[Depends(require_roles(UserRole.teacher, UserRole.admin))],
+)
+async def similar_students(
+    body: SimilarRequest,
+    session: AsyncSession = Depends(get_db_session),
+    index: SimilarityIndex = Depends(get_similarity_index),
+) -> SimilarStudentsResponse:
+    """Past records whose academic signals look most like the given one, and how those students ended up.
+
+    Backed by an in-memory KD-tree (built on first use, updated on record writes),
+    so the `academic_records` table is never scanned per query.
+    """
+
+    exclude: uuid.UUID | None = None
     if body.features is not None:
-        if user.role not in (UserRole.teacher, UserRole.admin):
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
         df_raw = df_from_features(**body.features.model_dump())
-
     elif body.academic_record_id is not None:
         record = await _get_record(session, record_id=body.academic_record_id)
         if not record:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Academic record not found")
-
-        if user.role == UserRole.student and record.student_user_id != user.id:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-
         df_raw = df_from_record(record)
-
-    else:
-        target_student_id = body.student_user_id
-        if target_student_id is None:
-            target_student_id = user.id
-
-        if user.role == UserRole.student and target_student_id != user.id:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-        if user.role not in (UserRole.student, UserRole.teacher, UserRole.admin):
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-
-        record = await _get_latest_record_for_student(session, student_user_id=target_student_id)
+        exclude = record.student_user_id
+    elif body.student_user_id is not None:
+        record = await _get_latest_record_for_student(session, student_user_id=body.student_user_id)
         if not record:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No academic record found")
         df_raw = df_from_record(record)
+        exclude = record.student_user_id
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide academic_record_id, student_user_id or features",
+        )
 
-    factors, version = explain_from_raw_df(df_raw, top_k=body.top_k)
+    await _ensure_similarity_index(session, index)
+    neighbors = index.query(
+        df_raw[list(SIMILARITY_COLUMNS)].to_numpy(dtype=float)[0],
+        k=body.k,
+        exclude_student=exclude if body.exclude_same_student else None,
+    )
+    if not neighbors:
+        return SimilarStudentsResponse(indexed_records=index.size, neighbors=[])
 
-    out = [
-        FactorPublic(
-            feature_key=f.feature,
-            feature_label=human_label(f.feature),
-            value=float(f.value),
-            impact=float(f.impact),
-            direction=f.direction,
-            unit=human_unit(f.feature),
+    cols = ["id", "student_user_id", "term", "created_at", *SIMILARITY_COLUMNS]
+    res = await session.execute(
+        select(User.id, User.full_name).where(User.id.in_({n.student_user_id for n in neighbors}))
+    )
+    names = {uid: name for uid, name in res.all()}
+    # All records of the neighbouring students: the matched ones plus their latest (the outcome).
+    res = await session.execute(
+        select(*[getattr(AcademicRecord, c) for c in cols]).where(
+            AcademicRecord.student_user_id.in_({n.student_user_id for n in neighbors})
         )
-        for f in factors
-    ]
-
-    return ExplainResponse(model_version=version, factors=out)
+    )
+    df = pd.DataFrame(res.all(), columns=cols)
+    df["at_risk"] = derive_at_risk_label(df).astype(bool)
+    by_id = df.set_index("id")
+    latest = df.sort_values("created_at").groupby("student_user_id").tail(1).set_index("student_user_id")
+
+    out: list[SimilarStudent] = []
+    for n in neighbors:
+        if n.record_id not in by_id.index:
+            continue  # deleted since the index last saw it
+        r = by_id.loc[n.record_id]
+        last = latest.loc[n.student_user_id]
+        out.append(
+            SimilarStudent(
+                record_id=n.record_id,
+                student_user_id=n.student_user_id,
+                student_name=names.get(n.student_user_id, ""),
+                term=r["term"],
+                distance=n.distance,
+                attendance_pct=int(r["attendance_pct"]),
+                assignments_pct=int(r["assignments_pct"]),
+                quizzes_pct=int(r["quizzes_pct"]),
+                exams_pct=int(r["exams_pct"]),
+                gpa=float(r["gpa"]),
+                at_risk=bool(r["at_risk"]),
+                outcome_term=last["term"],
+                outcome_at_risk=bool(last["at_risk"]),
+            )
+        )
+    return SimilarStudentsResponse(indexed_records=index.size, neighbors=out)
 
 
 @router.get(
@@ -190,9 +569,61 @@ async def model_info() -> ModelInfo:
         metrics=meta.metrics,
         feature_names=meta.feature_names,
         notes=meta.notes,
+        distilled_fidelity=meta.distilled_fidelity,
     )
 
 
+@router.get(
+    "/model/importance",
+    response_model=GlobalImportanceResponse,
+    dependencies=[Depends(require_roles(UserRole.teacher, UserRole.admin))],
+)
+async def model_importance(model_version: str | None = None) -> GlobalImportanceResponse:
+    """What drives risk in general: importance computed at training time.
+
+    Served from the version's stored `importance.json` (cached in memory); no
+    model is loaded and nothing is scored per request.
+    """
+
+    from app.ml.registry import latest_version
+
+    v = model_version or latest_version()
+    if not v:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No model registered")
+    # Checked before touching the filesystem: the version is a path component.
+    if not version_exists(v):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model version not found")
+
+    try:
+        data = global_importance(v)
+        return GlobalImportanceResponse(
+            model_version=v,
+            rows=data["rows"],
+            base_probability=data["base_probability"],
+            features=[
+                FeatureImportance(
+                    feature_key=f["feature"],
+                    feature_label=human_label(f["feature"]),
+                    unit=human_unit(f["feature"]),
+                    mean_abs_impact=f["mean_abs_impact"],
+                    share=f["share"],
+                    direction=f["direction"],
+                )
+                for f in data["features"]
+            ],
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No stored feature importance for this version. Retrain to enable it.",
+        ) from e
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Stored feature importance for this version is unreadable. Retrain to rebuild it.",
+        ) from e
+
+
 @router.get(
     "/models",
     response_model=ModelListResponse,
@@ -218,6 +649,7 @@ async def list_models(limit: int = 200) -> ModelListResponse:
                 metrics=meta.metrics,
                 feature_names=meta.feature_names,
                 notes=meta.notes,
+                distilled_fidelity=meta.distilled_fidelity,
             )
         )
 
@@ -245,10 +677,232 @@ async def promote_model(model_version: str) -> PromoteResponse:
         metrics=meta.metrics,
         feature_names=meta.feature_names,
         notes=meta.notes,
+        distilled_fidelity=meta.distilled_fidelity,
     )
     return PromoteResponse(latest_version=model_version, model=model)
 
 
+@router.post(
+    "/models/compare",
+    response_model=CompareResponse,
+    dependencies=[Depends(require_roles(UserRole.admin))],
+)
+async def compare_models(
+    body: CompareRequest,
+    session: AsyncSession = Depends(get_db_session),
+) -> CompareResponse:
+    """Score one dataset with two registry versions and report how they disagree.
+
+    Meant to be run before `/ml/models/{version}/promote`; nothing is promoted here.
+    """
+
+    from app.ml.registry import latest_version
+
+    baseline_version = body.baseline_version or latest_version()
+    if not baseline_version:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No model registered")
+
+    baseline = await get_model_for_version(baseline_version)
+    candidate = await get_model_for_version(body.candidate_version)
+
+    group_ids = None
+    if body.source == "holdout":
+        holdout_version = body.holdout_version or body.candidate_version
+        if not version_exists(holdout_version):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model version not found")
+        try:
+            holdout = load_holdout(holdout_version)
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No stored holdout for this version") from e
+        x = pd.DataFrame(holdout["x"], columns=[str(c) for c in holdout["feature_names"]])
+        y = holdout["y"].astype(int)
+    else:
+        res = await session.execute(
+            select(
+                AcademicRecord.student_user_id,
+                AcademicRecord.attendance_pct,
+                AcademicRecord.assignments_pct,
+                AcademicRecord.quizzes_pct,
+                AcademicRecord.exams_pct,
+                AcademicRecord.gpa,
+            )
+        )
+        rows = res.all()
+        if not rows:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No academic records to score")
+
+        df = pd.DataFrame(
+            rows,
+            columns=["student_user_id", "attendance_pct", "assignments_pct", "quizzes_pct", "exams_pct", "gpa"],
+        )
+        group_ids = df["student_user_id"].astype(str).to_numpy()
+        x = preprocess_records(df)
+        y = derive_at_risk_label(df).to_numpy()
+
+    p_base, p_cand = await asyncio.to_thread(score_pair, baseline.artifact, candidate.artifact, x)
+    report = compare_probabilities(p_base, p_cand, threshold=body.threshold, y_true=np.asarray(y), group_ids=group_ids)
+
+    return CompareResponse(
+        baseline_version=baseline.version,
+        candidate_version=candidate.version,
+        source=body.source,
+        **report,
+    )
+
+
+@router.post(
+    "/simulate",
+    response_model=SimulationResponse,
+    dependencies=[Depends(require_roles(UserRole.admin))],
+)
+async def simulate(
+    body: SimulationRequest,
+    session: AsyncSession = Depends(get_db_session),
+) -> SimulationResponse:
+    """Cohort intervention simulator ("what if attendance rose 10 points in term 2-1?").
+
+    Loads the matching records column-wise, applies the transforms to the whole
+    matrix and scores baseline and scenario together in one batched call.
+    """
+
+    loaded = await get_model_for_version(body.model_version) if body.model_version else get_loaded_model()
+
+    q = select(
+        AcademicRecord.student_user_id,
+        AcademicRecord.attendance_pct,
+        AcademicRecord.assignments_pct,
+        AcademicRecord.quizzes_pct,
+        AcademicRecord.exams_pct,
+        AcademicRecord.gpa,
+    )
+    if body.terms:
+        q = q.where(AcademicRecord.term.in_(body.terms))
+    if body.student_user_ids:
+        q = q.where(AcademicRecord.student_user_id.in_(body.student_user_ids))
+    rows = (await session.execute(q)).all()
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No academic records match the filter")
+
+    df = pd.DataFrame(
+        rows,
+        columns=["student_user_id", "attendance_pct", "assignments_pct", "quizzes_pct", "exams_pct", "gpa"],
+    )
+    transforms = [FeatureTransform(feature=t.feature, op=t.op, value=t.value) for t in body.transforms]
+    report = await asyncio.to_thread(
+        simulate_intervention,
+        loaded.artifact,
+        df,
+        transforms,
+        threshold=body.threshold,
+        group_ids=df["student_user_id"].astype(str).to_numpy(),
+        bootstrap=body.bootstrap,
+        confidence=body.confidence,
+        seed=body.seed,
+    )
+
+    return SimulationResponse(model_version=loaded.version, threshold=float(body.threshold), **report)
+
+
+@router.get(
+    "/models/{model_version}/thresholds",
+    response_model=ThresholdAnalysisResponse,
+    dependencies=[Depends(require_roles(UserRole.admin))],
+)
+async def threshold_analysis(
+    model_version: str,
+    threshold: list[float] = Query(default=[]),
+    steps: int = Query(default=21, ge=2, le=1001),
+) -> ThresholdAnalysisResponse:
+    """Precision/recall/F1 and flagged counts on the stored holdout.
+
+    Pass one or more `threshold` values, or omit them for an evenly spaced sweep
+    over [0, 1] with `steps` points. Answers come from the version's stored holdout
+    predictions; the model itself is never loaded.
+    """
+
+    if any(t < 0.0 or t > 1.0 for t in threshold):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="threshold must be 0.0-1.0")
+    if not version_exists(model_version):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model version not found")
+
+    try:
+        curve = threshold_curve(model_version)
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No stored holdout predictions for this version. Retrain to enable threshold analysis.",
+        ) from e
+
+    grid = np.asarray(threshold, dtype=float) if threshold else np.linspace(0.0, 1.0, steps)
+    cols = curve.evaluate(grid)
+    points = [
+        ThresholdPoint(**{k: v[i].item() for k, v in cols.items()})
+        for i in range(grid.size)
+    ]
+    return ThresholdAnalysisResponse(
+        model_version=model_version,
+        holdout_rows=curve.n,
+        holdout_positives=curve.positives,
+        points=points,
+    )
+
+
+@router.get(
+    "/metrics",
+    response_model=ServingMetricsResponse,
+    dependencies=[Depends(require_roles(UserRole.admin))],
+)
+async def serving_metrics() -> ServingMetricsResponse:
+    """In-process serving counters: requests, degraded fallbacks and their rate per endpoint."""
+    return ServingMetricsResponse(**get_inference_gate().snapshot())
+
+
+def _shadow_status() -> ShadowStatsResponse:
+    from app.ml.registry import latest_version
+
+    return ShadowStatsResponse(active_version=latest_version(), **get_shadow_scorer().snapshot())
+
+
+@router.get(
+    "/shadow",
+    response_model=ShadowStatsResponse,
+    dependencies=[Depends(require_roles(UserRole.admin))],
+)
+async def shadow_stats() -> ShadowStatsResponse:
+    """Disagreement between the active model and the shadow candidate on live traffic."""
+    return _shadow_status()
+
+
+@router.put(
+    "/shadow/{model_version}",
+    response_model=ShadowStatsResponse,
+    dependencies=[Depends(require_roles(UserRole.admin))],
+)
+async def set_shadow_model(model_version: str) -> ShadowStatsResponse:
+    from app.ml.registry import set_shadow_version
+
+    try:
+        set_shadow_version(model_version)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model version not found") from e
+
+    get_shadow_scorer().set_version(model_version)
+    return _shadow_status()
+
+
+@router.delete(
+    "/shadow",
+    response_model=ShadowStatsResponse,
+    dependencies=[Depends(require_roles(UserRole.admin))],
+)
+async def clear_shadow_model() -> ShadowStatsResponse:
+    from app.ml.registry import clear_shadow_version
+
+    clear_shadow_version()
+    get_shadow_scorer().set_version(None)
+    return _shadow_status()
+
+
 @router.post(
     "/train",
     response_model=TrainResponse,
@@ -286,9 +940,9 @@ async def train_model(
         columns=["attendance_pct", "assignments_pct", "quizzes_pct", "exams_pct", "gpa"],
     )
 
-    from app.ml.train import train_from_dataframe
+    from app.ml.train import TrainConfig, train_from_dataframe
 
-    version, meta = train_from_dataframe(df, notes=body.notes)
+    version, meta = train_from_dataframe(df, train_cfg=TrainConfig(distill=body.distill), notes=body.notes)
 
     model = ModelInfo(
         model_version=version,
@@ -296,5 +950,6 @@ async def train_model(
         metrics=meta.metrics,
         feature_names=meta.feature_names,
         notes=meta.notes,
+        distilled_fidelity=meta.distilled_fidelity,
     )
     return TrainResponse(trained=True, model=model)
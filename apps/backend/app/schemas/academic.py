@@ -5,6 +5,8 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from app.models.import_job import ImportJobStatus
+
 
 class AcademicRecordBase(BaseModel):
     attendance_pct: int = Field(ge=0, le=100)
@@ -42,6 +44,9 @@ class AcademicRecordList(BaseModel):
 
 class AcademicImportRowError(BaseModel):
     row: int = Field(ge=1, description="1-based row number in the CSV including header as row 1")
+    # Error type: missing_field, invalid_number, out_of_range, missing_student, invalid_student,
+    # duplicate_record or invalid_row.
+    code: str = "invalid_row"
     message: str
     raw: dict[str, str] | None = None
 
@@ -50,4 +55,37 @@ class AcademicImportResponse(BaseModel):
     dry_run: bool
     total_rows: int = Field(ge=0)
     created: int = Field(ge=0)
+    # Upsert imports: existing (student, term) records changed / left as they were.
+    updated: int = Field(default=0, ge=0)
+    unchanged: int = Field(default=0, ge=0)
+    # Total rows/groups rejected, by `code`; `errors` is a sample of at most
+    # IMPORT_MAX_REPORTED_ERRORS of them.
+    error_count: int = Field(default=0, ge=0)
+    error_counts: dict[str, int] = {}
+    errors: list[AcademicImportRowError] = []
+    # All errors as NDJSON: GET /academics/import/reports/{error_report_id}.
+    error_report_id: uuid.UUID | None = None
+
+
+class ImportJobPublic(BaseModel):
+    id: uuid.UUID
+    status: ImportJobStatus
+    filename: str
+    dry_run: bool
+    upsert: bool
+    total_bytes: int
+    bytes_processed: int
+    rows_processed: int
+    created: int
+    updated: int
+    unchanged: int
+    error_count: int
+    error_counts: dict[str, int] = {}
     errors: list[AcademicImportRowError] = []
+    # Set once the job has row errors (the report is written as the job runs).
+    error_report_id: uuid.UUID | None = None
+    # Why the job failed (status == "failed").
+    failure: str | None = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: datetime | None = None
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
@@ -21,6 +22,12 @@ class PredictionRequest(BaseModel):
     features: PredictFromFeatures | None = None
 
     threshold: float = Field(default=0.5, ge=0.0, le=1.0)
+    # "fast" serves the distilled student model when the version has one.
+    mode: Literal["full", "fast"] = "full"
+    # Over this budget (ms) the logistic component alone answers and `degraded` is set.
+    latency_budget_ms: int | None = Field(default=None, ge=1, le=60000)
+    # Teachers/Admins only: score with a specific registry version instead of LATEST.
+    model_version: str | None = Field(default=None, max_length=64)
 
 
 class PredictionResponse(BaseModel):
@@ -29,6 +36,8 @@ class PredictionResponse(BaseModel):
     confidence: float = Field(ge=0.0, le=1.0)
     threshold: float = Field(ge=0.0, le=1.0)
     model_version: str
+    inference_mode: str = "full"  # "full" | "fast" (distilled student) | "logistic" (degraded)
+    degraded: bool = False
 
 
 class ExplainRequest(BaseModel):
@@ -37,6 +46,14 @@ class ExplainRequest(BaseModel):
     features: PredictFromFeatures | None = None
 
     top_k: int = Field(default=5, ge=1, le=10)
+    # "lgbm": SHAP values of the LightGBM half (raw-score units).
+    # "ensemble": attributions of the full ensemble in probability units, adding up to
+    # risk_probability - base_probability.
+    mode: Literal["lgbm", "ensemble"] = "lgbm"
+    # Over this budget (ms) a cached or global explanation is served and `degraded` is set.
+    latency_budget_ms: int | None = Field(default=None, ge=1, le=60000)
+    # Teachers/Admins only: explain with a specific registry version instead of LATEST.
+    model_version: str | None = Field(default=None, max_length=64)
 
 
 class FactorPublic(BaseModel):
@@ -51,6 +68,119 @@ class FactorPublic(BaseModel):
 class ExplainResponse(BaseModel):
     model_version: str
     factors: list[FactorPublic]
+    degraded: bool = False
+    # Ensemble mode only: the probability the factor impacts are measured from.
+    base_probability: float | None = None
+
+
+class AssessRequest(BaseModel):
+    # Provide ONE of: academic_record_id, student_user_id, or features.
+    academic_record_id: uuid.UUID | None = None
+    student_user_id: uuid.UUID | None = None
+    features: PredictFromFeatures | None = None
+
+    threshold: float = Field(default=0.5, ge=0.0, le=1.0)
+    top_k: int = Field(default=5, ge=1, le=10)
+    # Same meaning as ExplainRequest.mode.
+    mode: Literal["lgbm", "ensemble"] = "lgbm"
+    latency_budget_ms: int | None = Field(default=None, ge=1, le=60000)
+    # Teachers/Admins only.
+    model_version: str | None = Field(default=None, max_length=64)
+
+
+class AssessResponse(BaseModel):
+    classification: str  # "At-Risk" | "Not-At-Risk"
+    risk_probability: float = Field(ge=0.0, le=1.0)
+    confidence: float = Field(ge=0.0, le=1.0)
+    threshold: float = Field(ge=0.0, le=1.0)
+    model_version: str
+    factors: list[FactorPublic]
+    degraded: bool = False
+    base_probability: float | None = None
+
+
+class CounterfactualRequest(BaseModel):
+    # Provide ONE of: academic_record_id, student_user_id, or features (teachers/admins).
+    academic_record_id: uuid.UUID | None = None
+    student_user_id: uuid.UUID | None = None
+    features: PredictFromFeatures | None = None
+
+    threshold: float = Field(default=0.5, ge=0.0, le=1.0)
+    pct_step: int = Field(default=5, ge=1, le=25)
+    gpa_step: float = Field(default=0.1, ge=0.01, le=1.0)
+    # Teachers/Admins only.
+    model_version: str | None = Field(default=None, max_length=64)
+
+
+class CounterfactualChange(BaseModel):
+    feature_key: str
+    feature_label: str
+    unit: str | None = None
+    current_value: float
+    # Null when changing this feature alone cannot cross the threshold.
+    required_value: float | None = None
+    delta: float | None = None
+    risk_probability: float | None = None
+
+
+class CounterfactualResponse(BaseModel):
+    model_version: str
+    threshold: float
+    classification: str  # current classification
+    risk_probability: float = Field(ge=0.0, le=1.0)
+    variants_scored: int
+    # At-Risk records: smallest improvement per feature that drops below the threshold.
+    # Other records: how far each feature can fall before the record becomes At-Risk.
+    changes: list[CounterfactualChange]
+
+
+class SimilarRequest(BaseModel):
+    # Provide ONE of: academic_record_id, student_user_id (latest record), or features.
+    academic_record_id: uuid.UUID | None = None
+    student_user_id: uuid.UUID | None = None
+    features: PredictFromFeatures | None = None
+
+    k: int = Field(default=5, ge=1, le=50)
+    # Skip the queried student's own records.
+    exclude_same_student: bool = True
+
+
+class SimilarStudent(BaseModel):
+    record_id: uuid.UUID
+    student_user_id: uuid.UUID
+    student_name: str = ""
+    term: str | None = None
+    distance: float  # Euclidean, in standardized units
+    attendance_pct: int
+    assignments_pct: int
+    quizzes_pct: int
+    exams_pct: int
+    gpa: float
+    at_risk: bool  # heuristic label of this record
+    # How they ended up: heuristic label of the student's most recent record.
+    outcome_term: str | None = None
+    outcome_at_risk: bool
+
+
+class SimilarStudentsResponse(BaseModel):
+    indexed_records: int
+    neighbors: list[SimilarStudent]
+
+
+class FeatureImportance(BaseModel):
+    feature_key: str
+    feature_label: str
+    unit: str | None = None
+    mean_abs_impact: float  # mean |contribution| to the ensemble probability
+    share: float  # mean_abs_impact normalized over all features
+    direction: str  # "higher_increases_risk" | "higher_decreases_risk"
+
+
+class GlobalImportanceResponse(BaseModel):
+    model_version: str
+    rows: int  # training rows the importance was computed on
+    base_probability: float
+    features: list[FeatureImportance]
 
 
 class ModelInfo(BaseModel):
@@ -59,10 +189,13 @@ class ModelInfo(BaseModel):
     metrics: dict[str, float]
     feature_names: list[str]
     notes: str = ""
+    distilled_fidelity: dict[str, float] = {}
 
 
 class TrainRequest(BaseModel):
     notes: str = Field(default="", max_length=500)
+    # Also fit a small student model for `mode="fast"` inference.
+    distill: bool = False
     min_rows: int = Field(default=20, ge=5, le=10000)
 
 
@@ -79,3 +212,149 @@ class ModelListResponse(BaseModel):
 class PromoteResponse(BaseModel):
     latest_version: str
     model: ModelInfo
+
+
+class ShadowDeltaBucket(BaseModel):
+    le: float
+    count: int
+
+
+class ShadowStatsResponse(BaseModel):
+    active_version: str | None = None
+    shadow_version: str | None = None
+    sample_rate: float
+    pending: int = 0
+    scored: int = 0
+    dropped: int = 0
+    errors: int = 0
+    mean_delta: float = 0.0
+    mean_abs_delta: float = 0.0
+    std_delta: float = 0.0
+    max_abs_delta: float = 0.0
+    label_flips: int = 0
+    flips_to_at_risk: int = 0
+    flips_to_not_at_risk: int = 0
+    flip_rate: float = 0.0
+    active_versions: dict[str, int] = {}
+    delta_histogram: list[ShadowDeltaBucket] = []
+
+
+class CompareRequest(BaseModel):
+    candidate_version: str = Field(max_length=64)
+    # Defaults to the LATEST (currently promoted) version.
+    baseline_version: str | None = Field(default=None, max_length=64)
+    # "records": every row in academic_records (heuristic labels, as in /ml/train).
+    # "holdout": the stored evaluation split of `holdout_version` (defaults to the candidate).
+    source: Literal["records", "holdout"] = "records"
+    holdout_version: str | None = Field(default=None, max_length=64)
+    threshold: float = Field(default=0.5, ge=0.0, le=1.0)
+
+
+class DeltaBucket(BaseModel):
+    low: float
+    high: float
+    count: int
+
+
+class DeltaDistribution(BaseModel):
+    mean: float
+    std: float
+    mean_abs: float
+    min: float
+    max: float
+    quantiles: dict[str, float]
+    histogram: list[DeltaBucket]
+
+
+class CompareResponse(BaseModel):
+    baseline_version: str
+    candidate_version: str
+    source: str
+    rows: int
+    threshold: float
+    delta: DeltaDistribution
+    flagged_baseline: int
+    flagged_candidate: int
+    flips_to_at_risk: int
+    flips_to_not_at_risk: int
+    flipped_rows: int
+    flipped_students: int | None = None
+    metrics_baseline: dict[str, float] | None = None
+    metrics_candidate: dict[str, float] | None = None
+    metric_deltas: dict[str, float] | None = None
+
+
+class FeatureTransformIn(BaseModel):
+    feature: Literal["attendance_pct", "assignments_pct", "quizzes_pct", "exams_pct", "gpa"]
+    # add: x + value; scale: x * value; set: value; floor: max(x, value); cap: min(x, value).
+    # Results are clipped to the feature's range before scoring.
+    op: Literal["add", "scale", "set", "floor", "cap"]
+    value: float
+
+
+class SimulationRequest(BaseModel):
+    # Cohort filter; empty lists mean "no filter on this field".
+    terms: list[str] = Field(default_factory=list, max_length=50)
+    student_user_ids: list[uuid.UUID] = Field(default_factory=list, max_length=10000)
+    transforms: list[FeatureTransformIn] = Field(min_length=1, max_length=10)
+    threshold: float = Field(default=0.5, ge=0.0, le=1.0)
+    # Bootstrap replicates for confidence intervals (0 disables them).
+    bootstrap: int = Field(default=0, ge=0, le=5000)
+    confidence: float = Field(default=0.95, gt=0.5, lt=1.0)
+    seed: int | None = None
+    # Defaults to the LATEST (currently promoted) version.
+    model_version: str | None = Field(default=None, max_length=64)
+
+
+class ConfidenceInterval(BaseModel):
+    estimate: float
+    low: float
+    high: float
+
+
+class SimulationResponse(BaseModel):
+    model_version: str
+    threshold: float
+    rows: int
+    students: int | None = None
+    baseline_at_risk: int
+    scenario_at_risk: int
+    leaving_at_risk: int
+    entering_at_risk: int
+    students_leaving_at_risk: int | None = None
+    mean_probability_baseline: float
+    mean_probability_scenario: float
+    delta: DeltaDistribution
+    intervals: dict[str, ConfidenceInterval] | None = None
+
+
+class ThresholdPoint(BaseModel):
+    threshold: float
+    flagged: int
+    true_positives: int
+    false_positives: int
+    false_negatives: int
+    precision: float
+    recall: float
+    f1: float
+    accuracy: float
+
+
+class ThresholdAnalysisResponse(BaseModel):
+    model_version: str
+    holdout_rows: int
+    holdout_positives: int
+    points: list[ThresholdPoint]
+
+
+class EndpointServingStats(BaseModel):
+    requests: int
+    degraded: int
+    fallback_rate: float
+    by_reason: dict[str, int] = {}
+
+
+class ServingMetricsResponse(BaseModel):
+    inflight: int
+    max_inflight: int
+    endpoints: dict[str, EndpointServingStats] = {}
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 from app.models.user import UserRole
 
@@ -14,6 +14,7 @@ class UserPublic(BaseModel):
     full_name: str
     role: UserRole
     is_active: bool
+    password_setup_required: bool = False
     created_at: datetime
 
 
@@ -28,6 +29,8 @@ class UserUpdateAdmin(BaseModel):
     full_name: str | None = None
     role: UserRole | None = None
     is_active: bool | None = None
+    # Sets (or resets) the password, e.g. for imported students awaiting setup.
+    password: str | None = Field(default=None, min_length=12, max_length=128)
 
 
 class UsersList(BaseModel):
@@ -0,0 +1,993 @@
+from __future__ import annotations
+
+import asyncio
+import codecs
+import csv
+import io
+import math
+import uuid
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from dataclasses import dataclass, field, replace
+from functools import partial
+from itertools import islice
+from typing import IO, Any, Protocol, TypeVar
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ml.similarity import SimilarityIndex
+from app.models.user import User, UserRole
+from app.schemas.academic import AcademicImportRowError
+from app.services.academics import AcademicsService, record_key, supports_upsert
+from app.services.import_columnar import (
+    BatchColumns,
+    BatchRows,
+    ColumnarBatches,
+    ColumnarFormat,
+    detect_columnar_format,
+    open_columnar,
+)
+from app.services.import_parsing import ParsePool, iter_shards, read_header, shard_text, to_float
+from app.services.import_reports import ImportErrorReport
+from app.services.users import UsersService
+
+SUMMARY_FIELDS = {"attendance_pct", "assignments_pct", "quizzes_pct", "exams_pct", "gpa"}
+RUET_COURSE_FIELDS = {"credits", "grade_point_4", "attendance_10", "assignments_10", "final_60"}
+
+# Block size for the encoding sniff.
+_SNIFF_BLOCK = 1 << 16
+
+
+class ImportFormatError(ValueError):
+    """The upload as a whole can't be imported (as opposed to a bad row)."""
+
+
+class ImportRowError(ValueError):
+    """A rejected row; `code` is its error type (see `AcademicImportRowError.code`)."""
+
+    def __init__(self, message: str, *, code: str):
+        super().__init__(message)
+        self.code = code
+
+
+@dataclass
+class ImportProgress:
+    rows_read: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    errors: int = 0
+    bytes_read: int = 0
+    total_bytes: int | None = None
+
+
+@dataclass
+class ImportResult:
+    dry_run: bool
+    total_rows: int
+    created: int
+    error_count: int
+    updated: int = 0
+    unchanged: int = 0
+    error_counts: dict[str, int] = field(default_factory=dict)
+    # At most `max_errors` of them; `error_count` has the full tally and the report all of them.
+    errors: list[AcademicImportRowError] = field(default_factory=list)
+    error_report_id: uuid.UUID | None = None
+
+
+@dataclass
+class ImportCheckpoint:
+    """State as of the last committed chunk; enough to resume an interrupted import.
+
+    `units_done` counts data rows consumed for summary files, and aggregated
+    (student, term) groups written for RUET course-marks files.
+    """
+
+    units_done: int
+    progress: ImportProgress
+    errors: list[AcademicImportRowError] = field(default_factory=list)
+    error_counts: dict[str, int] = field(default_factory=dict)
+    # Size of the error report at the checkpoint; later lines are dropped on resume.
+    report_bytes: int = 0
+
+
+@dataclass
+class SummaryPartial:
+    """Parsed summary-format rows: typed value columns plus each row's first value error.
+
+    Student references are kept as given; the importer resolves them against
+    the database, and an invalid reference is reported ahead of `failures`, as
+    a row-by-row parse would. `first_row` is the row number of `rows[0]` (CSV:
+    the header is row 1; Parquet/Arrow: rows count from 1); rows before
+    `start` were imported before a resume.
+    """
+
+    rows: Sequence[dict[str, str]]
+    student_user_id: list[str | None]
+    student_email: list[str | None]
+    # `_SUMMARY_VALUE_COLUMNS` -> int/float array; 0 for rows in `failures`.
+    columns: dict[str, np.ndarray]
+    term: list[str | None]
+    # Position -> (code, message).
+    failures: dict[int, tuple[str, str]]
+    first_row: int = 2
+    start: int = 0
+    bytes_end: int = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def raw(self, pos: int) -> dict[str, str]:
+        return _raw(self.rows[pos])
+
+
+@dataclass
+class RuetPartial:
+    """RUET course-mark rows reduced to per-(student_email, term) sums, plus row errors."""
+
+    n_rows: int
+    sums: pd.DataFrame
+    # (position, code, message, raw row)
+    errors: list[tuple[int, str, str, dict[str, str]]]
+    # First raw row of each group, for errors reported against the group.
+    first_raw: dict[tuple[str, str], dict[str, str]]
+    first_row: int = 2
+    start: int = 0
+    bytes_end: int = 0
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+
+class _Partial(Protocol):
+    """What the partial readers set on each parsed partial (`SummaryPartial` or `RuetPartial`)."""
+
+    first_row: int
+    start: int
+    bytes_end: int
+
+    def __len__(self) -> int: ...
+
+
+_P = TypeVar("_P", bound=_Partial)
+
+# Where a record came from, for row errors found at write time: (row number, raw row, message prefix).
+# The raw row is built only if the record is rejected.
+_Source = tuple[int, Callable[[], dict[str, str] | None], str]
+
+ProgressCallback = Callable[[ImportProgress], None]
+CheckpointCallback = Callable[[ImportCheckpoint], Awaitable[None]]
+HeartbeatCallback = Callable[[], Awaitable[None]]
+
+
+def _parse_int(v: str, *, field: str) -> int:
+    try:
+        return int(v)
+    except Exception as e:
+        raise ImportRowError(f"{field} must be an integer", code="invalid_number") from e
+
+
+def _parse_float(v: str, *, field: str) -> float:
+    try:
+        value = float(v)
+    except Exception as e:
+        raise ImportRowError(f"{field} must be a number", code="invalid_number") from e
+    # float() accepts "nan" and "inf", which would slip through the range checks.
+    if not math.isfinite(value):
+        raise ImportRowError(f"{field} must be a number", code="invalid_number")
+    return value
+
+
+def _require(row: dict[str, str], key: str) -> str:
+    v = (row.get(key) or "").strip()
+    if not v:
+        raise ImportRowError(f"Missing required column '{key}'", code="missing_field")
+    return v
+
+
+def _opt(row: dict[str, str], key: str) -> str | None:
+    v = (row.get(key) or "").strip()
+    return v or None
+
+
+def _has_fields(fieldnames: list[str] | None, required: set[str]) -> bool:
+    if not fieldnames:
+        return False
+    fields = {f.strip() for f in fieldnames if f}
+    return required.issubset(fields)
+
+
+def _normalize_term(row: dict[str, str]) -> str | None:
+    # RUET datasets often use "semester" like 1-1, 1-2, ...
+    return _opt(row, "term") or _opt(row, "semester")
+
+
+def _uuid_or_none(v: str) -> uuid.UUID | None:
+    try:
+        return uuid.UUID(v)
+    except ValueError:
+        return None
+
+
+def _raw(row: dict[str, str]) -> dict[str, str]:
+    return {k: (v if v is not None else "") for k, v in row.items() if k is not None}
+
+
+def detect_encoding(fh: IO[bytes]) -> str:
+    """UTF-8 (with optional BOM) unless some byte sequence isn't, then latin-1.
+
+    Checked block by block with an incremental decoder, so the upload is never
+    decoded as a whole; rewinds `fh` afterwards.
+    """
+
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    try:
+        while block := fh.read(_SNIFF_BLOCK):
+            decoder.decode(block)
+        decoder.decode(b"", final=True)
+        encoding = "utf-8-sig"
+    except UnicodeDecodeError:
+        # Fallback common on Windows exports
+        encoding = "latin-1"
+    fh.seek(0)
+    return encoding
+
+
+async def resolve_students_by_email(
+    users: UsersService,
+    emails: list[str],
+    *,
+    allow_create: bool,
+) -> dict[str, User]:
+    """Resolve every referenced email up front with chunked `IN` queries.
+
+    Emails that don't exist yet are created in bulk as students without a
+    password (flagged `password_setup_required`); an admin sets one later.
+    """
+
+    wanted = list(dict.fromkeys(e.lower().strip() for e in emails))
+    found = await users.get_many_by_email(wanted)
+    if not allow_create:
+        return found
+
+    missing = [email for email in wanted if email not in found]
+    if missing:
+        found.update(await users.create_students_without_password(missing))
+    return found
+
+
+def _valid_student(student: User | None) -> User:
+    if not student or not student.is_active or student.role != UserRole.student:
+        raise ImportRowError("Invalid student reference", code="invalid_student")
+    return student
+
+
+_SUMMARY_VALUE_COLUMNS = ("attendance_pct", "assignments_pct", "quizzes_pct", "exams_pct", "gpa")
+
+
+def _summary_values(row: dict[str, str]) -> tuple[int, int, int, int, float]:
+    attendance_pct = _parse_int(_require(row, "attendance_pct"), field="attendance_pct")
+    assignments_pct = _parse_int(_require(row, "assignments_pct"), field="assignments_pct")
+    quizzes_pct = _parse_int(_require(row, "quizzes_pct"), field="quizzes_pct")
+    exams_pct = _parse_int(_require(row, "exams_pct"), field="exams_pct")
+    gpa = _parse_float(_require(row, "gpa"), field="gpa")
+
+    # Range validation (mirrors Pydantic/model constraints)
+    for name, val in (
+        ("attendance_pct", attendance_pct),
+        ("assignments_pct", assignments_pct),
+        ("quizzes_pct", quizzes_pct),
+        ("exams_pct", exams_pct),
+    ):
+        if val < 0 or val > 100:
+            raise ImportRowError(f"{name} must be 0-100", code="out_of_range")
+    if gpa < 0.0 or gpa > 4.0:
+        raise ImportRowError("gpa must be 0.0-4.0", code="out_of_range")
+    return attendance_pct, assignments_pct, quizzes_pct, exams_pct, gpa
+
+
+def parse_summary_rows(rows: list[dict[str, str]]) -> SummaryPartial:
+    """Parse and validate summary rows, except for their student references (no database access)."""
+    ids: list[str | None] = []
+    emails: list[str | None] = []
+    terms: list[str | None] = []
+    values: list[tuple[int, int, int, int, float]] = []
+    failures: dict[int, tuple[str, str]] = {}
+    for pos, row in enumerate(rows):
+        ids.append(_opt(row, "student_user_id"))
+        emails.append(_opt(row, "student_email"))
+        terms.append(_normalize_term(row))
+        try:
+            values.append(_summary_values(row))
+        except ImportRowError as e:
+            failures[pos] = (e.code, str(e))
+            values.append((0, 0, 0, 0, 0.0))
+
+    by_column = list(zip(*values, strict=True)) if values else [()] * len(_SUMMARY_VALUE_COLUMNS)
+    columns = {
+        c: np.array(col, dtype=float if c == "gpa" else np.int64)
+        for c, col in zip(_SUMMARY_VALUE_COLUMNS, by_column, strict=True)
+    }
+    return SummaryPartial(
+        rows=rows,
+        student_user_id=ids,
+        student_email=emails,
+        columns=columns,
+        term=terms,
+        failures=failures,
+    )
+
+
+def _summary_student(
+    student_user_id: str | None,
+    student_email: str | None,
+    students_by_id: dict[uuid.UUID, User],
+    students_by_email: dict[str, User],
+) -> User:
+    student: User | None = None
+    if student_user_id:
+        sid = _uuid_or_none(student_user_id)
+        student = students_by_id.get(sid) if sid is not None else None
+    elif student_email:
+        student = students_by_email.get(student_email.lower())
+    else:
+        raise ImportRowError("Provide student_user_id or student_email", code="missing_student")
+    return _valid_student(student)
+
+
+def _shard_rows(data: bytes, encoding: str, fieldnames: list[str]) -> list[dict[str, str]]:
+    return list(csv.DictReader(io.StringIO(shard_text(data, encoding), newline=""), fieldnames=fieldnames))
+
+
+def parse_summary_shard(data: bytes, encoding: str, fieldnames: list[str]) -> SummaryPartial:
+    """Worker-process entry point: parse one shard (see `import_parsing.iter_shards`)."""
+    return parse_summary_rows(_shard_rows(data, encoding, fieldnames))
+
+
+def parse_ruet_shard(data: bytes, encoding: str, fieldnames: list[str]) -> RuetPartial:
+    """Worker-process entry point: parse and reduce one RUET course-marks shard."""
+    return ruet_course_partial(_shard_rows(data, encoding, fieldnames))
+
+
+class AcademicCsvImporter:
+    """Streaming CSV importer for academic records.
+
+    - The upload is decoded incrementally (`TextIOWrapper` over the spooled
+      upload) and parsed `chunk_size` rows at a time, off the event loop.
+    - Uploads of `parallel_min_bytes` or more are instead split into shards of
+      about `shard_bytes` on record boundaries and parsed and validated in
+      `parse_pool`'s worker processes (a few shards in flight); the shards'
+      typed columns and row errors are consumed in file order, exactly as the
+      in-process parse would produce them.
+    - Parquet and Arrow IPC uploads (detected by their magic bytes; needs the
+      optional `pyarrow`) are read one record batch at a time and validated on
+      their typed columns, with no text round-trip; the batches then go
+      through the same resolve/write path as CSV chunks.
+    - Each chunk is validated, its students resolved in bulk, and its records
+      written with `AcademicsService.bulk_insert` (no ORM objects) before the
+      next chunk is read, so memory stays flat regardless of file size.
+    - A record for a (student, term) that already exists is a row error, unless
+      `upsert` is set: then changed records are updated in place and unchanged
+      ones are skipped without a write (`AcademicsService.bulk_upsert`).
+    - Every row error is counted by code and appended to `report` (NDJSON on
+      disk, raw row included) when given; only the first `max_errors` are also
+      kept in memory and returned.
+    - `progress` is called after every chunk. `checkpoint` is awaited inside
+      each chunk's transaction, before its commit, so whatever it writes (e.g.
+      a job's progress row) commits atomically with the chunk's records;
+      `run(resume=...)` picks up from such a checkpoint.
+    - `heartbeat` is awaited after every piece of a RUET course-marks file
+      during its aggregation pass, which writes (and checkpoints) nothing.
+
+    RUET course-marks files are aggregated per (student, term) across the
+    whole file first; only the running sums are kept, then the aggregated
+    records go through the same chunked resolve/insert path.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        allow_create_students: bool,
+        dry_run: bool = False,
+        upsert: bool = False,
+        similarity: SimilarityIndex | None = None,
+        chunk_size: int = 1000,
+        max_errors: int = 1000,
+        progress: ProgressCallback | None = None,
+        checkpoint: CheckpointCallback | None = None,
+        heartbeat: HeartbeatCallback | None = None,
+        report: ImportErrorReport | None = None,
+        parse_pool: ParsePool | None = None,
+        parallel_min_bytes: int = 32 * 1024 * 1024,
+        shard_bytes: int = 8 * 1024 * 1024,
+    ):
+        self.session = session
+        self.users = UsersService(session)
+        self.academics = AcademicsService(session, similarity=similarity)
+        self.allow_create_students = allow_create_students
+        self.dry_run = dry_run
+        self.upsert = upsert
+        self.chunk_size = max(1, int(chunk_size))
+        self.max_errors = max(0, int(max_errors))
+        self.progress_callback = progress
+        self.checkpoint_callback = checkpoint
+        self.heartbeat_callback = heartbeat
+        self.report = report
+        self.parse_pool = parse_pool
+        self.parallel_min_bytes = max(0, int(parallel_min_bytes))
+        self.shard_bytes = max(1, int(shard_bytes))
+        self.progress = ImportProgress()
+        self.errors: list[AcademicImportRowError] = []
+        self.error_counts: dict[str, int] = {}
+        self._fh: IO[bytes] | None = None
+        self._units_done = 0
+        self._report_row_errors = True
+
+    async def run(
+        self,
+        fh: IO[bytes],
+        *,
+        total_bytes: int | None = None,
+        resume: ImportCheckpoint | None = None,
+    ) -> ImportResult:
+        if self.upsert and not self.dry_run:
+            dialect = (await self.session.connection()).dialect
+            if not supports_upsert(dialect):
+                raise ImportFormatError(f"Upsert imports are not supported on {dialect.name} databases")
+        self._fh = fh
+        if resume is None:
+            self.progress = ImportProgress(total_bytes=total_bytes)
+            self.errors = []
+            self.error_counts = {}
+            self._units_done = 0
+        else:
+            self.progress = replace(resume.progress, total_bytes=total_bytes)
+            self.errors = list(resume.errors)
+            self.error_counts = dict(resume.error_counts)
+            self._units_done = resume.units_done
+
+        fmt = await asyncio.to_thread(detect_columnar_format, fh)
+        try:
+            if fmt is not None:
+                await self._import_columnar(fh, fmt, total_bytes=total_bytes)
+            else:
+                await self._import_csv(fh, total_bytes=total_bytes)
+        finally:
+            if self.report is not None:
+                await asyncio.to_thread(self.report.flush)
+
+        return ImportResult(
+            dry_run=self.dry_run,
+            total_rows=self.progress.rows_read,
+            created=self.progress.created,
+            error_count=self.progress.errors,
+            updated=self.progress.updated,
+            unchanged=self.progress.unchanged,
+            error_counts=dict(self.error_counts),
+            errors=self.errors,
+            error_report_id=self.report.id if self.report is not None and self.progress.errors else None,
+        )
+
+    async def _import_csv(self, fh: IO[bytes], *, total_bytes: int | None) -> None:
+        encoding = await asyncio.to_thread(detect_encoding, fh)
+        parallel = (
+            self.parse_pool is not None
+            and self.parse_pool.enabled
+            and total_bytes is not None
+            and total_bytes >= self.parallel_min_bytes
+        )
+        text: io.TextIOWrapper | None = None
+        try:
+            if parallel:
+                fieldnames, data_start = await asyncio.to_thread(read_header, fh, encoding)
+            else:
+                text = io.TextIOWrapper(fh, encoding=encoding, newline="")
+                reader = csv.DictReader(text)
+                fieldnames = await asyncio.to_thread(lambda: list(reader.fieldnames or ()))
+            if not fieldnames:
+                raise ImportFormatError("CSV missing header row")
+
+            is_summary = _has_fields(fieldnames, SUMMARY_FIELDS)
+            is_ruet_course = _has_fields(fieldnames, RUET_COURSE_FIELDS)
+            if is_ruet_course and not is_summary:
+                if parallel:
+                    courses = self._shard_partials(
+                        fh, parse_ruet_shard, encoding=encoding, fieldnames=fieldnames, start=data_start
+                    )
+                else:
+                    courses = self._chunk_partials(reader, ruet_course_partial)
+                await self._import_ruet_course(courses)
+            else:
+                # Rows before a resume checkpoint were imported (and counted) already.
+                if parallel:
+                    summaries = self._shard_partials(
+                        fh,
+                        parse_summary_shard,
+                        encoding=encoding,
+                        fieldnames=fieldnames,
+                        start=data_start,
+                        skip=self._units_done,
+                    )
+                else:
+                    summaries = self._chunk_partials(reader, parse_summary_rows, skip=self._units_done)
+                await self._import_summary(summaries)
+        finally:
+            # Leave the caller's file open.
+            if text is not None:
+                text.detach()
+
+    async def _import_columnar(self, fh: IO[bytes], fmt: ColumnarFormat, *, total_bytes: int | None) -> None:
+        try:
+            source = await asyncio.to_thread(open_columnar, fh, fmt)
+        except ImportError as e:
+            raise ImportFormatError(f"{fmt} uploads need the optional 'pyarrow' package") from e
+        except (ValueError, OSError) as e:
+            raise ImportFormatError(f"Unreadable {fmt} file: {e}") from e
+
+        is_summary = _has_fields(source.fieldnames, SUMMARY_FIELDS)
+        is_ruet_course = _has_fields(source.fieldnames, RUET_COURSE_FIELDS)
+        if is_ruet_course and not is_summary:
+            await self._import_ruet_course(
+                self._batch_partials(source, ruet_course_batch_partial, fmt=fmt, total_bytes=total_bytes)
+            )
+        else:
+            await self._import_summary(
+                self._batch_partials(
+                    source, parse_summary_columns, fmt=fmt, total_bytes=total_bytes, skip=self._units_done
+                )
+            )
+
+    async def _chunk_partials(
+        self,
+        reader: csv.DictReader,
+        parse: Callable[[list[dict[str, str]]], _P],
+        *,
+        skip: int = 0,
+    ) -> AsyncIterator[_P]:
+        # In-process: `chunk_size` rows at a time, read off the event loop.
+        if skip:
+            await asyncio.to_thread(lambda: sum(1 for _ in islice(reader, skip)))
+        first_row = 2 + skip  # header is row 1
+        while True:
+            rows = await asyncio.to_thread(lambda: list(islice(reader, self.chunk_size)))
+            if not rows:
+                return
+            part = parse(rows)
+            part.first_row = first_row
+            part.bytes_end = self._fh.tell() if self._fh is not None else 0
+            first_row += len(rows)
+            yield part
+
+    async def _shard_partials(
+        self,
+        fh: IO[bytes],
+        parse: Callable[[bytes, str, list[str]], _P],
+        *,
+        encoding: str,
+        fieldnames: list[str],
+        start: int,
+        skip: int = 0,
+    ) -> AsyncIterator[_P]:
+        # Process pool: shards are read off the event loop and parsed in worker processes,
+        # `workers + 1` at a time, and yielded in file order.
+        assert self.parse_pool is not None
+        loop = asyncio.get_running_loop()
+        executor = self.parse_pool.executor()
+        shards = iter_shards(fh, start=start, shard_bytes=self.shard_bytes)
+        pending: deque[tuple[asyncio.Future, int]] = deque()
+        exhausted = False
+        first_row = 2
+        try:
+            while True:
+                while not exhausted and len(pending) <= self.parse_pool.workers:
+                    shard = await asyncio.to_thread(next, shards, None)
+                    if shard is None:
+                        exhausted = True
+                        break
+                    data, end = shard
+                    pending.append((loop.run_in_executor(executor, parse, data, encoding, fieldnames), end))
+                if not pending:
+                    return
+                future, end = pending.popleft()
+                part = await future
+                part.first_row = first_row
+                part.bytes_end = end
+                first_row += len(part)
+                if skip >= len(part):
+                    skip -= len(part)
+                    continue
+                part.start, skip = skip, 0
+                yield part
+        finally:
+            for future, _ in pending:
+                future.cancel()
+
+    async def _batch_partials(
+        self,
+        source: ColumnarBatches,
+        parse: Callable[[BatchColumns], _P],
+        *,
+        fmt: ColumnarFormat,
+        total_bytes: int | None,
+        skip: int = 0,
+    ) -> AsyncIterator[_P]:
+        # Parquet/Arrow: one record batch at a time, read and validated on its typed columns off
+        # the event loop. There is no header row, so rows are numbered from 1.
+        def _next() -> tuple[Any, float] | None:
+            try:
+                return next(source.batches, None)
+            except (ValueError, OSError) as e:
+                raise ImportFormatError(f"Unreadable {fmt} file: {e}") from e
+
+        first_row = 1
+        while (item := await asyncio.to_thread(_next)) is not None:
+            batch, fraction = item
+            if skip >= batch.num_rows:
+                skip -= batch.num_rows
+                first_row += batch.num_rows
+                continue
+            part = await asyncio.to_thread(parse, BatchColumns(batch))
+            part.first_row = first_row
+            part.start, skip = skip, 0
+            part.bytes_end = round(fraction * total_bytes) if total_bytes is not None else 0
+            first_row += len(part)
+            yield part
+
+    def _error(self, *, row: int, code: str, message: str, raw: dict[str, str] | None) -> None:
+        if not self._report_row_errors:
+            return
+        self.progress.errors += 1
+        self.error_counts[code] = self.error_counts.get(code, 0) + 1
+        error = AcademicImportRowError(row=row, code=code, message=message, raw=raw)
+        if self.report is not None:
+            self.report.write(error)
+        if len(self.errors) < self.max_errors:
+            self.errors.append(error)
+
+    async def _reject_existing(self, records: list[dict[str, Any]], sources: list[_Source]) -> list[dict[str, Any]]:
+        # Insert mode: a (student, term) already stored, or repeated within the chunk, is a row error.
+        existing = await self.academics.existing(k for r in records if (k := record_key(r)) is not None)
+        seen: set[tuple[uuid.UUID, str]] = set()
+        kept: list[dict[str, Any]] = []
+        for r, (row, raw, prefix) in zip(records, sources, strict=True):
+            key = record_key(r)
+            if key is not None:
+                if key in existing or key in seen:
+                    self._error(
+                        row=row,
+                        code="duplicate_record",
+                        message=f"{prefix}A record for this student and term already exists (import with upsert)",
+                        raw=raw(),
+                    )
+                    continue
+                seen.add(key)
+            kept.append(r)
+        return kept
+
+    async def _write(self, records: list[dict[str, Any]], *, units_done: int, sources: list[_Source]) -> None:
+        self._units_done = units_done
+        written: list[dict[str, Any]] = []
+        if self.upsert:
+            if self.dry_run:
+                plan = await self.academics.plan_upsert(records)
+            else:
+                plan = await self.academics.bulk_upsert(records, commit=False)
+                written = plan.write
+            self.progress.created += plan.created
+            self.progress.updated += plan.updated
+            self.progress.unchanged += plan.unchanged
+        else:
+            records = await self._reject_existing(records, sources)
+            self.progress.created += len(records)
+            if records and not self.dry_run:
+                await self.academics.bulk_insert(records, commit=False)
+                written = records
+
+        if self.checkpoint_callback is not None:
+            report_bytes = await asyncio.to_thread(self.report.flush) if self.report is not None else 0
+            await self.checkpoint_callback(
+                ImportCheckpoint(
+                    units_done=units_done,
+                    progress=replace(self.progress),
+                    errors=list(self.errors),
+                    error_counts=dict(self.error_counts),
+                    report_bytes=report_bytes,
+                )
+            )
+        await self.session.commit()
+        self.academics.index_rows(written)
+        if self.progress_callback is not None:
+            self.progress_callback(self.progress)
+
+    async def _import_summary(self, partials: AsyncIterator[SummaryPartial]) -> None:
+        async for part in partials:
+            self.progress.bytes_read = part.bytes_end
+            for lo in range(part.start, len(part), self.chunk_size):
+                hi = min(lo + self.chunk_size, len(part))
+                self.progress.rows_read += hi - lo
+                await self._import_summary_chunk(part, lo, hi)
+
+    async def _import_summary_chunk(self, part: SummaryPartial, lo: int, hi: int) -> None:
+        # Resolve the chunk's students in a few queries instead of one per row.
+        ref_ids = part.student_user_id[lo:hi]
+        ref_emails = part.student_email[lo:hi]
+        students_by_id = await self.users.get_many_by_id([sid for sid in ref_ids if sid])
+        students_by_email = await resolve_students_by_email(
+            self.users,
+            [email for sid, email in zip(ref_ids, ref_emails, strict=True) if not sid and email],
+            allow_create=self.allow_create_students,
+        )
+
+        values = {c: part.columns[c][lo:hi].tolist() for c in _SUMMARY_VALUE_COLUMNS}
+        records: list[dict[str, Any]] = []
+        sources: list[_Source] = []
+        for k, pos in enumerate(range(lo, hi)):
+            row_num = part.first_row + pos
+            try:
+                # An invalid student reference is reported ahead of the row's value errors.
+                student = _summary_student(ref_ids[k], ref_emails[k], students_by_id, students_by_email)
+                failure = part.failures.get(pos)
+                if failure is not None:
+                    raise ImportRowError(failure[1], code=failure[0])
+            except ImportRowError as e:
+                self._error(row=row_num, code=e.code, message=str(e), raw=part.raw(pos))
+                continue
+            records.append(
+                {
+                    "student_user_id": student.id,
+                    **{c: values[c][k] for c in _SUMMARY_VALUE_COLUMNS},
+                    "term": part.term[pos],
+                }
+            )
+            sources.append((row_num, partial(part.raw, pos), ""))
+        await self._write(records, units_done=self.progress.rows_read, sources=sources)
+
+    async def _import_ruet_course(self, partials: AsyncIterator[RuetPartial]) -> None:
+        # RUET course-marks import: aggregate multiple rows into one AcademicRecord per student+term,
+        # using credit-weighted averages. Each chunk is parsed and validated column-wise and
+        # reduced to per-group sums, which are folded into the running totals.
+        totals: pd.DataFrame | None = None
+        group_raw_first: dict[tuple[str, str], dict[str, str]] = {}
+
+        # On resume the whole file is aggregated again (group order is deterministic) and the
+        # groups written before the checkpoint are skipped. Row errors were all recorded during
+        # the first pass, before any group was written, so they are not reported twice.
+        groups_done = self._units_done
+        self._report_row_errors = groups_done == 0
+        self.progress.rows_read = 0
+
+        async for part in partials:
+            self.progress.rows_read += len(part)
+            self.progress.bytes_read = part.bytes_end
+            for pos, code, message, raw in part.errors:
+                self._error(row=part.first_row + pos, code=code, message=message, raw=raw)
+            for key, raw in part.first_raw.items():
+                group_raw_first.setdefault(key, raw)
+
+            sums = part.sums
+            totals = sums if totals is None else pd.concat([totals, sums]).groupby(level=[0, 1], sort=False).sum()
+            if self.progress_callback is not None:
+                self.progress_callback(self.progress)
+            if self.heartbeat_callback is not None:
+                await self.heartbeat_callback()
+
+        self._report_row_errors = True
+        if totals is None or totals.empty:
+            return
+
+        means = ruet_course_means(totals)
+        for i in range(groups_done, len(means), self.chunk_size):
+            chunk = means.iloc[i : i + self.chunk_size]
+            students_by_email = await resolve_students_by_email(
+                self.users,
+                chunk["student_email"].tolist(),
+                allow_create=self.allow_create_students,
+            )
+            records: list[dict[str, Any]] = []
+            sources: list[_Source] = []
+            for agg in chunk.to_dict("records"):
+                student_email, term = agg.pop("student_email"), agg.pop("term")
+                key = (student_email, term)
+                try:
+                    student = _valid_student(students_by_email.get(student_email))
+                except ImportRowError as e:
+                    self._error(
+                        row=1, code=e.code, message=f"{student_email} / {term}: {e}", raw=group_raw_first.get(key)
+                    )
+                    continue
+                records.append({"student_user_id": student.id, "term": term, **agg})
+                sources.append((1, partial(group_raw_first.get, key), f"{student_email} / {term}: "))
+            await self._write(records, units_done=i + len(chunk), sources=sources)
+
+
+_RUET_GROUP_KEYS = ("student_email", "term")
+# Component mark column -> (signal, maximum mark).
+_RUET_COMPONENTS = {
+    "attendance_10": ("attendance", 10.0),
+    "assignments_10": ("assignments", 10.0),
+    "ct_20": ("quizzes", 20.0),
+    "final_60": ("exams", 60.0),
+}
+_RUET_SUM_COLUMNS = ("w", "attendance", "assignments", "quizzes", "exams", "gpa")
+
+
+def _column(rows: Sequence[dict[str, str]], name: str) -> np.ndarray:
+    # Stripped strings as an object array; one pass over the rows per column.
+    return np.array([(r.get(name) or "").strip() for r in rows], dtype=object)
+
+
+class _RowColumns:
+    """Column access to parsed CSV rows, with the interface of `BatchColumns`."""
+
+    def __init__(self, rows: Sequence[dict[str, str]]):
+        self.rows = rows
+        self.n = len(rows)
+
+    def text(self, name: str) -> np.ndarray:
+        return _column(self.rows, name)
+
+    def number(self, name: str) -> tuple[np.ndarray, np.ndarray]:
+        raw = _column(self.rows, name)
+        return raw != "", to_float(raw)
+
+
+_Columns = _RowColumns | BatchColumns
+
+
+def _first_failures(checks: list[tuple[np.ndarray, str, str]], n: int) -> tuple[np.ndarray, np.ndarray]:
+    """For each row, the index of the first check (mask) it fails, -1 if none; plus the passing mask."""
+    failed = np.full(n, -1)
+    pending = np.ones(n, dtype=bool)
+    for k, (mask, _code, _msg) in enumerate(checks):
+        hit = pending & np.asarray(mask, dtype=bool)
+        failed[hit] = k
+        pending &= ~hit
+    return failed, pending
+
+
+def parse_summary_columns(cols: BatchColumns) -> SummaryPartial:
+    """Parse and validate a Parquet/Arrow batch of summary rows column-wise.
+
+    Checks mirror `_summary_values`, in the same order; typed numeric columns
+    are validated as they are (an integer column may be stored as floats with
+    integral values), and raw rows are only built for rejected ones.
+    """
+
+    checks: list[tuple[np.ndarray, str, str]] = []
+    values: dict[str, np.ndarray] = {}
+    with np.errstate(invalid="ignore"):
+        try:
+            for c in _SUMMARY_VALUE_COLUMNS:
+                present, val = cols.number(c)
+                checks.append((~present, "missing_field", f"Missing required column '{c}'"))
+                if c == "gpa":
+                    checks.append((present & ~np.isfinite(val), "invalid_number", "gpa must be a number"))
+                else:
+                    bad = ~np.isfinite(val) | (val != np.trunc(val))
+                    checks.append((present & bad, "invalid_number", f"{c} must be an integer"))
+                values[c] = val
+        except TypeError as e:
+            raise ImportFormatError(str(e)) from e
+        for c in _SUMMARY_VALUE_COLUMNS[:-1]:
+            checks.append(((values[c] < 0) | (values[c] > 100), "out_of_range", f"{c} must be 0-100"))
+        checks.append(((values["gpa"] < 0.0) | (values["gpa"] > 4.0), "out_of_range", "gpa must be 0.0-4.0"))
+
+    failed, ok = _first_failures(checks, cols.n)
+    columns = {
+        c: np.where(ok, val, 0.0) if c == "gpa" else np.where(ok, val, 0).astype(np.int64)
+        for c, val in values.items()
+    }
+    term = cols.text("term")
+    term = np.where(term != "", term, cols.text("semester"))
+    return SummaryPartial(
+        rows=BatchRows(cols),
+        student_user_id=[v or None for v in cols.text("student_user_id")],
+        student_email=[v or None for v in cols.text("student_email")],
+        columns=columns,
+        term=[v or None for v in term],
+        failures={int(i): checks[failed[i]][1:] for i in np.flatnonzero(~ok)},
+    )
+
+
+def ruet_course_frame(rows: Sequence[dict[str, str]]) -> tuple[pd.DataFrame, list[tuple[int, str, str]]]:
+    """Parse and validate RUET course-mark rows column-wise.
+
+    Returns the valid rows (indexed by their position in `rows`) with the group
+    keys, `w` (credits) and credit-weighted signal columns, plus `(position,
+    code, message)` for every rejected row. A row's error is the first check it
+    fails, in the order a row-by-row parse would hit them.
+    """
+    return _ruet_frame(_RowColumns(rows))
+
+
+def _ruet_frame(cols: _Columns) -> tuple[pd.DataFrame, list[tuple[int, str, str]]]:
+    checks: list[tuple[np.ndarray, str, str]] = []
+
+    def number(name: str, *, required: bool = True) -> tuple[np.ndarray, np.ndarray]:
+        try:
+            present, val = cols.number(name)
+        except TypeError as e:
+            raise ImportFormatError(str(e)) from e
+        if required:
+            checks.append((~present, "missing_field", f"Missing required column '{name}'"))
+        # inf parses as a float but would poison the credit-weighted sums.
+        checks.append((present & ~np.isfinite(val), "invalid_number", f"{name} must be a number"))
+        return present, val
+
+    email = np.array([e.lower() for e in cols.text("student_email")], dtype=object)
+    term = cols.text("term")
+    term = np.where(term != "", term, cols.text("semester"))
+    checks.append((email == "", "missing_field", "Missing required column 'student_email'"))
+    checks.append((term == "", "missing_field", "Missing required column 'term' (or 'semester')"))
+
+    with np.errstate(invalid="ignore"):
+        _, credits = number("credits")
+        checks.append((credits <= 0, "out_of_range", "credits must be > 0"))
+        _, gp = number("grade_point_4")
+        checks.append(((gp < 0.0) | (gp > 4.0), "out_of_range", "grade_point_4 must be 0.0-4.0"))
+
+        # Convert component marks to 0-100 signals expected by the ML model.
+        signals: dict[str, np.ndarray] = {}
+        for col, (signal, max_mark) in _RUET_COMPONENTS.items():
+            present, marks = number(col, required=col != "ct_20")
+            if col == "ct_20":
+                marks = np.where(present, marks, 0.0)
+            signals[signal] = marks / max_mark * 100.0
+        for signal, pct in signals.items():
+            checks.append(
+                ((pct < 0) | (pct > 100), "out_of_range", f"{signal}_pct derived from marks is out of range")
+            )
+
+    failed, pending = _first_failures(checks, cols.n)
+    errors = [(int(i), *checks[failed[i]][1:]) for i in np.flatnonzero(~pending)]
+    w = credits[pending]
+    frame = pd.DataFrame(
+        {
+            "student_email": email[pending],
+            "term": term[pending],
+            "w": w,
+            **{signal: pct[pending] * w for signal, pct in signals.items()},
+            "gpa": gp[pending] * w,
+        },
+        index=np.flatnonzero(pending),
+    )
+    return frame, errors
+
+
+def ruet_course_means(totals: pd.DataFrame) -> pd.DataFrame:
+    """Credit-weighted means per (student_email, term) from summed columns, clamped for safety."""
+    w = totals["w"].to_numpy(dtype=float)
+    out = totals.index.to_frame(index=False)
+    for signal in ("attendance", "assignments", "quizzes", "exams"):
+        pct = np.rint(totals[signal].to_numpy(dtype=float) / w)
+        out[f"{signal}_pct"] = np.clip(pct, 0, 100).astype(int)
+    out["gpa"] = np.clip(totals["gpa"].to_numpy(dtype=float) / w, 0.0, 4.0)
+    return out
+
+
+def ruet_course_partial(rows: list[dict[str, str]]) -> RuetPartial:
+    """`ruet_course_frame` reduced to per-group sums, with the raw rows errors need."""
+    return _ruet_partial(_RowColumns(rows), rows)
+
+
+def ruet_course_batch_partial(cols: BatchColumns) -> RuetPartial:
+    """`ruet_course_partial` for a Parquet/Arrow batch, validated on its typed columns."""
+    return _ruet_partial(cols, BatchRows(cols))
+
+
+def _ruet_partial(cols: _Columns, rows: Sequence[dict[str, str]]) -> RuetPartial:
+    frame, errors = _ruet_frame(cols)
+    first = frame.drop_duplicates(list(_RUET_GROUP_KEYS))
+    first_raw = {
+        key: _raw(rows[pos])
+        for pos, key in zip(first.index, zip(first["student_email"], first["term"], strict=True), strict=True)
+    }
+    return RuetPartial(
+        n_rows=cols.n,
+        sums=frame.groupby(list(_RUET_GROUP_KEYS), sort=False)[list(_RUET_SUM_COLUMNS)].sum(),
+        errors=[(pos, code, message, _raw(rows[pos])) for pos, code, message in errors],
+        first_raw=first_raw,
+    )
@@ -1,17 +1,264 @@
 from __future__ import annotations
 
+import sqlite3
 import uuid
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
 
+import numpy as np
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Dialect
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.ml.similarity import SIMILARITY_COLUMNS, SimilarityIndex
 from app.models.academic_record import AcademicRecord
 
+# Columns written by `bulk_insert`; timestamps come from the server defaults.
+BULK_COLUMNS: tuple[str, ...] = (
+    "id",
+    "student_user_id",
+    "attendance_pct",
+    "assignments_pct",
+    "quizzes_pct",
+    "exams_pct",
+    "gpa",
+    "term",
+)
+
+# Unique per record (`uq_academic_records_student_term`); the conflict target of `bulk_upsert`.
+RECORD_KEY: tuple[str, ...] = ("student_user_id", "term")
+# Columns an upsert overwrites; a row equal to the stored record on all of them is not written.
+VALUE_COLUMNS: tuple[str, ...] = ("attendance_pct", "assignments_pct", "quizzes_pct", "exams_pct", "gpa")
+
+# (student_user_id, term) pairs per lookup query (two bound parameters each).
+_KEY_LOOKUP_CHUNK = 500
+
+RecordKey = tuple[uuid.UUID, str]
+
+# Drivers that turn executemany into multi-row VALUES (SQLAlchemy's insertmanyvalues,
+# psycopg batch modes) are bound by the bound-parameter limit, so batches are sized to fit.
+_MAX_ROWS_PER_STATEMENT = 5000
+
+
+def _max_bind_params(dialect: Dialect) -> int:
+    if dialect.name == "postgresql":
+        return 32767
+    if dialect.name == "sqlite":
+        return 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+    return 999
+
+
+def bulk_chunk_size(dialect: Dialect, n_columns: int = len(BULK_COLUMNS)) -> int:
+    """Rows per executemany batch: as many as the parameter limit allows, capped."""
+    return max(1, min(_MAX_ROWS_PER_STATEMENT, _max_bind_params(dialect) // max(1, n_columns)))
+
+
+def supports_upsert(dialect: Dialect) -> bool:
+    """Whether `bulk_upsert` can run on this database (it needs `INSERT ... ON CONFLICT`)."""
+    return dialect.name in ("postgresql", "sqlite")
+
+
+def _rows_from(rows: Sequence[Mapping[str, Any]] | Mapping[str, Sequence[Any]]) -> list[dict[str, Any]]:
+    """Dict rows from either dict rows or column arrays.
+
+    Ids are generated when absent; given dict rows are filled in place, so the
+    caller sees them.
+    """
+    if isinstance(rows, Mapping):
+        lengths = {len(v) for v in rows.values()}
+        if len(lengths) > 1:
+            raise ValueError("Column arrays must have equal lengths")
+        n = lengths.pop() if lengths else 0
+        out = [{k: rows[k][i] for k in rows} for i in range(n)]
+    else:
+        out = [r if isinstance(r, dict) else dict(r) for r in rows]
+
+    for r in out:
+        if r.get("id") is None:
+            r["id"] = uuid.uuid4()
+        r.setdefault("term", None)
+        missing = [c for c in BULK_COLUMNS if c not in r]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+    return out
+
+
+def record_key(row: Mapping[str, Any]) -> RecordKey | None:
+    """The row's (student_user_id, term), or None without a term (such rows never conflict)."""
+    term = row.get("term")
+    return None if term is None else (row["student_user_id"], term)
+
+
+@dataclass
+class UpsertPlan:
+    """How `bulk_upsert` would apply a batch of rows, as if written one at a time in order."""
+
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    # Rows to write, at most one per key (the last one), with the stored id for existing keys.
+    write: list[dict[str, Any]] = field(default_factory=list)
+
 
 class AcademicsService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, *, similarity: SimilarityIndex | None = None):
         self.session = session
+        # Kept in sync with writes when given (see app.deps.ml.get_similarity_index).
+        self.similarity = similarity
+
+    def index_records(self, records: list[AcademicRecord]) -> None:
+        if self.similarity is None:
+            return
+        for r in records:
+            self.similarity.upsert(
+                r.id, r.student_user_id, np.asarray([getattr(r, c) for c in SIMILARITY_COLUMNS], dtype=float)
+            )
+
+    def index_rows(self, rows: list[dict[str, Any]]) -> None:
+        if self.similarity is None:
+            return
+        for r in rows:
+            self.similarity.upsert(
+                r["id"], r["student_user_id"], np.asarray([r[c] for c in SIMILARITY_COLUMNS], dtype=float)
+            )
+
+    async def bulk_insert(
+        self,
+        rows: Sequence[Mapping[str, Any]] | Mapping[str, Sequence[Any]],
+        *,
+        chunk_size: int | None = None,
+        commit: bool = True,
+    ) -> list[uuid.UUID]:
+        """Insert already-validated records without ORM objects; returns their ids.
+
+        `rows` is a sequence of dicts or a dict of equal-length column arrays
+        (keys from `BULK_COLUMNS`; `id` and `term` optional).
+
+        - Postgres via asyncpg: one binary `COPY` on the session's connection.
+        - Elsewhere: Core `insert()` executemany batches of `chunk_size` rows
+          (default: sized from the driver's bound-parameter limit, see
+          `bulk_chunk_size`).
+
+        Commits once at the end, then updates the similarity index. With
+        `commit=False` both are left to the caller (`index_rows` after its
+        commit), so the insert can share a transaction with other writes.
+        """
+
+        data = _rows_from(rows)
+        if not data:
+            return []
+
+        conn = await self.session.connection()
+        dialect = conn.dialect
+        if dialect.name == "postgresql" and dialect.driver == "asyncpg":
+            raw = await conn.get_raw_connection()
+            driver = raw.driver_connection
+            assert driver is not None  # a checked-out connection is never detached
+            await driver.copy_records_to_table(
+                AcademicRecord.__tablename__,
+                columns=list(BULK_COLUMNS),
+                records=[tuple(r[c] for c in BULK_COLUMNS) for r in data],
+            )
+        else:
+            size = chunk_size or bulk_chunk_size(dialect)
+            for i in range(0, len(data), size):
+                chunk = [{c: r[c] for c in BULK_COLUMNS} for r in data[i : i + size]]
+                await conn.execute(insert(AcademicRecord), chunk)
+
+        if commit:
+            await self.session.commit()
+            self.index_rows(data)
+        return [r["id"] for r in data]
+
+    async def existing(self, keys: Iterable[RecordKey]) -> dict[RecordKey, dict[str, Any]]:
+        """Stored `id` and `VALUE_COLUMNS` by (student_user_id, term), for the keys that exist."""
+        unique = list(dict.fromkeys(keys))
+        cols = [AcademicRecord.id, *(getattr(AcademicRecord, c) for c in RECORD_KEY + VALUE_COLUMNS)]
+        key_expr = tuple_(AcademicRecord.student_user_id, AcademicRecord.term)
+        out: dict[RecordKey, dict[str, Any]] = {}
+        for i in range(0, len(unique), _KEY_LOOKUP_CHUNK):
+            res = await self.session.execute(select(*cols).where(key_expr.in_(unique[i : i + _KEY_LOOKUP_CHUNK])))
+            for row in res.mappings():
+                out[(row["student_user_id"], row["term"])] = dict(row)
+        return out
+
+    async def plan_upsert(self, rows: Sequence[Mapping[str, Any]] | Mapping[str, Sequence[Any]]) -> UpsertPlan:
+        """Classify rows against the stored records (one lookup per `_KEY_LOOKUP_CHUNK` keys).
+
+        A key seen for the first time is `created`; a row equal to the current
+        value of its key (stored, or set by an earlier row of the batch) is
+        `unchanged` and not written; anything else is `updated`.
+        """
+        data = _rows_from(rows)
+        current = await self.existing(k for r in data if (k := record_key(r)) is not None)
+        plan = UpsertPlan()
+        write: dict[RecordKey | int, dict[str, Any]] = {}
+        for pos, r in enumerate(data):
+            key = record_key(r)
+            if key is None:
+                plan.created += 1
+                write[pos] = r
+                continue
+            stored = current.get(key)
+            if stored is None:
+                plan.created += 1
+            elif all(r[c] == stored[c] for c in VALUE_COLUMNS):
+                plan.unchanged += 1
+                continue
+            else:
+                plan.updated += 1
+                # Updating in place keeps the record's id (and the index entry keyed by it).
+                r["id"] = stored["id"]
+            current[key] = r
+            write.pop(key, None)
+            write[key] = r
+        plan.write = list(write.values())
+        return plan
+
+    async def bulk_upsert(
+        self,
+        rows: Sequence[Mapping[str, Any]] | Mapping[str, Sequence[Any]],
+        *,
+        chunk_size: int | None = None,
+        commit: bool = True,
+    ) -> UpsertPlan:
+        """Insert new (student_user_id, term) records and update changed ones; skip unchanged rows.
+
+        Writes `plan_upsert(rows).write` with `INSERT ... ON CONFLICT
+        (student_user_id, term) DO UPDATE` executemany batches (Postgres and
+        SQLite), so a record inserted concurrently since the lookup is updated
+        rather than failing the batch. Commit and similarity-index semantics as
+        in `bulk_insert`.
+        """
+
+        plan = await self.plan_upsert(rows)
+        if plan.write:
+            conn = await self.session.connection()
+            dialect = conn.dialect
+            stmt: postgresql.Insert | sqlite.Insert
+            if dialect.name == "postgresql":
+                stmt = postgresql.insert(AcademicRecord)
+            elif dialect.name == "sqlite":
+                stmt = sqlite.insert(AcademicRecord)
+            else:
+                # Importers check `supports_upsert` up front and reject the upload instead.
+                raise ValueError(f"Upsert is not supported on {dialect.name}")
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(RECORD_KEY),
+                set_={**{c: stmt.excluded[c] for c in VALUE_COLUMNS}, "updated_at": func.now()},
+            )
+            size = chunk_size or bulk_chunk_size(dialect)
+            for i in range(0, len(plan.write), size):
+                await conn.execute(stmt, [{c: r[c] for c in BULK_COLUMNS} for r in plan.write[i : i + size]])
+
+        if commit:
+            await self.session.commit()
+            self.index_rows(plan.write)
+        return plan
 
     async def get(self, record_id: uuid.UUID) -> AcademicRecord | None:
         res = await self.session.execute(select(AcademicRecord).where(AcademicRecord.id == record_id))
@@ -44,22 +291,37 @@ class AcademicsService:
         total = int(count_res.scalar_one())
         return items, total
 
+    async def _commit_unique(self) -> None:
+        try:
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="An academic record for this student and term already exists",
+            ) from e
+
     async def create(self, record: AcademicRecord) -> AcademicRecord:
         self.session.add(record)
-        await self.session.commit()
+        await self._commit_unique()
         await self.session.refresh(record)
+        self.index_records([record])
         return record
 
     async def update(self, record: AcademicRecord, patch: dict) -> AcademicRecord:
         for k, v in patch.items():
             setattr(record, k, v)
-        await self.session.commit()
+        await self._commit_unique()
         await self.session.refresh(record)
+        self.index_records([record])
         return record
 
     async def delete(self, record: AcademicRecord) -> None:
+        record_id = record.id
         await self.session.delete(record)
         await self.session.commit()
+        if self.similarity is not None:
+            self.similarity.remove(record_id)
 
     @staticmethod
     def forbid_if_none(record: AcademicRecord | None) -> AcademicRecord:
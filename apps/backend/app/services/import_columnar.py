@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, Any, Literal
+
+import numpy as np
+
+from app.services.import_parsing import to_float
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+ColumnarFormat = Literal["parquet", "arrow"]
+
+_PARQUET_MAGIC = b"PAR1"
+_ARROW_FILE_MAGIC = b"ARROW1"
+# Arrow IPC streams start with a continuation marker before the first message.
+_ARROW_STREAM_MAGIC = b"\xff\xff\xff\xff"
+
+# Rows per batch read from a Parquet file; the importer still writes `chunk_size` at a time.
+PARQUET_BATCH_ROWS = 64 * 1024
+
+
+def detect_columnar_format(fh: IO[bytes]) -> ColumnarFormat | None:
+    """"parquet" or "arrow" (IPC file or stream) from the upload's magic bytes, else None; rewinds `fh`."""
+    head = fh.read(len(_ARROW_FILE_MAGIC))
+    fh.seek(0)
+    if head.startswith(_PARQUET_MAGIC):
+        return "parquet"
+    if head.startswith(_ARROW_FILE_MAGIC) or head.startswith(_ARROW_STREAM_MAGIC):
+        return "arrow"
+    return None
+
+
+@dataclass
+class ColumnarBatches:
+    """Record batches of a Parquet or Arrow upload, read lazily in file order."""
+
+    fieldnames: list[str]
+    # (batch, fraction of the file consumed once it is read), for byte progress.
+    batches: Iterator[tuple[pa.RecordBatch, float]]
+
+
+def open_columnar(fh: IO[bytes], fmt: ColumnarFormat) -> ColumnarBatches:
+    """Open a Parquet or Arrow IPC (file or stream) upload without loading it whole.
+
+    Needs the optional `pyarrow` package (`pip install .[columnar]`); raises
+    `ImportError` without it and `ValueError` (`pyarrow.ArrowInvalid`) for a
+    corrupt file.
+    """
+
+    import pyarrow as pa
+
+    source = pa.PythonFile(fh, mode="r")
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        pf = pq.ParquetFile(source)
+        total = max(1, pf.metadata.num_rows)
+
+        def _parquet() -> Iterator[tuple[pa.RecordBatch, float]]:
+            done = 0
+            for batch in pf.iter_batches(batch_size=PARQUET_BATCH_ROWS):
+                done += batch.num_rows
+                yield batch, done / total
+
+        return ColumnarBatches(fieldnames=list(pf.schema_arrow.names), batches=_parquet())
+
+    if fh.read(len(_ARROW_FILE_MAGIC)) == _ARROW_FILE_MAGIC:
+        fh.seek(0)
+        reader = pa.ipc.open_file(source)
+        n = reader.num_record_batches
+        return ColumnarBatches(
+            fieldnames=list(reader.schema.names),
+            batches=((reader.get_batch(i), (i + 1) / n) for i in range(n)),
+        )
+
+    fh.seek(0, 2)
+    size = fh.tell() or 1
+    fh.seek(0)
+    stream = pa.ipc.open_stream(source)
+    # A stream is read front to back, so the position is the progress.
+    return ColumnarBatches(
+        fieldnames=list(stream.schema.names),
+        batches=((batch, min(1.0, fh.tell() / size)) for batch in stream),
+    )
+
+
+class BatchColumns:
+    """Typed column access to one record batch, for column-wise validation.
+
+    Numeric columns are used as typed (nulls are missing values); string
+    columns are stripped and parsed the way CSV cells are.
+    """
+
+    def __init__(self, batch: pa.RecordBatch):
+        self.batch = batch
+        self.n: int = batch.num_rows
+        self._names = {name.strip(): i for i, name in enumerate(batch.schema.names)}
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _array(self, name: str) -> pa.Array | None:
+        i = self._names.get(name)
+        return None if i is None else self.batch.column(i)
+
+    def text(self, name: str) -> np.ndarray:
+        """Stripped strings as an object array; "" for nulls and absent columns."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        arr = self._array(name)
+        if arr is None:
+            return np.full(self.n, "", dtype=object)
+        if not (pa.types.is_string(arr.type) or pa.types.is_large_string(arr.type)):
+            arr = pc.cast(arr, pa.string())
+        arr = pc.fill_null(pc.utf8_trim_whitespace(arr), "")
+        return np.array(arr.to_pylist(), dtype=object)
+
+    def number(self, name: str) -> tuple[np.ndarray, np.ndarray]:
+        """(present, values): a float array with NaN for missing or unparsable cells.
+
+        Raises `TypeError` for a column that is neither numeric nor text.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        arr = self._array(name)
+        if arr is None:
+            return np.zeros(self.n, dtype=bool), np.full(self.n, np.nan)
+        t = arr.type
+        if pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_decimal(t):
+            present = ~arr.is_null().to_numpy(zero_copy_only=False)
+            # Unsafe: integers beyond 2**53 round instead of raising; range checks reject them.
+            values = pc.cast(arr, pa.float64(), safe=False).to_numpy(zero_copy_only=False)
+            return present, np.where(present, values, np.nan)
+        if pa.types.is_string(t) or pa.types.is_large_string(t) or pa.types.is_null(t):
+            raw = self.text(name)
+            return raw != "", to_float(raw)
+        raise TypeError(f"Column '{name}' has unsupported type {t}")
+
+    def raw(self, pos: int) -> dict[str, str]:
+        """One row as strings, like a CSV row (for error reports)."""
+        out: dict[str, str] = {}
+        for name, col in zip(self.batch.schema.names, self.batch.columns, strict=True):
+            v: Any = col[pos].as_py()
+            out[name] = "" if v is None else str(v)
+        return out
+
+
+class BatchRows(Sequence[dict[str, str]]):
+    """A batch's rows as CSV-like dicts, built only for the rows that are looked up."""
+
+    def __init__(self, columns: BatchColumns):
+        self._columns = columns
+
+    def __len__(self) -> int:
+        return self._columns.n
+
+    def __getitem__(self, pos):  # type: ignore[override]
+        if isinstance(pos, slice):
+            return [self._columns.raw(i) for i in range(*pos.indices(len(self)))]
+        return self._columns.raw(pos)
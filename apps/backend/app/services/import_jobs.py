@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import shutil
+import uuid
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import IO, Any, cast
+
+from fastapi import UploadFile
+from sqlalchemy import ColumnElement, CursorResult, and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.db import get_sessionmaker
+from app.core.settings import backend_root, get_settings
+from app.ml.similarity import SimilarityIndex
+from app.models.import_job import ImportJob, ImportJobStatus
+from app.models.user import User, UserRole
+from app.schemas.academic import AcademicImportRowError
+from app.services.academic_import import AcademicCsvImporter, ImportCheckpoint, ImportProgress
+from app.services.import_parsing import ParsePool
+from app.services.import_reports import ImportErrorReport, prune_reports, reports_root
+
+logger = logging.getLogger(__name__)
+
+
+class ImportJobClaimLost(RuntimeError):
+    """Another worker took the job over after this one's lease ran out."""
+
+
+def staging_root() -> Path:
+    p = Path(get_settings().import_staging_path or "import_staging")
+    if not p.is_absolute():
+        p = backend_root() / p
+    return p.resolve()
+
+
+def _stage(src: IO[bytes], dest: Path) -> int:
+    with dest.open("wb") as out:
+        shutil.copyfileobj(src, out, length=1 << 20)
+        return out.tell()
+
+
+def _checkpoint_from(job: ImportJob) -> ImportCheckpoint | None:
+    if not job.units_done:
+        return None
+    return ImportCheckpoint(
+        units_done=job.units_done,
+        progress=ImportProgress(
+            rows_read=job.rows_processed,
+            created=job.created,
+            updated=job.updated,
+            unchanged=job.unchanged,
+            errors=job.error_count,
+            bytes_read=job.bytes_processed,
+        ),
+        errors=[AcademicImportRowError.model_validate(e) for e in job.errors or []],
+        error_counts=dict(job.error_counts or {}),
+        report_bytes=job.error_report_bytes,
+    )
+
+
+class ImportJobRunner:
+    """Background imports: staged on disk, processed in committed chunks, resumable.
+
+    - `submit()` copies the upload to `staging_dir`, records an `ImportJob` and
+      starts it; the request returns right away.
+    - The job's progress row is updated in the same transaction as each chunk
+      of records (see `AcademicCsvImporter`'s checkpoint), so it always
+      matches what has been committed.
+    - A job interrupted by a shutdown or crash stays `running`;
+      `resume_pending()` (app startup) restarts it from its last checkpoint.
+    - Each run first claims its job with a conditional UPDATE, so with several
+      workers (uvicorn/gunicorn processes) a job runs in one of them only. A
+      claim is renewed at every checkpoint (and while a RUET file is being
+      aggregated) and released on `close()`; a job whose worker crashed can be
+      claimed by another one once `lease_seconds` have passed without a
+      renewal. Each renewal checks the claim is still this worker's, so a
+      worker that lost its job stops without writing to it.
+    - Row errors go to an error report in `report_dir` with the job's id,
+      cut back to its checkpointed size on resume.
+    """
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        *,
+        staging_dir: Path,
+        report_dir: Path,
+        report_ttl_hours: float = 24,
+        similarity: SimilarityIndex | None = None,
+        chunk_size: int = 1000,
+        max_errors: int = 1000,
+        max_concurrent: int = 1,
+        parse_pool: ParsePool | None = None,
+        parallel_min_bytes: int = 32 * 1024 * 1024,
+        shard_bytes: int = 8 * 1024 * 1024,
+        lease_seconds: float = 600,
+    ):
+        self.staging_dir = staging_dir
+        self.report_dir = report_dir
+        self.report_ttl_hours = report_ttl_hours
+        self.similarity = similarity
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.sessionmaker = sessionmaker
+        self.lease_seconds = lease_seconds
+        # Claim token of this runner (one per worker process).
+        self.worker_id = uuid.uuid4().hex
+        self.parse_pool = parse_pool
+        self.parallel_min_bytes = parallel_min_bytes
+        self.shard_bytes = shard_bytes
+        self._slots = asyncio.Semaphore(max(1, int(max_concurrent)))
+        self._tasks: dict[uuid.UUID, asyncio.Task] = {}
+
+    async def submit(
+        self, session: AsyncSession, upload: UploadFile, *, user: User, dry_run: bool, upsert: bool = False
+    ) -> ImportJob:
+        job_id = uuid.uuid4()
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        path = self.staging_dir / f"{job_id}.upload"
+        size = await asyncio.to_thread(_stage, upload.file, path)
+
+        job = ImportJob(
+            id=job_id,
+            created_by_user_id=user.id,
+            status=ImportJobStatus.queued,
+            filename=(upload.filename or "")[:255],
+            staged_path=str(path),
+            total_bytes=size,
+            dry_run=dry_run,
+            upsert=upsert,
+            allow_create_students=user.role == UserRole.admin,
+            errors=[],
+        )
+        session.add(job)
+        await session.commit()
+        await session.refresh(job)
+        self._start(job_id)
+        return job
+
+    async def get(self, session: AsyncSession, job_id: uuid.UUID) -> ImportJob | None:
+        q = select(ImportJob).where(ImportJob.id == job_id).execution_options(populate_existing=True)
+        res = await session.execute(q)
+        return res.scalar_one_or_none()
+
+    def _claimable(self, now: datetime) -> ColumnElement[bool]:
+        """Queued, or running without a live claim by another worker."""
+        return or_(
+            ImportJob.status == ImportJobStatus.queued,
+            and_(
+                ImportJob.status == ImportJobStatus.running,
+                or_(
+                    ImportJob.claimed_by.is_(None),
+                    ImportJob.claimed_by == self.worker_id,
+                    ImportJob.heartbeat_at < now - timedelta(seconds=self.lease_seconds),
+                ),
+            ),
+        )
+
+    async def _claim(self, session: AsyncSession, job_id: uuid.UUID) -> bool:
+        """Take the job for this worker; False when it is finished or another worker holds it."""
+        now = datetime.now(UTC)
+        res = await session.execute(
+            update(ImportJob)
+            .where(ImportJob.id == job_id, self._claimable(now))
+            .values(status=ImportJobStatus.running, claimed_by=self.worker_id, heartbeat_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+        return cast(CursorResult[Any], res).rowcount == 1
+
+    async def _renew(self, session: AsyncSession, job_id: uuid.UUID) -> None:
+        """Extend this worker's claim in the session's transaction; raises `ImportJobClaimLost` if it is gone."""
+        res = await session.execute(
+            update(ImportJob)
+            .where(ImportJob.id == job_id, ImportJob.claimed_by == self.worker_id)
+            .values(heartbeat_at=datetime.now(UTC))
+            .execution_options(synchronize_session=False)
+        )
+        if cast(CursorResult[Any], res).rowcount != 1:
+            raise ImportJobClaimLost(f"Import job {job_id} is no longer claimed by this worker")
+
+    async def resume_pending(self) -> int:
+        """Restart queued and interrupted jobs no other worker holds; returns how many were started."""
+        async with self.sessionmaker() as session:
+            res = await session.execute(
+                select(ImportJob.id)
+                .where(self._claimable(datetime.now(UTC)))
+                .order_by(ImportJob.created_at)
+            )
+            job_ids = list(res.scalars())
+        for job_id in job_ids:
+            self._start(job_id)
+        return len(job_ids)
+
+    def _start(self, job_id: uuid.UUID) -> None:
+        task = self._tasks.get(job_id)
+        if task is not None and not task.done():
+            return
+        task = asyncio.get_running_loop().create_task(self._run(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _t: self._tasks.pop(job_id, None))
+
+    async def wait(self, job_id: uuid.UUID) -> None:
+        """Wait until the job's current run ends (finished, failed or cancelled)."""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.wait({task})
+
+    async def _run(self, job_id: uuid.UUID) -> None:
+        async with self._slots:
+            async with self.sessionmaker() as session:
+                if not await self._claim(session, job_id):
+                    return
+                job = await session.get(ImportJob, job_id, populate_existing=True)
+                if job is None:
+                    return
+
+                await asyncio.to_thread(prune_reports, self.report_dir, max_age_seconds=self.report_ttl_hours * 3600)
+                report = ImportErrorReport.create(self.report_dir, job.created_by_user_id, report_id=job.id)
+                report.open(truncate_to=job.error_report_bytes if job.units_done else 0)
+                # Kept when cancelled (the job resumes into it) or when it has errors.
+                keep_report = True
+
+                async def _checkpoint(cp: ImportCheckpoint) -> None:
+                    # Committed by the importer together with the chunk's records, or
+                    # rolled back with them when the claim was lost.
+                    await self._renew(session, job_id)
+                    job.units_done = cp.units_done
+                    job.rows_processed = cp.progress.rows_read
+                    job.bytes_processed = cp.progress.bytes_read
+                    job.created = cp.progress.created
+                    job.updated = cp.progress.updated
+                    job.unchanged = cp.progress.unchanged
+                    job.error_count = cp.progress.errors
+                    job.error_counts = cp.error_counts
+                    job.errors = [e.model_dump() for e in cp.errors]
+                    job.error_report_id = report.id if cp.progress.errors else None
+                    job.error_report_bytes = cp.report_bytes
+
+                async def _heartbeat() -> None:
+                    await self._renew(session, job_id)
+                    await session.commit()
+
+                importer = AcademicCsvImporter(
+                    session,
+                    allow_create_students=job.allow_create_students,
+                    dry_run=job.dry_run,
+                    upsert=job.upsert,
+                    similarity=self.similarity,
+                    chunk_size=self.chunk_size,
+                    max_errors=self.max_errors,
+                    parse_pool=self.parse_pool,
+                    parallel_min_bytes=self.parallel_min_bytes,
+                    shard_bytes=self.shard_bytes,
+                    checkpoint=_checkpoint,
+                    heartbeat=_heartbeat,
+                    report=report,
+                )
+                try:
+                    try:
+                        with open(job.staged_path, "rb") as fh:
+                            result = await importer.run(fh, total_bytes=job.total_bytes, resume=_checkpoint_from(job))
+                        await self._renew(session, job_id)
+                    except ImportJobClaimLost:
+                        # The new owner resumes from the last checkpoint; leave the job and its files alone.
+                        logger.warning("Import job %s was taken over by another worker", job_id)
+                        await session.rollback()
+                        return
+                    except Exception as e:
+                        logger.exception("Import job %s failed", job_id)
+                        await session.rollback()
+                        await session.refresh(job)
+                        if job.claimed_by != self.worker_id:
+                            return
+                        job.status = ImportJobStatus.failed
+                        job.failure = str(e) or type(e).__name__
+                        job.finished_at = datetime.now(UTC)
+                        await session.commit()
+                        # Keep the errors as of the last committed chunk, matching the job's counts.
+                        report.truncate(job.error_report_bytes)
+                        keep_report = job.error_count > 0
+                        Path(job.staged_path).unlink(missing_ok=True)
+                        return
+
+                    job.status = ImportJobStatus.succeeded
+                    job.rows_processed = result.total_rows
+                    job.bytes_processed = job.total_bytes
+                    job.created = result.created
+                    job.updated = result.updated
+                    job.unchanged = result.unchanged
+                    job.error_count = result.error_count
+                    job.error_counts = result.error_counts
+                    job.errors = [e.model_dump() for e in result.errors]
+                    job.error_report_id = result.error_report_id
+                    job.error_report_bytes = report.flush()
+                    job.finished_at = datetime.now(UTC)
+                    await session.commit()
+                    keep_report = result.error_count > 0
+                    Path(job.staged_path).unlink(missing_ok=True)
+                finally:
+                    report.close(keep=keep_report)
+
+    async def close(self) -> None:
+        """Stop running jobs; they stay `running`, unclaimed, and resume on the next start."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            async with self.sessionmaker() as session:
+                await session.execute(
+                    update(ImportJob)
+                    .where(ImportJob.claimed_by == self.worker_id, ImportJob.status == ImportJobStatus.running)
+                    .values(claimed_by=None)
+                )
+                await session.commit()
+        except Exception:
+            logger.exception("Could not release import job claims")
+
+
+def create_import_job_runner(
+    *,
+    sessionmaker: async_sessionmaker[AsyncSession] | None = None,
+    similarity: SimilarityIndex | None = None,
+    parse_pool: ParsePool | None = None,
+) -> ImportJobRunner:
+    settings = get_settings()
+    return ImportJobRunner(
+        sessionmaker or get_sessionmaker(),
+        staging_dir=staging_root(),
+        report_dir=reports_root(),
+        report_ttl_hours=settings.import_report_ttl_hours,
+        similarity=similarity,
+        chunk_size=settings.import_chunk_size,
+        max_errors=settings.import_max_reported_errors,
+        max_concurrent=settings.import_max_concurrent_jobs,
+        parse_pool=parse_pool,
+        parallel_min_bytes=settings.import_parallel_min_bytes,
+        shard_bytes=settings.import_shard_bytes,
+        lease_seconds=settings.import_job_lease_seconds,
+    )
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import csv
+import io
+import multiprocessing
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO
+
+import numpy as np
+
+from app.core.settings import get_settings
+
+# Read size while looking for the end of the header record.
+_HEADER_BLOCK = 1 << 16
+
+
+def _last_record_end(buf: bytes) -> int | None:
+    """Offset just past the last newline of `buf` that is outside a quoted field.
+
+    `buf` starts at a record boundary. With RFC 4180 quoting (quotes inside a
+    field are doubled) a newline ends a record iff an even number of quotes
+    precede it. Both encodings the importer reads (UTF-8, latin-1) are
+    ASCII-compatible, so this works on the raw bytes.
+    """
+    total = buf.count(b'"')
+    quotes_after = 0
+    end = len(buf)
+    i = buf.rfind(b"\n")
+    while i >= 0:
+        quotes_after += buf.count(b'"', i, end)
+        end = i
+        if (total - quotes_after) % 2 == 0:
+            return i + 1
+        i = buf.rfind(b"\n", 0, i)
+    return None
+
+
+def _first_record_end(buf: bytes) -> int | None:
+    quotes = 0
+    start = 0
+    while (i := buf.find(b"\n", start)) >= 0:
+        quotes += buf.count(b'"', start, i)
+        if quotes % 2 == 0:
+            return i + 1
+        start = i + 1
+    return None
+
+
+def read_header(fh: IO[bytes], encoding: str) -> tuple[list[str], int]:
+    """Field names from the first record and the byte offset where the data starts."""
+    fh.seek(0)
+    buf = b""
+    while True:
+        block = fh.read(_HEADER_BLOCK)
+        buf += block
+        cut = _first_record_end(buf)
+        if cut is not None or not block:
+            break
+    end = cut if cut is not None else len(buf)
+    text = buf[:end].decode(encoding)
+    fieldnames = next(csv.reader(io.StringIO(text, newline="")), [])
+    return fieldnames, end
+
+
+def iter_shards(fh: IO[bytes], *, start: int, shard_bytes: int) -> Iterator[tuple[bytes, int]]:
+    """Split `fh` from `start` into pieces of about `shard_bytes` that end on record boundaries.
+
+    Yields `(data, end_offset)`; a record longer than `shard_bytes` makes its
+    shard longer. Reads sequentially, one shard ahead at most.
+    """
+    fh.seek(start)
+    offset = start
+    carry = b""
+    while True:
+        block = fh.read(shard_bytes)
+        if not block:
+            if carry:
+                yield carry, offset + len(carry)
+            return
+        buf = carry + block
+        cut = _last_record_end(buf)
+        if cut is None:
+            carry = buf
+            continue
+        carry = buf[cut:]
+        offset += cut
+        yield buf[:cut], offset
+
+
+def shard_text(data: bytes, encoding: str) -> str:
+    # A BOM can only precede the header, which is never part of a shard.
+    return data.decode("utf-8" if encoding == "utf-8-sig" else encoding)
+
+
+def _cell_float(cell: str) -> float:
+    try:
+        return float(cell)
+    except ValueError:
+        return float("nan")
+
+
+def to_float(raw: np.ndarray) -> np.ndarray:
+    """Float array from stripped cell strings, with NaN for empty or unparsable cells.
+
+    Cells follow Python's `float()` grammar either way (so "1_000" parses).
+    """
+    filled = np.where(raw == "", "nan", raw)
+    try:
+        # Fast path: everything parses (float() per element, in C).
+        return filled.astype(float)
+    except ValueError:
+        return np.array([_cell_float(c) for c in filled], dtype=float)
+
+
+class ParsePool:
+    """Process pool that parses import shards, started on first use.
+
+    Workers are spawned rather than forked, so they don't inherit the app's
+    event loop, threads or open database connections. With `workers <= 1`
+    the pool is disabled and imports parse in-process.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = max(1, int(workers))
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 1
+
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+def create_parse_pool() -> ParsePool:
+    settings = get_settings()
+    return ParsePool(settings.import_parse_workers or os.cpu_count() or 1)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import IO
+
+from app.core.settings import backend_root, get_settings
+from app.schemas.academic import AcademicImportRowError
+
+REPORT_SUFFIX = ".ndjson"
+
+
+def reports_root() -> Path:
+    """IMPORT_REPORT_PATH (relative paths are under apps/backend), default: the system temp dir."""
+    configured = get_settings().import_report_path
+    if not configured:
+        return Path(tempfile.gettempdir()) / "edupredict-import-reports"
+    p = Path(configured)
+    if not p.is_absolute():
+        p = backend_root() / p
+    return p.resolve()
+
+
+def report_path(root: Path, owner_id: uuid.UUID, report_id: uuid.UUID) -> Path:
+    return root / str(owner_id) / f"{report_id}{REPORT_SUFFIX}"
+
+
+def find_report(root: Path, report_id: uuid.UUID, *, owner_id: uuid.UUID | None = None) -> Path | None:
+    """The report's file if it exists (and belongs to `owner_id`, when given)."""
+    if owner_id is not None:
+        p = report_path(root, owner_id, report_id)
+        return p if p.is_file() else None
+    return next((p for p in root.glob(f"*/{report_id}{REPORT_SUFFIX}") if p.is_file()), None)
+
+
+def prune_reports(root: Path, *, max_age_seconds: float) -> int:
+    """Delete reports last written more than `max_age_seconds` ago; returns how many."""
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for p in root.glob(f"*/*{REPORT_SUFFIX}"):
+        try:
+            if p.stat().st_mtime < cutoff:
+                p.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+class ImportErrorReport:
+    """Every row error of one import, appended to an NDJSON file as it is found.
+
+    Only a capped sample of errors is kept in memory (and returned); the
+    report has all of them, raw rows included, for download. `flush()`
+    returns the bytes written so far, which an import checkpoint records:
+    `open(truncate_to=...)` on resume drops lines written after it.
+    """
+
+    def __init__(self, path: Path, *, report_id: uuid.UUID):
+        self.id = report_id
+        self.path = path
+        self._fh: IO[bytes] | None = None
+
+    @classmethod
+    def create(cls, root: Path, owner_id: uuid.UUID, *, report_id: uuid.UUID | None = None) -> ImportErrorReport:
+        report_id = report_id or uuid.uuid4()
+        return cls(report_path(root, owner_id, report_id), report_id=report_id)
+
+    def open(self, *, truncate_to: int = 0) -> ImportErrorReport:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fh = self.path.open("r+b" if self.path.exists() else "w+b")
+        fh.truncate(max(0, truncate_to))
+        fh.seek(0, 2)
+        self._fh = fh
+        return self
+
+    def write(self, error: AcademicImportRowError) -> None:
+        if self._fh is None:
+            self.open()
+        assert self._fh is not None
+        line = json.dumps(error.model_dump(mode="json"), ensure_ascii=False)
+        self._fh.write(line.encode("utf-8") + b"\n")
+
+    def truncate(self, size: int) -> None:
+        if self._fh is not None:
+            self._fh.flush()
+            self._fh.truncate(max(0, size))
+            self._fh.seek(0, 2)
+
+    def flush(self) -> int:
+        if self._fh is None:
+            return 0
+        self._fh.flush()
+        return self._fh.tell()
+
+    def close(self, *, keep: bool = True) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if not keep:
+            self.path.unlink(missing_ok=True)
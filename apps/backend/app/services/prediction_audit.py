@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.db import get_sessionmaker
+from app.core.settings import get_settings
+from app.models.prediction_audit import PredictionAuditEvent
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AuditStats:
+    enqueued: int = 0
+    flushed: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    # Requests that found the queue full and waited for a flush.
+    backpressure_waits: int = 0
+    # Events lost because the queue was still full after a failed flush.
+    dropped: int = 0
+
+
+class PredictionAuditLog:
+    """Write-behind log of served predictions.
+
+    `record()` only appends to a bounded in-memory queue. Events are written in
+    multi-row INSERTs of up to `flush_batch` rows, when that many are pending or
+    `flush_interval_ms` after the first unflushed event, whichever comes first,
+    and on `close()` (app shutdown). When the queue is full the caller awaits a
+    flush before its event is accepted, so a slow database slows requests down
+    instead of growing memory without bound.
+
+    Flushes open their own session, so they never share one with a request.
+    """
+
+    def __init__(
+        self,
+        sessionmaker: async_sessionmaker[AsyncSession],
+        *,
+        queue_size: int = 10000,
+        flush_batch: int = 500,
+        flush_interval_ms: int = 1000,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.flush_batch = max(1, int(flush_batch))
+        self.flush_interval_ms = max(1, int(flush_interval_ms))
+        self.sessionmaker = sessionmaker
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=max(1, int(queue_size)))
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task | None = None
+        self.stats = AuditStats()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    async def record(self, **event: Any) -> None:
+        if not self.enabled:
+            return
+        event.setdefault("id", uuid.uuid4())
+        event.setdefault("created_at", datetime.now(UTC))
+
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.stats.backpressure_waits += 1
+            await self.flush()
+            try:
+                self._queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.stats.dropped += 1
+                logger.error("Prediction audit queue full after flush; event dropped")
+                return
+
+        self.stats.enqueued += 1
+        if self._queue.qsize() >= self.flush_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval_ms / 1000.0, self._start_flush)
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.flush())
+
+    async def flush(self) -> int:
+        """Write everything queued so far; returns the number of events written."""
+        written = 0
+        async with self._lock:
+            while not self._queue.empty():
+                batch = [self._queue.get_nowait() for _ in range(min(self.flush_batch, self._queue.qsize()))]
+                try:
+                    async with self.sessionmaker() as session:
+                        await session.execute(insert(PredictionAuditEvent), batch)
+                        await session.commit()
+                except Exception:
+                    logger.exception("Prediction audit flush failed (%d events)", len(batch))
+                    self.stats.failed_flushes += 1
+                    self._requeue(batch)
+                    break
+                written += len(batch)
+                self.stats.flushes += 1
+        self.stats.flushed += written
+        return written
+
+    def _requeue(self, batch: list[dict[str, Any]]) -> None:
+        for event in batch:
+            try:
+                self._queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.stats.dropped += 1
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval_ms / 1000.0, self._start_flush)
+
+    async def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._task is not None and not self._task.done():
+            await self._task
+        await self.flush()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"pending": self.pending, **asdict(self.stats)}
+
+
+def create_prediction_audit(sessionmaker: async_sessionmaker[AsyncSession] | None = None) -> PredictionAuditLog:
+    settings = get_settings()
+    return PredictionAuditLog(
+        sessionmaker or get_sessionmaker(),
+        queue_size=settings.audit_queue_size,
+        flush_batch=settings.audit_flush_batch,
+        flush_interval_ms=settings.audit_flush_interval_ms,
+        enabled=settings.audit_enabled,
+    )
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import uuid
+from collections.abc import Iterable
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import hash_password
+from app.core.security import hash_password, make_unusable_password
 from app.models.user import User, UserRole
 
+# Keeps bulk lookups under SQLite's bound-parameter limit and Postgres' planner sweet spot.
+IN_CHUNK_SIZE = 500
+
 
 class UsersService:
     def __init__(self, session: AsyncSession):
@@ -26,6 +30,37 @@ class UsersService:
         res = await self.session.execute(select(User).where(User.id == user_id))
         return res.scalar_one_or_none()
 
+    async def get_many_by_email(self, emails: Iterable[str], *, chunk_size: int = IN_CHUNK_SIZE) -> dict[str, User]:
+        """Users keyed by email, fetched with one `IN (...)` query per chunk; missing emails are absent."""
+        wanted = list(dict.fromkeys(emails))
+        found: dict[str, User] = {}
+        for i in range(0, len(wanted), chunk_size):
+            res = await self.session.execute(select(User).where(User.email.in_(wanted[i : i + chunk_size])))
+            found.update((u.email, u) for u in res.scalars())
+        return found
+
+    async def get_many_by_id(
+        self,
+        user_ids: Iterable[uuid.UUID | str],
+        *,
+        chunk_size: int = IN_CHUNK_SIZE,
+    ) -> dict[uuid.UUID, User]:
+        """Users keyed by id, chunked like `get_many_by_email`; malformed ids are ignored."""
+        wanted: dict[uuid.UUID, None] = {}
+        for user_id in user_ids:
+            if isinstance(user_id, str):
+                try:
+                    user_id = uuid.UUID(user_id)
+                except ValueError:
+                    continue
+            wanted[user_id] = None
+        ids = list(wanted)
+        found: dict[uuid.UUID, User] = {}
+        for i in range(0, len(ids), chunk_size):
+            res = await self.session.execute(select(User).where(User.id.in_(ids[i : i + chunk_size])))
+            found.update((u.id, u) for u in res.scalars())
+        return found
+
     async def create_user(
         self,
         *,
@@ -47,6 +82,40 @@ class UsersService:
         await self.session.refresh(user)
         return user
 
+    async def create_students_without_password(
+        self,
+        emails: Iterable[str],
+        *,
+        chunk_size: int = IN_CHUNK_SIZE,
+    ) -> dict[str, User]:
+        """Bulk-create student accounts that still need a password, keyed by email.
+
+        One multi-row INSERT ... RETURNING per chunk and a single commit; no
+        password hashing (accounts get an unusable marker and
+        `password_setup_required`).
+        """
+
+        wanted = list(dict.fromkeys(e.lower().strip() for e in emails))
+        created: dict[str, User] = {}
+        for i in range(0, len(wanted), chunk_size):
+            rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "email": email,
+                    "full_name": "",
+                    "role": UserRole.student,
+                    "password_hash": make_unusable_password(),
+                    "password_setup_required": True,
+                    "is_active": True,
+                }
+                for email in wanted[i : i + chunk_size]
+            ]
+            res = await self.session.scalars(insert(User).returning(User), rows)
+            created.update((u.email, u) for u in res)
+        if created:
+            await self.session.commit()
+        return created
+
     async def list_users(self, *, limit: int = 50, offset: int = 0) -> tuple[list[User], int]:
         q = select(User).order_by(User.created_at.desc()).limit(limit).offset(offset)
         cq = select(func.count(User.id))
@@ -88,6 +157,10 @@ class UsersService:
         return list(items_res.scalars().all()), int(count_res.scalar_one())
 
     async def update_user(self, user: User, patch: dict) -> User:
+        patch = dict(patch)
+        if "password" in patch:
+            user.password_hash = hash_password(patch.pop("password"))
+            user.password_setup_required = False
         for k, v in patch.items():
             setattr(user, k, v)
         await self.session.commit()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+
+import numpy as np
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+
+def synthetic_rows(n: int, student_ids: list[uuid.UUID], seed: int, term_prefix: str = "T") -> list[dict]:
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "student_user_id": student_ids[i % len(student_ids)],
+            "attendance_pct": int(rng.integers(50, 100)),
+            "assignments_pct": int(rng.integers(40, 100)),
+            "quizzes_pct": int(rng.integers(35, 100)),
+            "exams_pct": int(rng.integers(30, 100)),
+            "gpa": float(rng.random() * 4.0),
+            # Unique per (student, term), as the schema requires.
+            "term": f"{term_prefix}{i // len(student_ids)}",
+        }
+        for i in range(n)
+    ]
+
+
+async def run(database_url: str, rows: int, students: int, chunk_size: int | None) -> None:
+    from app.models.academic_record import AcademicRecord
+    from app.models.base import Base
+    from app.models.user import User
+    from app.services.academics import AcademicsService, bulk_chunk_size
+    from app.services.users import UsersService
+
+    engine = create_async_engine(database_url, future=True)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    SessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+    tag = uuid.uuid4().hex[:8]
+    async with SessionLocal() as s:
+        created = await UsersService(s).create_students_without_password(
+            [f"bench-{tag}-{i}@example.com" for i in range(students)]
+        )
+    student_ids = [u.id for u in created.values()]
+    orm_data = synthetic_rows(rows, student_ids, seed=0, term_prefix="orm-")
+    data = synthetic_rows(rows, student_ids, seed=0, term_prefix="bulk-")
+
+    try:
+        async with SessionLocal() as s:
+            t0 = time.perf_counter()
+            s.add_all([AcademicRecord(**r) for r in orm_data])
+            await s.commit()
+            t_orm = time.perf_counter() - t0
+
+        async with SessionLocal() as s:
+            dialect = (await s.connection()).dialect
+            t0 = time.perf_counter()
+            await AcademicsService(s).bulk_insert(data, chunk_size=chunk_size)
+            t_bulk = time.perf_counter() - t0
+    finally:
+        async with SessionLocal() as s:
+            await s.execute(delete(AcademicRecord).where(AcademicRecord.student_user_id.in_(student_ids)))
+            await s.execute(delete(User).where(User.id.in_(student_ids)))
+            await s.commit()
+        await engine.dispose()
+
+    path = "COPY" if dialect.name == "postgresql" and dialect.driver == "asyncpg" else "executemany"
+    size = chunk_size or bulk_chunk_size(dialect)
+    print(f"backend={dialect.name}+{dialect.driver} rows={rows} bulk path={path} (chunk={size})")
+    print(f"{'path':>6} {'seconds':>9} {'rows/s':>10}")
+    print(f"{'orm':>6} {t_orm:>9.3f} {rows / t_orm:>10.0f}")
+    print(f"{'bulk':>6} {t_bulk:>9.3f} {rows / t_bulk:>10.0f}")
+    print(f"speedup: {t_orm / t_bulk:.1f}x")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare ORM add_all with AcademicsService.bulk_insert for academic records."
+    )
+    parser.add_argument(
+        "--database-url",
+        default=None,
+        help="Async SQLAlchemy URL, e.g. postgresql+asyncpg://user:pw@localhost/edupredict "
+        "(default: a throwaway SQLite file). Rows created by the benchmark are deleted afterwards.",
+    )
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--chunk-size", type=int, default=None, help="Rows per executemany batch (default: automatic).")
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='edupredict-bench-')}/bench.db"
+    asyncio.run(run(url, args.rows, args.students, args.chunk_size))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def synthetic_df(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "attendance_pct": rng.integers(50, 100, size=n),
+            "assignments_pct": rng.integers(40, 100, size=n),
+            "quizzes_pct": rng.integers(35, 100, size=n),
+            "exams_pct": rng.integers(30, 100, size=n),
+            "gpa": rng.random(size=n) * 4.0,
+        }
+    )
+    avg = (df["assignments_pct"] + df["quizzes_pct"] + df["exams_pct"]) / 3.0
+    df["at_risk"] = ((df["gpa"] < 2.2) | (df["attendance_pct"] < 78) | (avg < 66)).astype(int)
+    return df
+
+
+def time_call(fn, x, repeat: int) -> float:
+    fn(x)  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(x)
+    return (time.perf_counter() - t0) / repeat
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare EnsembleArtifact.predict_proba with the compiled NumPy engine (accuracy + latency)."
+    )
+    parser.add_argument("--rows", type=int, default=2000, help="Synthetic training rows.")
+    parser.add_argument("--batch-sizes", default="1,16,256,2000")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    # Keep the benchmark's artifacts out of the real registry.
+    os.environ["MODEL_REGISTRY_PATH"] = tempfile.mkdtemp(prefix="edupredict-bench-")
+
+    from app.ml.compiled import CompiledEnsemble
+    from app.ml.preprocess import preprocess_records
+    from app.ml.registry import load_latest_artifact
+    from app.ml.train import TrainConfig, train_from_dataframe
+
+    df = synthetic_df(args.rows, seed=0)
+    train_from_dataframe(df, train_cfg=TrainConfig(distill=True), notes="benchmark")
+    artifact = load_latest_artifact()
+    compiled = CompiledEnsemble.from_artifact(artifact)
+
+    x_all = preprocess_records(df)
+    err = float(np.abs(artifact.predict_proba(x_all) - compiled.predict_proba(x_all)).max())
+    err_fast = float(np.abs(artifact.predict_proba_fast(x_all) - compiled.predict_proba_fast(x_all)).max())
+    print(f"trees={compiled.forest.n_trees} depth={compiled.forest.depth}")
+    print(f"max |artifact - compiled|: ensemble={err:.3e} student={err_fast:.3e}")
+
+    print(f"{'batch':>6} {'artifact_us':>12} {'compiled_us':>12} {'speedup':>8} {'student_us':>11}")
+    for b in (int(s) for s in args.batch_sizes.split(",")):
+        x = x_all.iloc[:b]
+        repeat = max(3, args.repeat // max(1, b // 16))
+        t_art = time_call(artifact.predict_proba, x, repeat)
+        t_cmp = time_call(compiled.predict_proba, x, repeat)
+        t_fast = time_call(compiled.predict_proba_fast, x, repeat)
+        print(f"{b:>6} {t_art * 1e6:>12.1f} {t_cmp * 1e6:>12.1f} {t_art / t_cmp:>8.2f} {t_fast * 1e6:>11.1f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
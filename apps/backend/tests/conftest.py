@@ -71,6 +71,10 @@ async def client(session: AsyncSession) -> AsyncIterator[AsyncClient]:
         yield session
 
     app.dependency_overrides[get_db_session] = _override_get_db_session
+    # Background writers open their own sessions; point them at the test database too.
+    SessionLocal = async_sessionmaker(session.bind, expire_on_commit=False, autoflush=False)
+    app.state.import_jobs.sessionmaker = SessionLocal
+    app.state.prediction_audit.sessionmaker = SessionLocal
 
     transport = ASGITransport(app=app)
     try:
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event, select
+
+from app.core.security import hash_password
+from app.ml.similarity import SimilarityIndex
+from app.models.academic_record import AcademicRecord
+from app.models.user import User, UserRole
+from app.services.academics import BULK_COLUMNS, AcademicsService, bulk_chunk_size
+
+
+@pytest.mark.anyio
+async def test_bulk_insert_accepts_rows_or_columns_and_batches(session):
+    student = User(
+        email="bulk-insert@example.com",
+        full_name="Bulk Insert",
+        role=UserRole.student,
+        password_hash=hash_password("x"),
+    )
+    session.add(student)
+    await session.commit()
+
+    index = SimilarityIndex(min_rebuild=10_000)
+    index.build([], [], [])
+    svc = AcademicsService(session, similarity=index)
+
+    n = 25
+    columns = {
+        "student_user_id": [student.id] * n,
+        "attendance_pct": [50 + i for i in range(n)],
+        "assignments_pct": [60] * n,
+        "quizzes_pct": [70] * n,
+        "exams_pct": [80] * n,
+        "gpa": [i / 10 for i in range(n)],
+        "term": [f"T{i}" for i in range(n)],
+    }
+
+    inserts: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT"):
+            inserts.append(statement)
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _count)
+    try:
+        ids = await svc.bulk_insert(columns, chunk_size=10)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _count)
+    assert len(ids) == n
+    assert len(inserts) == 3
+
+    more = await svc.bulk_insert(
+        [
+            {
+                "student_user_id": student.id,
+                "attendance_pct": 99,
+                "assignments_pct": 99,
+                "quizzes_pct": 99,
+                "exams_pct": 99,
+                "gpa": 4.0,
+            }
+        ]
+    )
+
+    res = await session.execute(select(AcademicRecord).order_by(AcademicRecord.attendance_pct))
+    records = list(res.scalars().all())
+    assert [r.id for r in records] == [*ids, *more]
+    assert records[3].term == "T3" and records[3].gpa == pytest.approx(0.3)
+    assert records[-1].term is None and records[-1].created_at is not None
+    assert index.size == n + 1
+
+    with pytest.raises(ValueError):
+        await svc.bulk_insert({"student_user_id": [student.id], "gpa": [1.0, 2.0]})
+    with pytest.raises(ValueError):
+        await svc.bulk_insert([{"student_user_id": student.id, "gpa": 1.0}])
+
+
+def test_bulk_chunk_size_respects_parameter_limits():
+    from sqlalchemy.dialects import postgresql, sqlite
+
+    assert bulk_chunk_size(postgresql.dialect()) == 32767 // 8
+    assert 1 <= bulk_chunk_size(sqlite.dialect()) <= 5000
+    assert bulk_chunk_size(sqlite.dialect(), n_columns=1) == 5000
+
+
+@pytest.mark.anyio
+async def test_bulk_upsert_creates_updates_and_skips_unchanged(session):
+    student = User(
+        email="bulk-upsert@example.com",
+        full_name="Bulk Upsert",
+        role=UserRole.student,
+        password_hash=hash_password("x"),
+    )
+    session.add(student)
+    await session.commit()
+
+    index = SimilarityIndex(min_rebuild=10_000)
+    index.build([], [], [])
+    svc = AcademicsService(session, similarity=index)
+
+    def row(term: str, gpa: float) -> dict:
+        return {
+            "student_user_id": student.id,
+            "attendance_pct": 80,
+            "assignments_pct": 80,
+            "quizzes_pct": 80,
+            "exams_pct": 80,
+            "gpa": gpa,
+            "term": term,
+        }
+
+    plan = await svc.bulk_upsert([row("T1", 3.0), row("T2", 2.0)])
+    assert (plan.created, plan.updated, plan.unchanged) == (2, 0, 0)
+    res = await session.execute(select(AcademicRecord.id).where(AcademicRecord.term == "T1"))
+    t1_id = res.scalar_one()
+
+    writes: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("INSERT", "UPDATE")):
+            writes.append(statement)
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _count)
+    try:
+        # Same data again: nothing is written.
+        plan = await svc.bulk_upsert([row("T1", 3.0), row("T2", 2.0)])
+        assert (plan.created, plan.updated, plan.unchanged) == (0, 0, 2)
+        assert writes == []
+
+        # T1 changes, T2 stays, T3 is new and then changed within the batch.
+        plan = await svc.bulk_upsert([row("T1", 3.5), row("T2", 2.0), row("T3", 1.0), row("T3", 1.5)])
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _count)
+    assert (plan.created, plan.updated, plan.unchanged) == (1, 2, 1)
+    assert len(writes) == 1 and "ON CONFLICT" in writes[0]
+
+    res = await session.execute(
+        select(AcademicRecord.term, AcademicRecord.gpa, AcademicRecord.id)
+        .order_by(AcademicRecord.term)
+        .execution_options(populate_existing=True)
+    )
+    rows = res.all()
+    assert [(t, g) for t, g, _ in rows] == [("T1", 3.5), ("T2", 2.0), ("T3", 1.5)]
+    # Updated in place: same record, same index entry.
+    assert rows[0][2] == t1_id
+    assert index.size == 3
+
+
+@pytest.mark.anyio
+async def test_bulk_insert_uses_copy_on_asyncpg():
+    copied: list[tuple] = []
+
+    class _Driver:
+        async def copy_records_to_table(self, table, *, columns, records):
+            copied.append((table, columns, records))
+
+    class _Raw:
+        driver_connection = _Driver()
+
+    class _Conn:
+        dialect = SimpleNamespace(name="postgresql", driver="asyncpg")
+
+        async def get_raw_connection(self):
+            return _Raw()
+
+        async def execute(self, *args, **kwargs):
+            raise AssertionError("COPY path must not fall back to INSERT")
+
+    class _Session:
+        async def connection(self):
+            return _Conn()
+
+    svc = AcademicsService(_Session())
+    student_id = uuid.uuid4()
+    ids = await svc.bulk_insert(
+        {
+            "student_user_id": [student_id, student_id],
+            "attendance_pct": [80, 90],
+            "assignments_pct": [70, 75],
+            "quizzes_pct": [60, 65],
+            "exams_pct": [50, 55],
+            "gpa": [2.5, 3.0],
+        },
+        commit=False,
+    )
+
+    assert len(copied) == 1
+    table, columns, records = copied[0]
+    assert table == AcademicRecord.__tablename__
+    assert columns == list(BULK_COLUMNS)
+    assert [r[0] for r in records] == ids
+    assert records[1] == (ids[1], student_id, 90, 75, 65, 55, 3.0, None)
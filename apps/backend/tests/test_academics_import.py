@@ -152,3 +152,696 @@ async def test_academics_import_dry_run_and_errors(client, bootstrap_token):
     res = await client.get(f"/academics?student_user_id={student_id}", headers=teacher_auth)
     assert res.status_code == 200
     assert res.json()["items"] == []
+
+
+@pytest.mark.anyio
+async def test_academics_import_resolves_students_in_bulk(client, session, bootstrap_token):
+    from sqlalchemy import event
+
+    from app.core.security import hash_password
+    from app.models.user import User, UserRole
+
+    students = [
+        User(
+            email=f"bulk{i}@example.com",
+            full_name=f"Bulk {i}",
+            role=UserRole.student,
+            password_hash=hash_password("x"),
+        )
+        for i in range(40)
+    ]
+    session.add_all(students)
+    await session.commit()
+
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-import3@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Import3",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email="admin-import3@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+
+    lines = ["student_user_id,student_email,attendance_pct,assignments_pct,quizzes_pct,exams_pct,gpa,term"]
+    for i, s in enumerate(students):
+        # Half by id, half by (mixed-case) email; each student twice.
+        ref = f"{s.id}," if i % 2 else f",BULK{i}@example.com"
+        lines += [f"{ref},80,80,80,80,3.0,T1", f"{ref},70,70,70,70,2.5,T2"]
+    lines += [
+        ",new-bulk@example.com,60,60,60,60,2.0,T1",
+        ",new-bulk@example.com,65,65,65,65,2.2,T2",
+        "not-a-uuid,,60,60,60,60,2.0,T1",
+    ]
+    csv_text = "\n".join(lines) + "\n"
+
+    user_queries: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+            user_queries.append(statement)
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _count)
+    try:
+        files = {"file": ("import.csv", io.BytesIO(csv_text.encode("utf-8")), "text/csv")}
+        res = await client.post("/academics/import", headers=admin_auth, files=files, data={"dry_run": "false"})
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _count)
+
+    assert res.status_code == 200
+    body = res.json()
+    assert body["created"] == 82
+    assert [e["row"] for e in body["errors"]] == [84]
+    # Auth plus one IN query per reference kind.
+    assert len(user_queries) <= 5
+
+
+@pytest.mark.anyio
+async def test_academics_import_bulk_creates_students_pending_password_setup(client, bootstrap_token, monkeypatch):
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-import4@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Import4",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email="admin-import4@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+
+    def _no_hashing(password: str) -> str:
+        raise AssertionError("auto-created students must not hash a password")
+
+    monkeypatch.setattr("app.services.users.hash_password", _no_hashing)
+
+    lines = ["student_email,attendance_pct,assignments_pct,quizzes_pct,exams_pct,gpa,term"]
+    lines += [f"auto{i}@example.com,80,80,80,80,3.0,T1" for i in range(25)]
+    files = {"file": ("import.csv", io.BytesIO(("\n".join(lines) + "\n").encode("utf-8")), "text/csv")}
+    res = await client.post("/academics/import", headers=admin_auth, files=files, data={"dry_run": "false"})
+    assert res.status_code == 200
+    assert res.json()["created"] == 25
+    monkeypatch.undo()
+
+    res = await client.get("/admin/users?q=auto0@", headers=admin_auth)
+    assert res.status_code == 200
+    (student,) = res.json()["items"]
+    assert student["role"] == "student"
+    assert student["password_setup_required"] is True
+
+    # No password works until one is set.
+    res = await client.post(
+        "/auth/login",
+        data={"username": "auto0@example.com", "password": ""},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code in (401, 422)
+    res = await client.post(
+        "/auth/login",
+        data={"username": "auto0@example.com", "password": "!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code == 401
+
+    res = await client.patch(
+        f"/admin/users/{student['id']}", headers=admin_auth, json={"password": "StudentSecure123"}
+    )
+    assert res.status_code == 200
+    assert res.json()["password_setup_required"] is False
+    await _login(client, email="auto0@example.com", password="StudentSecure123")
+
+
+@pytest.mark.anyio
+async def test_streaming_importer_chunks_progress_and_error_cap(session):
+    from sqlalchemy import func, select
+
+    from app.core.security import hash_password
+    from app.models.academic_record import AcademicRecord
+    from app.models.user import User, UserRole
+    from app.services.academic_import import AcademicCsvImporter
+
+    student = User(
+        email="stream@example.com",
+        full_name="Zoë Stream",
+        role=UserRole.student,
+        password_hash=hash_password("x"),
+    )
+    session.add(student)
+    await session.commit()
+
+    # latin-1 bytes (not valid UTF-8) exercise the encoding fallback.
+    lines = ["student_email,attendance_pct,assignments_pct,quizzes_pct,exams_pct,gpa,term"]
+    for i in range(95):
+        gpa = "9.9" if i % 10 == 0 else "3.1"
+        lines.append(f"stream@example.com,80,80,80,80,{gpa},Term {i} é")
+    fh = io.BytesIO(("\n".join(lines) + "\n").encode("latin-1"))
+
+    seen: list[tuple[int, int]] = []
+    importer = AcademicCsvImporter(
+        session,
+        allow_create_students=False,
+        chunk_size=20,
+        max_errors=3,
+        progress=lambda p: seen.append((p.rows_read, p.created)),
+    )
+    result = await importer.run(fh, total_bytes=len(fh.getvalue()))
+
+    assert result.total_rows == 95
+    assert result.created == 85
+    assert result.error_count == 10
+    assert [e.row for e in result.errors] == [2, 12, 22]
+    assert seen == [(20, 18), (40, 36), (60, 54), (80, 72), (95, 85)]
+    assert not fh.closed
+
+    res = await session.execute(select(func.count(AcademicRecord.id)))
+    assert res.scalar_one() == 85
+    res = await session.execute(select(AcademicRecord.term).where(AcademicRecord.term == "Term 1 é"))
+    assert res.scalar_one() == "Term 1 é"
+
+
+@pytest.mark.anyio
+async def test_streaming_importer_aggregates_ruet_course_rows_across_chunks(session):
+    from sqlalchemy import select
+
+    from app.models.academic_record import AcademicRecord
+    from app.services.academic_import import AcademicCsvImporter
+
+    lines = ["student_email,semester,credits,grade_point_4,attendance_10,assignments_10,ct_20,final_60"]
+    # Two students, two courses each, interleaved so each group spans chunks.
+    for course in range(2):
+        for s in range(2):
+            credits = 3 if course == 0 else 1
+            lines.append(f"ruet{s}@example.com,1-1,{credits},{3.0 + course},{9 - course},8,{16 + course},{48 - course * 12}")
+    lines.append("ruet0@example.com,1-1,0,3.0,9,8,16,48")
+    fh = io.BytesIO(("\n".join(lines) + "\n").encode("utf-8"))
+
+    beats = 0
+
+    async def _heartbeat() -> None:
+        nonlocal beats
+        beats += 1
+
+    importer = AcademicCsvImporter(session, allow_create_students=True, chunk_size=2, heartbeat=_heartbeat)
+    result = await importer.run(fh)
+
+    assert result.total_rows == 5
+    assert result.created == 2
+    # One heartbeat per parsed chunk of the aggregation pass.
+    assert beats == 3
+    assert [e.message for e in result.errors] == ["credits must be > 0"]
+
+    res = await session.execute(select(AcademicRecord).order_by(AcademicRecord.attendance_pct))
+    records = list(res.scalars().all())
+    assert len(records) == 2
+    r = records[0]
+    assert r.term == "1-1"
+    assert r.attendance_pct == 88  # (90*3 + 80*1) / 4 = 87.5
+    assert r.gpa == pytest.approx(3.25)
+    assert r.exams_pct == round((80 * 3 + 60 * 1) / 4)
+
+
+def test_ruet_course_frame_reports_first_failing_check_per_row():
+    from app.services.academic_import import ruet_course_frame, ruet_course_means
+
+    def row(**overrides):
+        base = {
+            "student_email": "A@Example.com",
+            "semester": "1-1",
+            "credits": "3",
+            "grade_point_4": "3.5",
+            "attendance_10": "9",
+            "assignments_10": "8",
+            "ct_20": "",
+            "final_60": "45",
+        }
+        return {**base, **overrides}
+
+    rows = [
+        row(),
+        row(student_email=" "),
+        row(semester=""),
+        row(credits="three"),
+        row(credits="0"),
+        row(grade_point_4="4.5", attendance_10=""),
+        row(attendance_10=""),
+        row(ct_20="x"),
+        row(final_60="61", attendance_10="11"),
+        row(final_60="61"),
+        row(term="1-2", credits="1", ct_20="10"),
+    ]
+    frame, errors = ruet_course_frame(rows)
+
+    assert errors == [
+        (1, "missing_field", "Missing required column 'student_email'"),
+        (2, "missing_field", "Missing required column 'term' (or 'semester')"),
+        (3, "invalid_number", "credits must be a number"),
+        (4, "out_of_range", "credits must be > 0"),
+        (5, "out_of_range", "grade_point_4 must be 0.0-4.0"),
+        (6, "missing_field", "Missing required column 'attendance_10'"),
+        (7, "invalid_number", "ct_20 must be a number"),
+        (8, "out_of_range", "attendance_pct derived from marks is out of range"),
+        (9, "out_of_range", "exams_pct derived from marks is out of range"),
+    ]
+    assert list(frame.index) == [0, 10]
+    assert list(frame["student_email"]) == ["a@example.com", "a@example.com"]
+    assert list(frame["term"]) == ["1-1", "1-2"]
+    assert frame.loc[0, "quizzes"] == 0.0
+    assert frame.loc[10, "quizzes"] == pytest.approx(50.0)
+
+    totals = frame.groupby(["student_email", "term"], sort=False)[["w", "attendance", "assignments", "quizzes", "exams", "gpa"]].sum()
+    means = ruet_course_means(totals)
+    assert means.to_dict("records")[0] == {
+        "student_email": "a@example.com",
+        "term": "1-1",
+        "attendance_pct": 90,
+        "assignments_pct": 80,
+        "quizzes_pct": 0,
+        "exams_pct": 75,
+        "gpa": pytest.approx(3.5),
+    }
+
+
+def test_ruet_course_frame_rejects_non_finite_numbers():
+    from app.services.academic_import import ruet_course_frame
+
+    base = {
+        "student_email": "a@example.com",
+        "semester": "1-1",
+        "credits": "3",
+        "grade_point_4": "3.5",
+        "attendance_10": "9",
+        "assignments_10": "8",
+        "ct_20": "",
+        "final_60": "45",
+    }
+    rows = [{**base, "credits": "inf"}, {**base, "grade_point_4": "Infinity"}, {**base, "final_60": "-inf"}, base]
+    frame, errors = ruet_course_frame(rows)
+
+    assert errors == [
+        (0, "invalid_number", "credits must be a number"),
+        (1, "invalid_number", "grade_point_4 must be a number"),
+        (2, "invalid_number", "final_60 must be a number"),
+    ]
+    assert list(frame.index) == [3]
+
+
+@pytest.mark.anyio
+async def test_academics_reimport_rejects_duplicates_or_upserts(client, bootstrap_token, monkeypatch):
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-upsert@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Upsert",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email="admin-upsert@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+
+    res = await client.post(
+        "/admin/users",
+        headers=admin_auth,
+        json={
+            "email": "student-upsert@example.com",
+            "full_name": "Student Upsert",
+            "role": "student",
+            "password": "SuperSecure123",
+        },
+    )
+    assert res.status_code == 201
+    student_id = res.json()["id"]
+
+    header = "student_email,attendance_pct,assignments_pct,quizzes_pct,exams_pct,gpa,term\n"
+    first = header + "student-upsert@example.com,90,90,90,90,3.5,1-1\nstudent-upsert@example.com,80,80,80,80,3.0,1-2\n"
+    second = header + "student-upsert@example.com,90,90,90,90,3.5,1-1\nstudent-upsert@example.com,85,80,80,80,3.2,1-2\n"
+
+    def _files(text: str) -> dict:
+        return {"file": ("terms.csv", io.BytesIO(text.encode("utf-8")), "text/csv")}
+
+    res = await client.post("/academics/import", headers=admin_auth, files=_files(first))
+    assert res.status_code == 200
+    assert res.json()["created"] == 2
+
+    # Default mode: existing (student, term) records are row errors.
+    res = await client.post("/academics/import", headers=admin_auth, files=_files(second))
+    body = res.json()
+    assert body["created"] == 0
+    assert body["error_count"] == 2
+    assert [e["row"] for e in body["errors"]] == [2, 3]
+    assert "already exists" in body["errors"][0]["message"]
+
+    res = await client.post("/academics/import", headers=admin_auth, files=_files(second), data={"upsert": "true"})
+    body = res.json()
+    assert (body["created"], body["updated"], body["unchanged"], body["error_count"]) == (0, 1, 1, 0)
+
+    # Re-importing the same file is a no-op.
+    res = await client.post("/academics/import", headers=admin_auth, files=_files(second), data={"upsert": "true"})
+    body = res.json()
+    assert (body["created"], body["updated"], body["unchanged"]) == (0, 0, 2)
+
+    res = await client.get(f"/academics?student_user_id={student_id}", headers=admin_auth)
+    items = sorted(res.json()["items"], key=lambda r: r["term"])
+    assert [(r["term"], r["attendance_pct"], r["gpa"]) for r in items] == [("1-1", 90, 3.5), ("1-2", 85, 3.2)]
+
+    res = await client.post(
+        "/academics",
+        headers=admin_auth,
+        json={
+            "student_user_id": student_id,
+            "attendance_pct": 70,
+            "assignments_pct": 70,
+            "quizzes_pct": 70,
+            "exams_pct": 70,
+            "gpa": 2.5,
+            "term": "1-1",
+        },
+    )
+    assert res.status_code == 409
+
+    # Databases without INSERT ... ON CONFLICT reject an upsert import before reading it.
+    monkeypatch.setattr("app.services.academic_import.supports_upsert", lambda dialect: False)
+    res = await client.post("/academics/import", headers=admin_auth, files=_files(second), data={"upsert": "true"})
+    assert res.status_code == 400
+    assert res.json()["detail"] == "Upsert imports are not supported on sqlite databases"
+
+
+@pytest.mark.anyio
+async def test_academics_import_spools_errors_to_downloadable_report(client, bootstrap_token, tmp_path, monkeypatch):
+    import json
+
+    from app.core.settings import get_settings
+
+    monkeypatch.setenv("IMPORT_MAX_REPORTED_ERRORS", "3")
+    get_settings.cache_clear()
+    client._transport.app.state.import_jobs.report_dir = tmp_path
+    try:
+        res = await client.post(
+            "/bootstrap/admin",
+            json={
+                "bootstrap_token": bootstrap_token,
+                "email": "admin-report@example.com",
+                "password": "SuperSecure123",
+                "full_name": "Admin Report",
+            },
+        )
+        assert res.status_code == 201
+        admin_tokens = await _login(client, email="admin-report@example.com", password="SuperSecure123")
+        admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+        for email, role in (("teacher-report@example.com", "teacher"), ("teacher-report2@example.com", "teacher")):
+            res = await client.post(
+                "/admin/users",
+                headers=admin_auth,
+                json={"email": email, "full_name": "Teacher", "role": role, "password": "SuperSecure123"},
+            )
+            assert res.status_code == 201
+        res = await client.post(
+            "/admin/users",
+            headers=admin_auth,
+            json={
+                "email": "student-report@example.com",
+                "full_name": "Student Report",
+                "role": "student",
+                "password": "SuperSecure123",
+            },
+        )
+        assert res.status_code == 201
+        teacher_tokens = await _login(client, email="teacher-report@example.com", password="SuperSecure123")
+        teacher_auth = {"Authorization": f"Bearer {teacher_tokens['access_token']}"}
+
+        lines = ["student_email,attendance_pct,assignments_pct,quizzes_pct,exams_pct,gpa,term"]
+        for i in range(20):
+            if i % 4 == 0:
+                lines.append(f"student-report@example.com,80,80,80,80,9.9,T{i}")  # out_of_range
+            elif i % 4 == 1:
+                lines.append(f"student-report@example.com,eighty,80,80,80,3.0,T{i}")  # invalid_number
+            elif i % 4 == 2:
+                lines.append(f"nobody@example.com,80,80,80,80,3.0,T{i}")  # invalid_student
+            else:
+                lines.append(f"student-report@example.com,80,80,80,80,3.0,T{i}")
+        files = {"file": ("bad.csv", io.BytesIO(("\n".join(lines) + "\n").encode()), "text/csv")}
+
+        res = await client.post("/academics/import", headers=teacher_auth, files=files)
+        assert res.status_code == 200
+        body = res.json()
+        assert body["created"] == 5
+        assert body["error_count"] == 15
+        assert body["error_counts"] == {"out_of_range": 5, "invalid_number": 5, "invalid_student": 5}
+        assert [e["row"] for e in body["errors"]] == [2, 3, 4]
+        report_id = body["error_report_id"]
+
+        res = await client.get(f"/academics/import/reports/{report_id}", headers=teacher_auth)
+        assert res.status_code == 200
+        assert res.headers["content-type"].startswith("application/x-ndjson")
+        report = [json.loads(line) for line in res.text.splitlines()]
+        assert len(report) == 15
+        assert report[0]["code"] == "out_of_range"
+        assert report[-1]["row"] == 20 and report[-1]["raw"]["student_email"] == "nobody@example.com"
+
+        res = await client.get(f"/academics/import/reports/{report_id}", headers=admin_auth)
+        assert res.status_code == 200
+        other = await _login(client, email="teacher-report2@example.com", password="SuperSecure123")
+        res = await client.get(
+            f"/academics/import/reports/{report_id}", headers={"Authorization": f"Bearer {other['access_token']}"}
+        )
+        assert res.status_code == 404
+
+        # A clean import leaves no report behind.
+        clean = lines[0] + "\nstudent-report@example.com,80,80,80,80,3.0,T99\n"
+        files = {"file": ("ok.csv", io.BytesIO(clean.encode()), "text/csv")}
+        res = await client.post("/academics/import", headers=teacher_auth, files=files)
+        assert res.json()["error_report_id"] is None
+        assert len(list(tmp_path.glob("*/*.ndjson"))) == 1
+    finally:
+        monkeypatch.undo()
+        get_settings.cache_clear()
+
+
+def test_iter_shards_splits_on_record_boundaries():
+    from app.services.import_parsing import iter_shards, read_header
+
+    data = (
+        '\ufeffstudent_email,term,"note\r\nwith newline"\r\n'
+        'a@example.com,T1,"x\r\ny"\r\n'
+        'b@example.com,T2,"say ""hi""\nagain"\n'
+        "c@example.com,T3,plain\n"
+        "d@example.com,T4,last"
+    ).encode()
+    fh = io.BytesIO(data)
+
+    fieldnames, start = read_header(fh, "utf-8-sig")
+    assert fieldnames == ["student_email", "term", "note\r\nwith newline"]
+
+    for shard_bytes in (1, 7, 30, 1 << 16):
+        shards = list(iter_shards(fh, start=start, shard_bytes=shard_bytes))
+        assert b"".join(s for s, _ in shards) == data[start:]
+        assert shards[-1][1] == len(data)
+        for shard, _end in shards[:-1]:
+            assert shard.endswith(b"\n")
+            assert shard.count(b'"') % 2 == 0
+
+
+def test_to_float_uses_one_grammar_on_both_paths():
+    import numpy as np
+
+    from app.services.import_parsing import to_float
+
+    clean = to_float(np.array(["1_000", "2.5", ""]))
+    # "abc" sends the whole column down the per-cell fallback.
+    mixed = to_float(np.array(["1_000", "2.5", "", "abc"]))
+    np.testing.assert_array_equal(clean, [1000.0, 2.5, np.nan])
+    np.testing.assert_array_equal(mixed, [1000.0, 2.5, np.nan, np.nan])
+
+
+@pytest.mark.anyio
+async def test_parallel_parse_matches_sequential_import(session):
+    from app.services.academic_import import AcademicCsvImporter
+    from app.services.import_parsing import ParsePool
+
+    summary = ["student_email,attendance_pct,assignments_pct,quizzes_pct,exams_pct,gpa,term"]
+    for i in range(60):
+        gpa = "9.9" if i % 13 == 0 else "3.1"
+        email = "" if i == 20 else f"par{i % 4}@example.com"
+        summary.append(f'{email},80,80,{"x" if i == 33 else 80},80,{gpa},"Term {i},\nA"')
+        if i == 40:
+            summary.append("")
+    ruet = ["student_email,semester,credits,grade_point_4,attendance_10,assignments_10,ct_20,final_60"]
+    for i in range(40):
+        credits = "0" if i == 17 else "3"
+        ruet.append(f"ruet-par{i % 3}@example.com,1-{i % 2 + 1},{credits},3.5,9,8,16,48")
+
+    pool = ParsePool(2)
+    try:
+        for lines in (summary, ruet):
+            data = ("\n".join(lines) + "\n").encode("utf-8")
+            results = []
+            for parse_pool in (None, pool):
+                importer = AcademicCsvImporter(
+                    session,
+                    allow_create_students=True,
+                    dry_run=True,
+                    chunk_size=7,
+                    parse_pool=parse_pool,
+                    parallel_min_bytes=0,
+                    shard_bytes=200,
+                )
+                results.append(await importer.run(io.BytesIO(data), total_bytes=len(data)))
+            sequential, parallel = results
+            assert parallel == sequential
+            assert sequential.error_count > 0
+        assert pool._executor is not None
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.anyio
+async def test_academics_import_accepts_parquet(client, bootstrap_token):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-parquet@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Parquet",
+        },
+    )
+    assert res.status_code == 201
+    tokens = await _login(client, email="admin-parquet@example.com", password="SuperSecure123")
+    auth = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    table = pa.table(
+        {
+            "student_email": ["pq1@example.com", "pq2@example.com", None, "pq1@example.com", "pq2@example.com"],
+            "attendance_pct": pa.array([90, 80, 70, 60, 50], pa.int64()),
+            "assignments_pct": pa.array([85.0, 80.5, 70.0, None, 50.0]),
+            "quizzes_pct": pa.array([80, 75, 70, 65, 101], pa.int32()),
+            "exams_pct": pa.array([78, 72, 70, 60, 50], pa.int16()),
+            "gpa": pa.array([3.5, 3.1, 2.0, 2.5, 2.0]),
+            "term": ["T1", "T1", "T1", "T2", "T2"],
+        }
+    )
+    buf = io.BytesIO()
+    pq.write_table(table, buf)
+    files = {"file": ("records.parquet", io.BytesIO(buf.getvalue()), "application/octet-stream")}
+
+    res = await client.post("/academics/import", headers=auth, files=files)
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert body["total_rows"] == 5
+    assert body["created"] == 1
+    assert [(e["row"], e["code"], e["message"]) for e in body["errors"]] == [
+        (2, "invalid_number", "assignments_pct must be an integer"),
+        (3, "missing_student", "Provide student_user_id or student_email"),
+        (4, "missing_field", "Missing required column 'assignments_pct'"),
+        (5, "out_of_range", "quizzes_pct must be 0-100"),
+    ]
+    assert body["errors"][0]["raw"]["assignments_pct"] == "80.5"
+
+    res = await client.get("/academics", headers=auth, params={"term": "T1"})
+    assert res.status_code == 200
+    [record] = res.json()["items"]
+    assert (record["attendance_pct"], record["assignments_pct"], record["gpa"]) == (90, 85, 3.5)
+
+    # Not a CSV, Parquet or Arrow file with readable contents.
+    files = {"file": ("broken.parquet", io.BytesIO(b"PAR1garbage"), "application/octet-stream")}
+    res = await client.post("/academics/import", headers=auth, files=files)
+    assert res.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_arrow_ruet_import_matches_csv(session):
+    pa = pytest.importorskip("pyarrow")
+
+    from app.services.academic_import import AcademicCsvImporter
+
+    rows = []
+    for i in range(30):
+        rows.append(
+            {
+                "student_email": f"arrow{i % 3}@example.com",
+                "semester": f"1-{i % 2 + 1}",
+                "credits": 0.0 if i == 11 else 3.0,
+                "grade_point_4": 3.25,
+                "attendance_10": 9,
+                "assignments_10": None if i == 5 else 8,
+                "ct_20": None if i % 4 else 16,
+                "final_60": 48,
+            }
+        )
+    header = list(rows[0])
+    csv_lines = [",".join(header)] + [",".join("" if r[c] is None else str(r[c]) for c in header) for r in rows]
+    csv_data = ("\n".join(csv_lines) + "\n").encode()
+
+    table = pa.Table.from_pylist(rows)
+    file_buf, stream_buf = io.BytesIO(), io.BytesIO()
+    with pa.ipc.new_file(file_buf, table.schema) as writer:
+        writer.write_table(table, max_chunksize=7)
+    with pa.ipc.new_stream(stream_buf, table.schema) as writer:
+        writer.write_table(table, max_chunksize=7)
+
+    results = []
+    for data in (csv_data, file_buf.getvalue(), stream_buf.getvalue()):
+        importer = AcademicCsvImporter(session, allow_create_students=True, dry_run=True, chunk_size=2)
+        results.append(await importer.run(io.BytesIO(data), total_bytes=len(data)))
+
+    from_csv, from_file, from_stream = results
+    assert from_csv.total_rows == from_file.total_rows == from_stream.total_rows == 30
+    assert from_csv.created == from_file.created == from_stream.created == 6
+    assert [e.code for e in from_csv.errors] == ["missing_field", "out_of_range"]
+    # Same errors; Arrow rows count from 1 (CSV rows from the header).
+    for result in (from_file, from_stream):
+        assert [(e.row + 1, e.code, e.message) for e in result.errors] == [
+            (e.row, e.code, e.message) for e in from_csv.errors
+        ]
+
+
+def test_columnar_numbers_beyond_float_precision_are_row_errors():
+    pa = pytest.importorskip("pyarrow")
+    from app.services.academic_import import parse_summary_columns
+    from app.services.import_columnar import BatchColumns
+
+    batch = pa.record_batch(
+        {
+            "student_email": ["big@example.com", "ok@example.com"],
+            "attendance_pct": pa.array([2**63 - 1, 90], pa.int64()),
+            "assignments_pct": pa.array([80, 80], pa.int64()),
+            "quizzes_pct": pa.array([70, 70], pa.int64()),
+            "exams_pct": pa.array([60, 60], pa.int64()),
+            "gpa": pa.array([3.0, 3.0]),
+            "term": ["T1", "T1"],
+        }
+    )
+    part = parse_summary_columns(BatchColumns(batch))
+
+    assert part.failures == {0: ("out_of_range", "attendance_pct must be 0-100")}
+    assert part.columns["attendance_pct"][1] == 90
+
+
+def test_summary_rows_reject_non_finite_numbers():
+    from app.services.academic_import import parse_summary_rows
+
+    base = {
+        "student_email": "nan@example.com",
+        "attendance_pct": "90",
+        "assignments_pct": "80",
+        "quizzes_pct": "70",
+        "exams_pct": "60",
+        "gpa": "3.0",
+        "term": "T1",
+    }
+    part = parse_summary_rows([{**base, "gpa": "nan"}, {**base, "gpa": "inf"}, {**base, "exams_pct": "inf"}, base])
+
+    assert part.failures == {
+        0: ("invalid_number", "gpa must be a number"),
+        1: ("invalid_number", "gpa must be a number"),
+        2: ("invalid_number", "exams_pct must be an integer"),
+    }
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+
+async def _login(client, *, email: str, password: str) -> dict:
+    res = await client.post(
+        "/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+async def _admin_and_teacher(client, bootstrap_token: str, suffix: str) -> tuple[dict, dict]:
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": f"admin-{suffix}@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Jobs",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email=f"admin-{suffix}@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+
+    res = await client.post(
+        "/admin/users",
+        headers=admin_auth,
+        json={
+            "email": f"teacher-{suffix}@example.com",
+            "full_name": "Teacher Jobs",
+            "role": "teacher",
+            "password": "SuperSecure123",
+        },
+    )
+    assert res.status_code == 201
+    teacher_tokens = await _login(client, email=f"teacher-{suffix}@example.com", password="SuperSecure123")
+    return admin_auth, {"Authorization": f"Bearer {teacher_tokens['access_token']}"}
+
+
+async def _student(client, admin_auth: dict, email: str) -> str:
+    res = await client.post(
+        "/admin/users",
+        headers=admin_auth,
+        json={"email": email, "full_name": "Student Jobs", "role": "student", "password": "SuperSecure123"},
+    )
+    assert res.status_code == 201
+    return res.json()["id"]
+
+
+@pytest.mark.anyio
+async def test_import_job_runs_in_background_and_reports_status(client, bootstrap_token, tmp_path):
+    admin_auth, teacher_auth = await _admin_and_teacher(client, bootstrap_token, "jobs1")
+    await _student(client, admin_auth, "student-jobs1@example.com")
+
+    runner = client._transport.app.state.import_jobs
+    runner.staging_dir = tmp_path
+    runner.chunk_size = 4
+
+    lines = ["student_email,attendance_pct,assignments_pct,quizzes_pct,exams_pct,gpa,term"]
+    for i in range(10):
+        gpa = "9.9" if i == 3 else "3.2"
+        lines.append(f"student-jobs1@example.com,80,80,80,80,{gpa},Term {i}")
+    files = {"file": ("jobs.csv", io.BytesIO(("\n".join(lines) + "\n").encode()), "text/csv")}
+
+    res = await client.post("/academics/import", headers=teacher_auth, files=files, data={"mode": "job"})
+    assert res.status_code == 202
+    job = res.json()
+    assert job["status"] == "queued"
+    assert job["filename"] == "jobs.csv"
+
+    await runner.wait(uuid.UUID(job["id"]))
+
+    res = await client.get(f"/academics/import/{job['id']}", headers=teacher_auth)
+    assert res.status_code == 200
+    body = res.json()
+    assert body["status"] == "succeeded"
+    assert body["rows_processed"] == 10
+    assert body["created"] == 9
+    assert body["error_count"] == 1
+    assert [e["row"] for e in body["errors"]] == [5]
+    assert body["bytes_processed"] == body["total_bytes"]
+    assert body["finished_at"] is not None
+    assert list(tmp_path.iterdir()) == []
+
+    res = await client.get(f"/academics/import/{job['id']}", headers=admin_auth)
+    assert res.status_code == 200
+
+    # Another teacher cannot see the job.
+    res = await client.post(
+        "/admin/users",
+        headers=admin_auth,
+        json={
+            "email": "teacher-jobs1b@example.com",
+            "full_name": "Other Teacher",
+            "role": "teacher",
+            "password": "SuperSecure123",
+        },
+    )
+    assert res.status_code == 201
+    other = await _login(client, email="teacher-jobs1b@example.com", password="SuperSecure123")
+    res = await client.get(
+        f"/academics/import/{job['id']}", headers={"Authorization": f"Bearer {other['access_token']}"}
+    )
+    assert res.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_interrupted_import_job_resumes_from_checkpoint(client, session, bootstrap_token, tmp_path, monkeypatch):
+    import json
+
+    from app.models.academic_record import AcademicRecord
+    from app.services.academics import AcademicsService
+
+    admin_auth, teacher_auth = await _admin_and_teacher(client, bootstrap_token, "jobs2")
+    await _student(client, admin_auth, "student-jobs2@example.com")
+
+    runner = client._transport.app.state.import_jobs
+    runner.staging_dir = tmp_path
+    runner.report_dir = tmp_path / "reports"
+    runner.chunk_size = 5
+
+    lines = ["student_email,attendance_pct,assignments_pct,quizzes_pct,exams_pct,gpa,term"]
+    for i in range(23):
+        # Row 14 (i=12) is in the chunk that gets interrupted.
+        gpa = "9.9" if i in (1, 12, 17) else "3.0"
+        lines.append(f"student-jobs2@example.com,70,70,70,70,{gpa},Term {i}")
+    files = {"file": ("resume.csv", io.BytesIO(("\n".join(lines) + "\n").encode()), "text/csv")}
+
+    # Simulate the process dying while writing the third chunk.
+    real_bulk_insert = AcademicsService.bulk_insert
+    calls = 0
+
+    async def _dies_on_third_chunk(self, rows, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 3:
+            raise asyncio.CancelledError
+        return await real_bulk_insert(self, rows, **kwargs)
+
+    monkeypatch.setattr(AcademicsService, "bulk_insert", _dies_on_third_chunk)
+
+    res = await client.post("/academics/import", headers=teacher_auth, files=files, data={"mode": "job"})
+    assert res.status_code == 202
+    job_id = res.json()["id"]
+    await runner.wait(uuid.UUID(job_id))
+
+    res = await client.get(f"/academics/import/{job_id}", headers=teacher_auth)
+    interrupted = res.json()
+    assert interrupted["status"] == "running"
+    assert interrupted["rows_processed"] == 10
+    assert interrupted["created"] == 9
+    assert interrupted["error_count"] == 1
+
+    monkeypatch.setattr(AcademicsService, "bulk_insert", real_bulk_insert)
+    assert await runner.resume_pending() == 1
+    await runner.wait(uuid.UUID(job_id))
+
+    res = await client.get(f"/academics/import/{job_id}", headers=teacher_auth)
+    body = res.json()
+    assert body["status"] == "succeeded"
+    assert body["rows_processed"] == 23
+    assert body["created"] == 20
+    assert body["error_count"] == 3
+    assert body["error_counts"] == {"out_of_range": 3}
+    assert [e["row"] for e in body["errors"]] == [3, 14, 19]
+
+    # The report has each error once: lines written after the checkpoint were cut on resume.
+    res = await client.get(f"/academics/import/reports/{body['error_report_id']}", headers=teacher_auth)
+    assert res.status_code == 200
+    assert [json.loads(line)["row"] for line in res.text.splitlines()] == [3, 14, 19]
+
+    # Every valid row was written exactly once.
+    res = await session.execute(select(AcademicRecord.term, func.count()).group_by(AcademicRecord.term))
+    counts = dict(res.all())
+    assert len(counts) == 20
+    assert set(counts.values()) == {1}
+
+
+@pytest.mark.anyio
+async def test_import_job_is_claimed_by_one_worker(session, tmp_path):
+    from datetime import UTC, datetime, timedelta
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.models.import_job import ImportJob, ImportJobStatus
+    from app.models.user import User, UserRole
+    from app.services.import_jobs import ImportJobClaimLost, ImportJobRunner
+
+    user = User(email="claims@example.com", role=UserRole.teacher, password_hash="x")
+    session.add(user)
+    await session.flush()
+    job = ImportJob(created_by_user_id=user.id, status=ImportJobStatus.queued, staged_path=str(tmp_path / "none"))
+    session.add(job)
+    await session.commit()
+
+    SessionLocal = async_sessionmaker(session.bind, expire_on_commit=False)
+    a, b = (ImportJobRunner(SessionLocal, staging_dir=tmp_path, report_dir=tmp_path, lease_seconds=60) for _ in range(2))
+
+    # Two workers racing for the same queued job: only one claim succeeds.
+    async with SessionLocal() as s1, SessionLocal() as s2:
+        claims = [await a._claim(s1, job.id), await b._claim(s2, job.id)]
+    assert claims == [True, False]
+
+    # While a's claim is live, b does not resume the job on its startup.
+    assert await b.resume_pending() == 0
+
+    # Once a stops checkpointing for longer than the lease, the job is b's to resume.
+    await session.refresh(job)
+    job.heartbeat_at = datetime.now(UTC) - timedelta(seconds=120)
+    await session.commit()
+    async with SessionLocal() as s:
+        assert await b._claim(s, job.id)
+    await session.refresh(job)
+    assert job.claimed_by == b.worker_id
+
+    # a has lost the job: its next checkpoint is refused instead of overwriting b's progress.
+    async with SessionLocal() as s:
+        with pytest.raises(ImportJobClaimLost):
+            await a._renew(s, job.id)
+        await b._renew(s, job.id)
+
+    # A clean shutdown releases the claim, so any worker resumes the job right away.
+    await b.close()
+    await session.refresh(job)
+    assert job.status == ImportJobStatus.running
+    assert job.claimed_by is None
+    async with SessionLocal() as s:
+        assert await a._claim(s, job.id)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+async def _login(client, *, email: str, password: str) -> dict:
+    res = await client.post(
+        "/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+def _train_df(seed: int, n: int = 200) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "attendance_pct": rng.integers(55, 100, size=n),
+            "assignments_pct": rng.integers(40, 100, size=n),
+            "quizzes_pct": rng.integers(35, 100, size=n),
+            "exams_pct": rng.integers(30, 100, size=n),
+            "gpa": rng.random(size=n) * 4.0,
+        }
+    )
+    avg = (df["assignments_pct"] + df["quizzes_pct"] + df["exams_pct"]) / 3.0
+    df["at_risk"] = ((df["gpa"] < 2.2) | (df["attendance_pct"] < 78) | (avg < 66)).astype(int)
+    return df
+
+
+@pytest.mark.anyio
+async def test_assess_matches_predict_and_explain(client, bootstrap_token):
+    from app.ml.inference import clear_model_cache
+    from app.ml.train import train_from_dataframe
+
+    version, _ = train_from_dataframe(_train_df(7), notes="assess")
+    clear_model_cache()
+
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-assess@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Assess",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email="admin-assess@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+
+    features = {"attendance_pct": 72, "assignments_pct": 64, "quizzes_pct": 58, "exams_pct": 55, "gpa": 2.1}
+
+    res = await client.post("/ml/assess", headers=admin_auth, json={"features": features, "top_k": 3})
+    assert res.status_code == 200
+    assessed = res.json()
+    assert assessed["model_version"] == version
+    assert assessed["degraded"] is False
+    assert len(assessed["factors"]) == 3
+
+    res = await client.post("/ml/predict", headers=admin_auth, json={"features": features})
+    assert res.status_code == 200
+    predicted = res.json()
+    assert assessed["risk_probability"] == pytest.approx(predicted["risk_probability"], abs=1e-6)
+    assert assessed["classification"] == predicted["classification"]
+
+    res = await client.post("/ml/explain", headers=admin_auth, json={"features": features, "top_k": 3})
+    assert res.status_code == 200
+    explained = res.json()["factors"]
+    assert [f["feature_key"] for f in assessed["factors"]] == [f["feature_key"] for f in explained]
+    for a, e in zip(assessed["factors"], explained, strict=True):
+        assert a["impact"] == pytest.approx(e["impact"], abs=1e-9)
+        assert a["direction"] == e["direction"]
+
+
+@pytest.mark.anyio
+async def test_assess_students_cannot_send_raw_features(client):
+    await client.post(
+        "/auth/register",
+        json={"email": "stud-assess@example.com", "password": "SuperSecure123", "full_name": "Stud Assess"},
+    )
+    tokens = await _login(client, email="stud-assess@example.com", password="SuperSecure123")
+    res = await client.post(
+        "/ml/assess",
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+        json={"features": {"attendance_pct": 90, "assignments_pct": 90, "quizzes_pct": 90, "exams_pct": 90, "gpa": 3.5}},
+    )
+    assert res.status_code == 403
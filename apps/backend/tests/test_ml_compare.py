@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.security import hash_password
+from app.models.academic_record import AcademicRecord
+from app.models.user import User, UserRole
+
+
+async def _login(client, *, email: str, password: str) -> dict:
+    res = await client.post(
+        "/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+def _train_df(seed: int, n: int = 200) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "attendance_pct": rng.integers(55, 100, size=n),
+            "assignments_pct": rng.integers(40, 100, size=n),
+            "quizzes_pct": rng.integers(35, 100, size=n),
+            "exams_pct": rng.integers(30, 100, size=n),
+            "gpa": rng.random(size=n) * 4.0,
+        }
+    )
+    avg = (df["assignments_pct"] + df["quizzes_pct"] + df["exams_pct"]) / 3.0
+    df["at_risk"] = ((df["gpa"] < 2.2) | (df["attendance_pct"] < 78) | (avg < 66)).astype(int)
+    return df
+
+
+@pytest.mark.anyio
+async def test_compare_two_versions_on_records_and_holdout(client, session, bootstrap_token):
+    from app.ml.inference import clear_model_cache
+    from app.ml.train import train_from_dataframe
+
+    v1, _ = train_from_dataframe(_train_df(21), notes="baseline")
+    v2, _ = train_from_dataframe(_train_df(22), notes="candidate")
+    clear_model_cache()
+
+    students = [
+        User(email=f"cmp{i}@example.com", full_name="", role=UserRole.student, password_hash=hash_password("x"))
+        for i in range(3)
+    ]
+    session.add_all(students)
+    await session.flush()
+    rng = np.random.default_rng(3)
+    session.add_all(
+        [
+            AcademicRecord(
+                student_user_id=students[i % 3].id,
+                attendance_pct=int(rng.integers(50, 100)),
+                assignments_pct=int(rng.integers(40, 100)),
+                quizzes_pct=int(rng.integers(40, 100)),
+                exams_pct=int(rng.integers(40, 100)),
+                gpa=float(rng.random() * 4.0),
+                term=f"T{i}",
+            )
+            for i in range(12)
+        ]
+    )
+    await session.commit()
+
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-compare@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Compare",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email="admin-compare@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+
+    res = await client.post(
+        "/ml/models/compare",
+        headers=admin_auth,
+        json={"baseline_version": v1, "candidate_version": v2, "threshold": 0.4},
+    )
+    assert res.status_code == 200
+    body = res.json()
+    assert body["rows"] == 12
+    assert body["baseline_version"] == v1 and body["candidate_version"] == v2
+    assert body["flipped_rows"] == body["flips_to_at_risk"] + body["flips_to_not_at_risk"]
+    assert body["flipped_students"] <= 3
+    assert sum(b["count"] for b in body["delta"]["histogram"]) == 12
+    assert set(body["metric_deltas"]) >= {"accuracy", "f1"}
+
+    # Holdout defaults to the candidate's stored evaluation split; baseline defaults to LATEST.
+    res = await client.post(
+        "/ml/models/compare",
+        headers=admin_auth,
+        json={"candidate_version": v1, "source": "holdout"},
+    )
+    assert res.status_code == 200
+    body = res.json()
+    assert body["baseline_version"] == v2
+    assert body["rows"] == 40
+    assert body["flipped_students"] is None
+    assert body["metrics_candidate"]["accuracy"] >= 0.0
+
+    res = await client.post(
+        "/ml/models/compare",
+        headers=admin_auth,
+        json={"candidate_version": "missing-version"},
+    )
+    assert res.status_code == 404
+
+    res = await client.post(
+        "/ml/models/compare",
+        headers=admin_auth,
+        json={"candidate_version": v1, "source": "holdout", "holdout_version": f"../models/{v1}"},
+    )
+    assert res.status_code == 404
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from app.ml.compiled import CompiledEnsemble
+from app.ml.preprocess import preprocess_records
+from app.ml.registry import load_latest_artifact
+from app.ml.train import TrainConfig, train_from_dataframe
+
+
+def test_compiled_engine_matches_artifact(tmp_path, monkeypatch):
+    monkeypatch.setenv("MODEL_REGISTRY_PATH", str(tmp_path / "registry"))
+
+    rng = np.random.default_rng(17)
+    n = 400
+    df = pd.DataFrame(
+        {
+            "attendance_pct": rng.integers(50, 100, size=n),
+            "assignments_pct": rng.integers(40, 100, size=n),
+            "quizzes_pct": rng.integers(35, 100, size=n),
+            "exams_pct": rng.integers(30, 100, size=n),
+            "gpa": rng.random(size=n) * 4.0,
+        }
+    )
+    train_from_dataframe(df, train_cfg=TrainConfig(distill=True))
+    artifact = load_latest_artifact()
+    compiled = CompiledEnsemble.from_artifact(artifact)
+
+    x = preprocess_records(df)
+    np.testing.assert_allclose(compiled.predict_proba(x), artifact.predict_proba(x), rtol=0, atol=1e-9)
+    np.testing.assert_allclose(compiled.predict_proba_fast(x), artifact.predict_proba_fast(x), rtol=0, atol=1e-9)
+    np.testing.assert_allclose(compiled.predict_proba(x.iloc[[3]]), artifact.predict_proba(x.iloc[[3]]), atol=1e-9)
+
+    # Missing values follow LightGBM's routing rules.
+    x_nan = x.copy()
+    x_nan.iloc[::5, 1] = np.nan
+    lgbm_p = artifact.lgbm.predict_proba(x_nan)[:, 1]
+    compiled_p = 1.0 / (1.0 + np.exp(-compiled.sigmoid * compiled.lgbm_margin(x_nan)))
+    np.testing.assert_allclose(compiled_p, lgbm_p, rtol=0, atol=1e-9)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+async def _login(client, *, email: str, password: str) -> dict:
+    res = await client.post(
+        "/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+def _train_df(seed: int, n: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "attendance_pct": rng.integers(55, 100, size=n),
+            "assignments_pct": rng.integers(40, 100, size=n),
+            "quizzes_pct": rng.integers(35, 100, size=n),
+            "exams_pct": rng.integers(30, 100, size=n),
+            "gpa": rng.random(size=n) * 4.0,
+        }
+    )
+    avg = (df["assignments_pct"] + df["quizzes_pct"] + df["exams_pct"]) / 3.0
+    df["at_risk"] = ((df["gpa"] < 2.2) | (df["attendance_pct"] < 78) | (avg < 66)).astype(int)
+    return df
+
+
+class _CountingScorer:
+    def __init__(self, inner):
+        self.inner = inner
+        self.calls = 0
+
+    def predict_proba(self, x):
+        self.calls += 1
+        return self.inner.predict_proba(x)
+
+
+def test_counterfactual_grid_is_scored_in_one_call(tmp_path, monkeypatch):
+    monkeypatch.setenv("MODEL_REGISTRY_PATH", str(tmp_path / "registry"))
+
+    from app.ml.counterfactual import counterfactuals
+    from app.ml.preprocess import preprocess_records
+    from app.ml.registry import load_latest_artifact
+    from app.ml.train import train_from_dataframe
+
+    train_from_dataframe(_train_df(31))
+    artifact = load_latest_artifact()
+    scorer = _CountingScorer(artifact)
+
+    raw = pd.DataFrame(
+        [{"attendance_pct": 70, "assignments_pct": 75, "quizzes_pct": 72, "exams_pct": 70, "gpa": 3.2}]
+    )
+    result = counterfactuals(scorer, raw, threshold=0.5, pct_step=1, gpa_step=0.05)
+
+    assert scorer.calls == 1
+    assert result.variants_scored > 300
+    assert result.at_risk
+
+    attendance = next(c for c in result.changes if c.feature == "attendance_pct")
+    assert attendance.required_value is not None and attendance.delta > 0
+    assert attendance.probability < 0.5
+
+    # Minimal: one step less is still at risk.
+    below = raw.assign(attendance_pct=attendance.required_value - 1)
+    assert float(artifact.predict_proba(preprocess_records(below))[0]) >= 0.5
+
+
+@pytest.mark.anyio
+async def test_counterfactual_endpoint(client, bootstrap_token):
+    from app.ml.inference import clear_model_cache
+    from app.ml.train import train_from_dataframe
+
+    train_from_dataframe(_train_df(32), notes="counterfactual")
+    clear_model_cache()
+
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-cf@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Counterfactual",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email="admin-cf@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+
+    features = {"attendance_pct": 95, "assignments_pct": 90, "quizzes_pct": 88, "exams_pct": 91, "gpa": 3.6}
+    res = await client.post("/ml/counterfactual", headers=admin_auth, json={"features": features})
+    assert res.status_code == 200
+    body = res.json()
+    assert body["classification"] == "Not-At-Risk"
+    assert {c["feature_key"] for c in body["changes"]} == {
+        "attendance_pct",
+        "assignments_pct",
+        "quizzes_pct",
+        "exams_pct",
+        "gpa",
+    }
+    # Not at risk: the search reports how far each feature can fall.
+    for c in body["changes"]:
+        if c["required_value"] is not None:
+            assert c["delta"] < 0
+            assert c["risk_probability"] >= 0.5
+
+    gpa = next(c for c in body["changes"] if c["feature_key"] == "gpa")
+    assert gpa["required_value"] is not None
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ml.degrade import InferenceGate
+
+
+async def _login(client, *, email: str, password: str) -> dict:
+    res = await client.post(
+        "/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+@pytest.mark.anyio
+async def test_inference_gate_falls_back_on_budget_and_queue():
+    gate = InferenceGate(max_inflight=1, workers=2)
+    release = threading.Event()
+
+    def slow() -> str:
+        release.wait(timeout=5)
+        return "full"
+
+    result, degraded = await gate.run("predict", slow, lambda: "fallback", budget_ms=20)
+    assert (result, degraded) == ("fallback", True)
+
+    # The overrunning call still holds the only slot, so the next one is shed immediately.
+    result, degraded = await gate.run("predict", lambda: "full", lambda: "fallback", budget_ms=None)
+    assert (result, degraded) == ("fallback", True)
+
+    release.set()
+    for _ in range(100):
+        if gate.inflight == 0:
+            break
+        time.sleep(0.01)
+
+    result, degraded = await gate.run("predict", lambda: "full", lambda: "fallback", budget_ms=1000)
+    assert (result, degraded) == ("full", False)
+
+    stats = gate.snapshot()["endpoints"]["predict"]
+    assert stats["requests"] == 3
+    assert stats["by_reason"] == {"budget": 1, "queue": 1}
+    assert stats["fallback_rate"] == pytest.approx(2 / 3)
+
+
+@pytest.mark.anyio
+async def test_predict_and_explain_report_degraded(client, bootstrap_token, monkeypatch):
+    from app.ml import inference
+    from app.ml.degrade import get_inference_gate
+    from app.ml.train import train_from_dataframe
+
+    rng = np.random.default_rng(4)
+    n = 200
+    df = pd.DataFrame(
+        {
+            "attendance_pct": rng.integers(55, 100, size=n),
+            "assignments_pct": rng.integers(40, 100, size=n),
+            "quizzes_pct": rng.integers(35, 100, size=n),
+            "exams_pct": rng.integers(30, 100, size=n),
+            "gpa": rng.random(size=n) * 4.0,
+        }
+    )
+    train_from_dataframe(df)
+    inference.clear_model_cache()
+    get_inference_gate().reset()
+
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-degraded@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Degraded",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email="admin-degraded@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+    features = {"attendance_pct": 70, "assignments_pct": 60, "quizzes_pct": 55, "exams_pct": 50, "gpa": 2.0}
+
+    res = await client.post("/ml/predict", headers=admin_auth, json={"features": features, "latency_budget_ms": 5000})
+    assert res.status_code == 200
+    assert res.json()["degraded"] is False
+
+    slow_score = inference._score
+
+    def _slow(*args, **kwargs):
+        time.sleep(0.3)
+        return slow_score(*args, **kwargs)
+
+    def _slow_explain(*args, **kwargs):
+        time.sleep(0.3)
+        raise AssertionError("should have been abandoned")
+
+    monkeypatch.setattr(inference, "_score", _slow)
+    monkeypatch.setattr(inference, "_explain_all", _slow_explain)
+
+    res = await client.post("/ml/predict", headers=admin_auth, json={"features": features, "latency_budget_ms": 20})
+    assert res.status_code == 200
+    body = res.json()
+    assert body["degraded"] is True
+    assert body["inference_mode"] == "logistic"
+    assert 0.0 <= body["risk_probability"] <= 1.0
+
+    res = await client.post(
+        "/ml/explain", headers=admin_auth, json={"features": features, "latency_budget_ms": 20, "top_k": 3}
+    )
+    assert res.status_code == 200
+    assert res.json()["degraded"] is True
+    assert len(res.json()["factors"]) == 3
+
+    res = await client.get("/ml/metrics", headers=admin_auth)
+    assert res.status_code == 200
+    endpoints = res.json()["endpoints"]
+    assert endpoints["predict"]["requests"] == 2
+    assert endpoints["predict"]["by_reason"] == {"budget": 1}
+    assert endpoints["explain"]["degraded"] == 1
+
+
+@pytest.mark.anyio
+async def test_predict_sheds_to_fallback_when_inflight_is_full_without_budget(client, bootstrap_token, monkeypatch):
+    import asyncio
+
+    from app.ml import inference
+    from app.ml.degrade import get_inference_gate
+    from app.ml.train import train_from_dataframe
+
+    rng = np.random.default_rng(5)
+    n = 200
+    df = pd.DataFrame(
+        {
+            "attendance_pct": rng.integers(55, 100, size=n),
+            "assignments_pct": rng.integers(40, 100, size=n),
+            "quizzes_pct": rng.integers(35, 100, size=n),
+            "exams_pct": rng.integers(30, 100, size=n),
+            "gpa": rng.random(size=n) * 4.0,
+        }
+    )
+    train_from_dataframe(df)
+    inference.clear_model_cache()
+    gate = get_inference_gate()
+    gate.reset()
+    # Calls abandoned by earlier tests may still hold slots; let them finish first.
+    for _ in range(500):
+        if gate.inflight == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert gate.inflight == 0
+    monkeypatch.setattr(gate, "max_inflight", 2)
+    monkeypatch.delenv("ML_LATENCY_BUDGET_MS", raising=False)
+
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-shed@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Shed",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email="admin-shed@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+    features = {"attendance_pct": 70, "assignments_pct": 60, "quizzes_pct": 55, "exams_pct": 50, "gpa": 2.0}
+
+    release = threading.Event()
+    real_score = inference._score
+
+    def _blocked(*args, **kwargs):
+        release.wait(timeout=5)
+        return real_score(*args, **kwargs)
+
+    monkeypatch.setattr(inference, "_score", _blocked)
+
+    # No latency budget: the first two calls occupy every slot while their model work is blocked.
+    busy = [
+        asyncio.create_task(client.post("/ml/predict", headers=admin_auth, json={"features": features}))
+        for _ in range(2)
+    ]
+    for _ in range(200):
+        if gate.inflight == 2:
+            break
+        await asyncio.sleep(0.01)
+    assert gate.inflight == 2
+
+    res = await client.post("/ml/predict", headers=admin_auth, json={"features": features})
+    assert res.status_code == 200
+    assert res.json()["degraded"] is True
+    assert res.json()["inference_mode"] == "logistic"
+
+    release.set()
+    for res in await asyncio.gather(*busy):
+        assert res.status_code == 200
+        assert res.json()["degraded"] is False
+
+    stats = gate.snapshot()["endpoints"]["predict"]
+    assert stats["requests"] == 3
+    assert stats["by_reason"] == {"queue": 1}
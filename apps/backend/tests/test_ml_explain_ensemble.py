@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+async def _login(client, *, email: str, password: str) -> dict:
+    res = await client.post(
+        "/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+def _train_df(seed: int, n: int = 200) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "attendance_pct": rng.integers(55, 100, size=n),
+            "assignments_pct": rng.integers(40, 100, size=n),
+            "quizzes_pct": rng.integers(35, 100, size=n),
+            "exams_pct": rng.integers(30, 100, size=n),
+            "gpa": rng.random(size=n) * 4.0,
+        }
+    )
+    avg = (df["assignments_pct"] + df["quizzes_pct"] + df["exams_pct"]) / 3.0
+    df["at_risk"] = ((df["gpa"] < 2.2) | (df["attendance_pct"] < 78) | (avg < 66)).astype(int)
+    return df
+
+
+def test_ensemble_contributions_add_up_for_a_batch(tmp_path, monkeypatch):
+    monkeypatch.setenv("MODEL_REGISTRY_PATH", str(tmp_path / "registry"))
+
+    from app.ml.explain import ensemble_contributions
+    from app.ml.preprocess import preprocess_records
+    from app.ml.registry import load_artifact
+    from app.ml.train import train_from_dataframe
+
+    df = _train_df(11)
+    version, _ = train_from_dataframe(df, notes="ensemble-explain")
+    artifact = load_artifact(version)
+    x = preprocess_records(df.drop(columns=["at_risk"]).head(40))
+
+    contrib, p_base, p = ensemble_contributions(artifact, x)
+
+    assert contrib.shape == (40, len(artifact.feature_names))
+    assert np.allclose(p, artifact.predict_proba(x), atol=1e-6)
+    assert np.allclose(p_base + contrib.sum(axis=1), p, atol=1e-9)
+
+
+@pytest.mark.anyio
+async def test_explain_ensemble_mode_adds_up_to_probability(client, bootstrap_token):
+    from app.ml.inference import clear_model_cache
+    from app.ml.train import train_from_dataframe
+
+    train_from_dataframe(_train_df(12), notes="ensemble-explain")
+    clear_model_cache()
+
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-ensemble@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Ensemble",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email="admin-ensemble@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+    features = {"attendance_pct": 68, "assignments_pct": 61, "quizzes_pct": 57, "exams_pct": 52, "gpa": 1.9}
+
+    res = await client.post("/ml/predict", headers=admin_auth, json={"features": features})
+    assert res.status_code == 200
+    p = res.json()["risk_probability"]
+
+    res = await client.post(
+        "/ml/explain", headers=admin_auth, json={"features": features, "mode": "ensemble", "top_k": 10}
+    )
+    assert res.status_code == 200
+    body = res.json()
+    assert body["base_probability"] is not None
+    assert body["base_probability"] + sum(f["impact"] for f in body["factors"]) == pytest.approx(p, abs=1e-6)
+
+    res = await client.post(
+        "/ml/assess", headers=admin_auth, json={"features": features, "mode": "ensemble", "top_k": 10}
+    )
+    assert res.status_code == 200
+    assessed = res.json()
+    assert assessed["risk_probability"] == pytest.approx(p, abs=1e-6)
+    assert [f["impact"] for f in assessed["factors"]] == pytest.approx([f["impact"] for f in body["factors"]])
+
+    # The default mode keeps explaining the LightGBM half in raw-score units.
+    res = await client.post("/ml/explain", headers=admin_auth, json={"features": features})
+    assert res.status_code == 200
+    assert res.json()["base_probability"] is None
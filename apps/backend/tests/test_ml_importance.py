@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+async def _login(client, *, email: str, password: str) -> dict:
+    res = await client.post(
+        "/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+def _train_df(seed: int, n: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "attendance_pct": rng.integers(55, 100, size=n),
+            "assignments_pct": rng.integers(40, 100, size=n),
+            "quizzes_pct": rng.integers(35, 100, size=n),
+            "exams_pct": rng.integers(30, 100, size=n),
+            "gpa": rng.random(size=n) * 4.0,
+        }
+    )
+    avg = (df["assignments_pct"] + df["quizzes_pct"] + df["exams_pct"]) / 3.0
+    df["at_risk"] = ((df["gpa"] < 2.2) | (df["attendance_pct"] < 78) | (avg < 66)).astype(int)
+    return df
+
+
+@pytest.mark.anyio
+async def test_global_importance_is_stored_and_served(client, bootstrap_token):
+    from app.ml.registry import version_dir
+    from app.ml.train import train_from_dataframe
+
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-importance@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Importance",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email="admin-importance@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+
+    res = await client.get("/ml/model/importance", headers=admin_auth)
+    assert res.status_code == 404
+
+    version, _ = train_from_dataframe(_train_df(21), notes="importance")
+    assert (version_dir(version) / "importance.json").exists()
+
+    res = await client.get("/ml/model/importance", headers=admin_auth)
+    assert res.status_code == 200
+    body = res.json()
+    assert body["model_version"] == version
+    assert body["rows"] == 240
+    assert 0.0 < body["base_probability"] < 1.0
+
+    feats = body["features"]
+    assert sum(f["share"] for f in feats) == pytest.approx(1.0)
+    impacts = [f["mean_abs_impact"] for f in feats]
+    assert impacts == sorted(impacts, reverse=True)
+    by_key = {f["feature_key"]: f for f in feats}
+    # Low GPA and low attendance drive the label, so higher values lower the risk.
+    assert by_key["gpa"]["direction"] == "higher_decreases_risk"
+    assert by_key["attendance_pct"]["direction"] == "higher_decreases_risk"
+
+    # Served from memory after the first read: no per-request file or model work.
+    (version_dir(version) / "importance.json").unlink()
+    res = await client.get("/ml/model/importance", headers=admin_auth, params={"model_version": version})
+    assert res.status_code == 200
+    assert res.json()["features"] == feats
+
+    res = await client.get("/ml/model/importance", headers=admin_auth, params={"model_version": "nope"})
+    assert res.status_code == 404
+    # Versions are path components: nothing outside the registry's models/ directory is read.
+    res = await client.get("/ml/model/importance", headers=admin_auth, params={"model_version": f"../models/{version}"})
+    assert res.status_code == 404
+
+    version2, _ = train_from_dataframe(_train_df(22), notes="importance-corrupt")
+    (version_dir(version2) / "importance.json").write_text("{not json", encoding="utf-8")
+    res = await client.get("/ml/model/importance", headers=admin_auth, params={"model_version": version2})
+    assert res.status_code == 503
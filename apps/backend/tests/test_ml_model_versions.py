@@ -71,7 +71,7 @@ async def test_list_and_promote_models(client, bootstrap_token):
                 "quizzes_pct": 50 + (i % 50),
                 "exams_pct": 45 + (i % 55),
                 "gpa": 1.0 + ((i % 30) / 10.0),
-                "term": "2026-Spring",
+                "term": f"2026-T{i}",
             },
         )
         assert res.status_code == 201
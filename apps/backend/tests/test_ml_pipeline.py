@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import numpy as np
 import pandas as pd
-import pytest
 
 from app.ml.registry import latest_version, load_latest_artifact
 from app.ml.train import train_from_dataframe
@@ -49,3 +48,36 @@ def test_train_saves_and_loads_artifact(tmp_path, monkeypatch):
     p = artifact.predict_proba(x_proc)
     assert p.shape == (1,)
     assert float(p[0]) >= 0.0 and float(p[0]) <= 1.0
+
+
+def test_distilled_student_tracks_ensemble(tmp_path, monkeypatch):
+    monkeypatch.setenv("MODEL_REGISTRY_PATH", str(tmp_path / "registry"))
+
+    from app.ml.preprocess import preprocess_records
+    from app.ml.registry import load_metadata
+    from app.ml.train import TrainConfig
+
+    rng = np.random.default_rng(3)
+    n = 300
+    df = pd.DataFrame(
+        {
+            "attendance_pct": rng.integers(50, 100, size=n),
+            "assignments_pct": rng.integers(40, 100, size=n),
+            "quizzes_pct": rng.integers(35, 100, size=n),
+            "exams_pct": rng.integers(30, 100, size=n),
+            "gpa": rng.random(size=n) * 4.0,
+        }
+    )
+
+    version, meta = train_from_dataframe(df, train_cfg=TrainConfig(distill=True))
+    assert set(meta.distilled_fidelity) == {"mae", "max_abs_error", "label_agreement"}
+    assert meta.distilled_fidelity["mae"] < 0.1
+    assert load_metadata(version).distilled_fidelity == meta.distilled_fidelity
+
+    artifact = load_latest_artifact()
+    assert artifact.has_student
+    x = preprocess_records(df)
+    fast = artifact.predict_proba_fast(x)
+    assert fast.shape == (n,)
+    assert np.all((fast >= 0.0) & (fast <= 1.0))
+    assert np.mean(np.abs(fast - artifact.predict_proba(x))) < 0.1
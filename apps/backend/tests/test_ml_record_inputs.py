@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.security import hash_password
+from app.models.academic_record import AcademicRecord
+from app.models.user import User, UserRole
+
+
+async def _login(client, *, email: str, password: str) -> dict:
+    res = await client.post(
+        "/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+@pytest.mark.anyio
+async def test_record_predictions_use_projected_rows(client, session):
+    from app.ml.inference import clear_model_cache
+    from app.ml.train import train_from_dataframe
+
+    rng = np.random.default_rng(40)
+    n = 200
+    df = pd.DataFrame(
+        {
+            "attendance_pct": rng.integers(55, 100, size=n),
+            "assignments_pct": rng.integers(40, 100, size=n),
+            "quizzes_pct": rng.integers(35, 100, size=n),
+            "exams_pct": rng.integers(30, 100, size=n),
+            "gpa": rng.random(size=n) * 4.0,
+        }
+    )
+    train_from_dataframe(df, notes="projection")
+    clear_model_cache()
+
+    owner = User(
+        email="proj-owner@example.com",
+        full_name="Owner",
+        role=UserRole.student,
+        password_hash=hash_password("SuperSecure123"),
+    )
+    other = User(
+        email="proj-other@example.com",
+        full_name="Other",
+        role=UserRole.student,
+        password_hash=hash_password("SuperSecure123"),
+    )
+    session.add_all([owner, other])
+    await session.flush()
+    old = AcademicRecord(
+        student_user_id=owner.id,
+        attendance_pct=95,
+        assignments_pct=90,
+        quizzes_pct=88,
+        exams_pct=92,
+        gpa=3.8,
+        term="1-1",
+        created_at=datetime(2025, 1, 1, tzinfo=UTC),
+    )
+    new = AcademicRecord(
+        student_user_id=owner.id,
+        attendance_pct=60,
+        assignments_pct=50,
+        quizzes_pct=45,
+        exams_pct=40,
+        gpa=1.6,
+        term="1-2",
+        created_at=datetime(2025, 6, 1, tzinfo=UTC),
+    )
+    session.add_all([old, new])
+    await session.commit()
+    old_id, new_id = old.id, new.id
+    session.expunge_all()
+
+    owner_auth = {
+        "Authorization": f"Bearer {(await _login(client, email='proj-owner@example.com', password='SuperSecure123'))['access_token']}"
+    }
+    other_auth = {
+        "Authorization": f"Bearer {(await _login(client, email='proj-other@example.com', password='SuperSecure123'))['access_token']}"
+    }
+
+    res = await client.post("/ml/predict", headers=owner_auth, json={"academic_record_id": str(old_id)})
+    assert res.status_code == 200
+    p_old = res.json()["risk_probability"]
+
+    # Default path: the owner's latest record.
+    res = await client.post("/ml/predict", headers=owner_auth, json={})
+    assert res.status_code == 200
+    assert res.json()["risk_probability"] > p_old
+
+    res = await client.post("/ml/predict", headers=other_auth, json={"academic_record_id": str(new_id)})
+    assert res.status_code == 403
+
+    # Scoring a record never materialized it as an ORM entity.
+    assert not [o for o in session.identity_map.values() if isinstance(o, AcademicRecord)]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+async def _login(client, *, email: str, password: str) -> dict:
+    res = await client.post(
+        "/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+def _train_df(seed: int, n: int = 200) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "attendance_pct": rng.integers(55, 100, size=n),
+            "assignments_pct": rng.integers(40, 100, size=n),
+            "quizzes_pct": rng.integers(35, 100, size=n),
+            "exams_pct": rng.integers(30, 100, size=n),
+            "gpa": rng.random(size=n) * 4.0,
+        }
+    )
+    avg = (df["assignments_pct"] + df["quizzes_pct"] + df["exams_pct"]) / 3.0
+    df["at_risk"] = ((df["gpa"] < 2.2) | (df["attendance_pct"] < 78) | (avg < 66)).astype(int)
+    return df
+
+
+@pytest.mark.anyio
+async def test_shadow_model_scores_live_predictions(client, bootstrap_token, monkeypatch):
+    from app.ml.inference import clear_model_cache
+    from app.ml.shadow import get_shadow_scorer
+    from app.ml.train import train_from_dataframe
+
+    v1, _ = train_from_dataframe(_train_df(1), notes="candidate")
+    v2, _ = train_from_dataframe(_train_df(2), notes="active")
+    clear_model_cache()
+
+    scorer = get_shadow_scorer()
+    monkeypatch.setattr(scorer, "sample_rate", 1.0)
+
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-shadow@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Shadow",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email="admin-shadow@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+
+    res = await client.put("/ml/shadow/does-not-exist", headers=admin_auth)
+    assert res.status_code == 404
+
+    res = await client.put(f"/ml/shadow/{v1}", headers=admin_auth)
+    assert res.status_code == 200
+    assert res.json()["shadow_version"] == v1
+    assert res.json()["active_version"] == v2
+
+    for att in (60, 75, 90):
+        res = await client.post(
+            "/ml/predict",
+            headers=admin_auth,
+            json={
+                "features": {
+                    "attendance_pct": att,
+                    "assignments_pct": 70,
+                    "quizzes_pct": 65,
+                    "exams_pct": 60,
+                    "gpa": 2.4,
+                }
+            },
+        )
+        assert res.status_code == 200
+        assert res.json()["model_version"] == v2
+
+    scorer.drain(timeout=10)
+
+    res = await client.get("/ml/shadow", headers=admin_auth)
+    assert res.status_code == 200
+    stats = res.json()
+    assert stats["scored"] == 3
+    assert stats["errors"] == 0
+    assert stats["active_versions"] == {v2: 3}
+    assert sum(b["count"] for b in stats["delta_histogram"]) == 3
+    assert 0.0 <= stats["mean_abs_delta"] <= stats["max_abs_delta"] <= 1.0
+
+    res = await client.delete("/ml/shadow", headers=admin_auth)
+    assert res.status_code == 200
+    assert res.json()["shadow_version"] is None
+    assert res.json()["scored"] == 0
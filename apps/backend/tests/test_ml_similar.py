@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.core.security import hash_password
+from app.ml.similarity import SimilarityIndex
+from app.models.academic_record import AcademicRecord
+from app.models.user import User, UserRole
+
+
+async def _login(client, *, email: str, password: str) -> dict:
+    res = await client.post(
+        "/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+def _brute_force(live: dict, index: SimilarityIndex, q: np.ndarray, k: int) -> list[uuid.UUID]:
+    ids = list(live)
+    z = (np.vstack([live[i] for i in ids]) - index._mean) / index._std
+    zq = (q - index._mean) / index._std
+    d = np.sqrt(((z - zq) ** 2).sum(axis=1))
+    return [ids[i] for i in np.argsort(d, kind="stable")[:k]]
+
+
+def test_index_matches_brute_force_through_incremental_updates():
+    rng = np.random.default_rng(0)
+    n = 400
+    raw = np.column_stack(
+        [rng.integers(0, 101, size=(n, 4)), rng.random(n) * 4.0],
+    ).astype(float)
+    ids = [uuid.uuid4() for _ in range(n)]
+    students = [uuid.uuid4() for _ in range(n)]
+
+    index = SimilarityIndex(min_rebuild=50)
+    index.build(ids, students, raw)
+    live = dict(zip(ids, raw, strict=True))
+
+    q = np.array([70.0, 65.0, 60.0, 55.0, 2.1])
+    assert [nb.record_id for nb in index.query(q, k=8)] == _brute_force(live, index, q, 8)
+
+    # Updates, inserts and deletes; enough of them to trigger a rebuild midway.
+    for i in range(40):
+        index.upsert(ids[i], students[i], raw[i] + 3.0)
+        live[ids[i]] = raw[i] + 3.0
+    for _ in range(30):
+        rid = uuid.uuid4()
+        row = np.append(rng.integers(0, 101, size=4), rng.random() * 4.0).astype(float)
+        index.upsert(rid, uuid.uuid4(), row)
+        live[rid] = row
+    for i in range(100, 130):
+        index.remove(ids[i])
+        live.pop(ids[i])
+
+    assert index.size == len(live)
+    assert [nb.record_id for nb in index.query(q, k=8)] == _brute_force(live, index, q, 8)
+
+    # Excluding a student drops exactly their records.
+    nearest = index.query(q, k=1)[0]
+    excluded = index.query(q, k=8, exclude_student=nearest.student_user_id)
+    assert nearest.record_id not in {nb.record_id for nb in excluded}
+
+
+@pytest.mark.anyio
+async def test_similar_endpoint_tracks_record_writes(client, session, bootstrap_token):
+    students = [
+        User(
+            email=f"sim-nn{i}@example.com",
+            full_name=f"Student {i}",
+            role=UserRole.student,
+            password_hash=hash_password("x"),
+        )
+        for i in range(6)
+    ]
+    session.add_all(students)
+    await session.flush()
+    rng = np.random.default_rng(9)
+    session.add_all(
+        [
+            AcademicRecord(
+                student_user_id=students[i % 6].id,
+                attendance_pct=int(rng.integers(50, 100)),
+                assignments_pct=int(rng.integers(40, 100)),
+                quizzes_pct=int(rng.integers(40, 100)),
+                exams_pct=int(rng.integers(40, 100)),
+                gpa=float(rng.random() * 4.0),
+                term=f"T{i // 6}",
+                created_at=datetime(2025, 1, 1, tzinfo=UTC) + timedelta(days=i),
+            )
+            for i in range(30)
+        ]
+    )
+    await session.commit()
+
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-similar@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Similar",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email="admin-similar@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+
+    res = await client.post(
+        "/ml/similar", headers=admin_auth, json={"student_user_id": str(students[0].id), "k": 4}
+    )
+    assert res.status_code == 200
+    body = res.json()
+    assert body["indexed_records"] == 30
+    assert len(body["neighbors"]) == 4
+    assert all(nb["student_user_id"] != str(students[0].id) for nb in body["neighbors"])
+    distances = [nb["distance"] for nb in body["neighbors"]]
+    assert distances == sorted(distances)
+    assert all(nb["outcome_term"] == "T4" for nb in body["neighbors"])
+
+    features = {"attendance_pct": 12, "assignments_pct": 13, "quizzes_pct": 14, "exams_pct": 15, "gpa": 0.4}
+    res = await client.post(
+        "/academics",
+        headers=admin_auth,
+        json={"student_user_id": str(students[1].id), "term": "T9", **features},
+    )
+    assert res.status_code == 201
+    created_id = res.json()["id"]
+
+    res = await client.post("/ml/similar", headers=admin_auth, json={"features": features, "k": 1})
+    assert res.status_code == 200
+    nearest = res.json()["neighbors"][0]
+    assert nearest["record_id"] == created_id
+    assert nearest["distance"] == pytest.approx(0.0)
+    assert nearest["student_name"] == "Student 1"
+    assert nearest["at_risk"] is True
+
+    res = await client.delete(f"/academics/{created_id}", headers=admin_auth)
+    assert res.status_code == 204
+
+    res = await client.post("/ml/similar", headers=admin_auth, json={"features": features, "k": 1})
+    assert res.status_code == 200
+    assert res.json()["indexed_records"] == 30
+    assert res.json()["neighbors"][0]["record_id"] != created_id
+
+
+def test_writes_during_a_pending_build_are_replayed():
+    rng = np.random.default_rng(1)
+    raw = np.column_stack([rng.integers(0, 101, size=(50, 4)), rng.random(50) * 4.0]).astype(float)
+    ids = [uuid.uuid4() for _ in range(50)]
+    students = [uuid.uuid4() for _ in range(50)]
+
+    index = SimilarityIndex()
+    # Before any build is under way, writes are not tracked.
+    index.upsert(uuid.uuid4(), uuid.uuid4(), raw[0])
+
+    # Rows were read (ids[:40]); meanwhile one record is added, one updated and one deleted.
+    index.begin_build()
+    new_id = uuid.uuid4()
+    index.upsert(new_id, students[45], raw[45])
+    index.upsert(ids[1], students[1], raw[1] + 5.0)
+    index.remove(ids[2])
+    index.build(ids[:40], students[:40], raw[:40])
+
+    assert index.ready
+    assert index.size == 40
+    [nearest] = index.query(raw[45], k=1)
+    assert nearest.record_id == new_id
+    assert ids[2] not in {nb.record_id for nb in index.query(raw[2], k=40)}
+    assert index.query(raw[1] + 5.0, k=1)[0].record_id == ids[1]
+
+    # The journal ends with the build.
+    index.clear()
+    index.upsert(uuid.uuid4(), uuid.uuid4(), raw[0])
+    assert index.size == 0
+
+
+@pytest.mark.anyio
+async def test_concurrent_lazy_builds_run_once(session, monkeypatch):
+    import asyncio
+
+    from app.routers.ml import _ensure_similarity_index
+
+    index = SimilarityIndex()
+    builds = 0
+    real_build = index.build
+
+    def _counting_build(*args):
+        nonlocal builds
+        builds += 1
+        real_build(*args)
+
+    monkeypatch.setattr(index, "build", _counting_build)
+    await asyncio.gather(*(_ensure_similarity_index(session, index) for _ in range(3)))
+    assert builds == 1
+    assert index.ready
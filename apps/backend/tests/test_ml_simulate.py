@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.security import hash_password
+from app.models.academic_record import AcademicRecord
+from app.models.user import User, UserRole
+
+
+async def _login(client, *, email: str, password: str) -> dict:
+    res = await client.post(
+        "/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+def _train_df(seed: int, n: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "attendance_pct": rng.integers(55, 100, size=n),
+            "assignments_pct": rng.integers(40, 100, size=n),
+            "quizzes_pct": rng.integers(35, 100, size=n),
+            "exams_pct": rng.integers(30, 100, size=n),
+            "gpa": rng.random(size=n) * 4.0,
+        }
+    )
+    avg = (df["assignments_pct"] + df["quizzes_pct"] + df["exams_pct"]) / 3.0
+    df["at_risk"] = ((df["gpa"] < 2.2) | (df["attendance_pct"] < 78) | (avg < 66)).astype(int)
+    return df
+
+
+def test_bootstrap_intervals_cover_the_estimate():
+    from app.ml.simulate import bootstrap_intervals
+
+    rng = np.random.default_rng(0)
+    flags = rng.random(2000) < 0.3
+    out = bootstrap_intervals({"rate": flags}, replicates=500, seed=1)["rate"]
+    assert out["low"] < out["estimate"] < out["high"]
+    assert out["estimate"] == pytest.approx(flags.mean())
+    assert out["high"] - out["low"] < 0.1
+
+
+@pytest.mark.anyio
+async def test_simulate_attendance_intervention(client, session, bootstrap_token):
+    from app.ml.inference import clear_model_cache
+    from app.ml.train import train_from_dataframe
+
+    train_from_dataframe(_train_df(41), notes="simulate")
+    clear_model_cache()
+
+    students = [
+        User(email=f"sim{i}@example.com", full_name="", role=UserRole.student, password_hash=hash_password("x"))
+        for i in range(4)
+    ]
+    session.add_all(students)
+    await session.flush()
+    rng = np.random.default_rng(5)
+    session.add_all(
+        [
+            AcademicRecord(
+                student_user_id=students[i % 4].id,
+                attendance_pct=int(rng.integers(55, 78)),
+                assignments_pct=int(rng.integers(70, 100)),
+                quizzes_pct=int(rng.integers(70, 100)),
+                exams_pct=int(rng.integers(70, 100)),
+                gpa=float(2.6 + rng.random()),
+                # One record per student and term.
+                term=f"2-1.{i // 4}" if i < 12 else "2-2",
+            )
+            for i in range(16)
+        ]
+    )
+    await session.commit()
+
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-simulate@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Simulate",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email="admin-simulate@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+
+    res = await client.post(
+        "/ml/simulate",
+        headers=admin_auth,
+        json={
+            "terms": ["2-1.0", "2-1.1", "2-1.2"],
+            "transforms": [{"feature": "attendance_pct", "op": "add", "value": 25}],
+            "bootstrap": 200,
+            "seed": 7,
+        },
+    )
+    assert res.status_code == 200
+    body = res.json()
+    assert body["rows"] == 12
+    assert body["students"] == 4
+    # Low attendance is the only risk driver here, so raising it moves students out.
+    assert body["leaving_at_risk"] > 0
+    assert body["scenario_at_risk"] == body["baseline_at_risk"] - body["leaving_at_risk"] + body["entering_at_risk"]
+    assert body["mean_probability_scenario"] < body["mean_probability_baseline"]
+    ci = body["intervals"]["at_risk_rate_reduction"]
+    assert ci["low"] <= ci["estimate"] <= ci["high"]
+
+    res = await client.post(
+        "/ml/simulate",
+        headers=admin_auth,
+        json={"terms": ["9-9"], "transforms": [{"feature": "gpa", "op": "set", "value": 4.0}]},
+    )
+    assert res.status_code == 404
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import f1_score, precision_score, recall_score
+
+from app.ml.thresholds import ThresholdCurve
+
+
+async def _login(client, *, email: str, password: str) -> dict:
+    res = await client.post(
+        "/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+def test_threshold_curve_matches_sklearn():
+    rng = np.random.default_rng(5)
+    y = rng.integers(0, 2, size=300)
+    proba = np.clip(0.35 * y + rng.random(300) * 0.65, 0, 1)
+    proba[:10] = 0.5  # ties exactly on a threshold
+
+    curve = ThresholdCurve.from_arrays(y, proba)
+    thresholds = np.array([0.0, 0.2, 0.5, 0.77, 1.0])
+    out = curve.evaluate(thresholds)
+
+    for i, t in enumerate(thresholds):
+        pred = (proba >= t).astype(int)
+        assert out["flagged"][i] == pred.sum()
+        assert out["precision"][i] == pytest.approx(precision_score(y, pred, zero_division=0))
+        assert out["recall"][i] == pytest.approx(recall_score(y, pred, zero_division=0))
+        assert out["f1"][i] == pytest.approx(f1_score(y, pred, zero_division=0))
+
+
+@pytest.mark.anyio
+async def test_threshold_endpoint_uses_stored_holdout(client, bootstrap_token):
+    from app.ml.registry import load_holdout
+    from app.ml.train import train_from_dataframe
+
+    rng = np.random.default_rng(9)
+    n = 200
+    df = pd.DataFrame(
+        {
+            "attendance_pct": rng.integers(55, 100, size=n),
+            "assignments_pct": rng.integers(40, 100, size=n),
+            "quizzes_pct": rng.integers(35, 100, size=n),
+            "exams_pct": rng.integers(30, 100, size=n),
+            "gpa": rng.random(size=n) * 4.0,
+        }
+    )
+    version, _ = train_from_dataframe(df)
+    holdout = load_holdout(version)
+    assert holdout["proba"].shape == holdout["y"].shape == (40,)
+
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-thresholds@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Thresholds",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email="admin-thresholds@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+
+    res = await client.get(f"/ml/models/{version}/thresholds?threshold=0.3&threshold=0.6", headers=admin_auth)
+    assert res.status_code == 200
+    body = res.json()
+    assert body["holdout_rows"] == 40
+    assert [p["threshold"] for p in body["points"]] == [0.3, 0.6]
+    assert body["points"][0]["flagged"] >= body["points"][1]["flagged"]
+
+    res = await client.get(f"/ml/models/{version}/thresholds?steps=11", headers=admin_auth)
+    assert res.status_code == 200
+    points = res.json()["points"]
+    assert len(points) == 11
+    assert points[0]["flagged"] == 40 and points[0]["recall"] in (0.0, 1.0)
+
+    res = await client.get("/ml/models/unknown/thresholds", headers=admin_auth)
+    assert res.status_code == 404
+    # An encoded ".." segment is not a version either.
+    res = await client.get("/ml/models/%2E%2E/thresholds", headers=admin_auth)
+    assert res.status_code == 404
@@ -74,7 +74,7 @@ async def test_admin_can_train_model_from_records(client, bootstrap_token, tmp_p
                 "quizzes_pct": 50 + (i % 50),
                 "exams_pct": 45 + (i % 55),
                 "gpa": 1.0 + ((i % 30) / 10.0),
-                "term": "2026-Spring",
+                "term": f"2026-T{i}",
             },
         )
         assert res.status_code == 201
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ml.version_cache import VersionCache
+
+
+async def _login(client, *, email: str, password: str) -> dict:
+    res = await client.post(
+        "/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+def _train_df(seed: int, n: int = 200) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "attendance_pct": rng.integers(55, 100, size=n),
+            "assignments_pct": rng.integers(40, 100, size=n),
+            "quizzes_pct": rng.integers(35, 100, size=n),
+            "exams_pct": rng.integers(30, 100, size=n),
+            "gpa": rng.random(size=n) * 4.0,
+        }
+    )
+    avg = (df["assignments_pct"] + df["quizzes_pct"] + df["exams_pct"]) / 3.0
+    df["at_risk"] = ((df["gpa"] < 2.2) | (df["attendance_pct"] < 78) | (avg < 66)).astype(int)
+    return df
+
+
+@pytest.mark.anyio
+async def test_version_cache_is_lru_and_loads_once():
+    calls: list[str] = []
+    gate = threading.Event()
+
+    def loader(version: str) -> str:
+        gate.wait(timeout=5)
+        calls.append(version)
+        return f"model-{version}"
+
+    cache: VersionCache[str] = VersionCache(loader, capacity=2, max_concurrent_loads=1)
+
+    pending = [asyncio.ensure_future(cache.get("a")) for _ in range(5)]
+    await asyncio.sleep(0.01)
+    gate.set()
+    assert await asyncio.gather(*pending) == ["model-a"] * 5
+    assert calls == ["a"]
+
+    await cache.get("b")
+    await cache.get("a")  # touch: "b" is now least recently used
+    await cache.get("c")
+    assert cache.resident() == ["a", "c"]
+    assert calls == ["a", "b", "c"]
+
+
+@pytest.mark.anyio
+async def test_predict_and_explain_can_pin_a_model_version(client, bootstrap_token):
+    from app.ml.inference import clear_model_cache
+    from app.ml.train import train_from_dataframe
+
+    v1, _ = train_from_dataframe(_train_df(11), notes="older")
+    v2, _ = train_from_dataframe(_train_df(12), notes="latest")
+    clear_model_cache()
+
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-pin@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Pin",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email="admin-pin@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+
+    features = {"attendance_pct": 70, "assignments_pct": 60, "quizzes_pct": 55, "exams_pct": 50, "gpa": 2.0}
+
+    res = await client.post("/ml/predict", headers=admin_auth, json={"features": features})
+    assert res.status_code == 200
+    assert res.json()["model_version"] == v2
+
+    res = await client.post("/ml/predict", headers=admin_auth, json={"features": features, "model_version": v1})
+    assert res.status_code == 200
+    assert res.json()["model_version"] == v1
+
+    res = await client.post(
+        "/ml/explain", headers=admin_auth, json={"features": features, "model_version": v1, "top_k": 2}
+    )
+    assert res.status_code == 200
+    assert res.json()["model_version"] == v1
+
+    res = await client.post(
+        "/ml/counterfactual", headers=admin_auth, json={"features": features, "model_version": v1}
+    )
+    assert res.status_code == 200
+    assert res.json()["model_version"] == v1
+
+    res = await client.post("/ml/predict", headers=admin_auth, json={"features": features, "model_version": "nope"})
+    assert res.status_code == 404
+
+    # Students cannot pin versions.
+    res = await client.post(
+        "/auth/register",
+        json={"email": "student-pin@example.com", "password": "SuperSecure123", "full_name": "Student Pin"},
+    )
+    assert res.status_code == 201
+    student_tokens = await _login(client, email="student-pin@example.com", password="SuperSecure123")
+    res = await client.post(
+        "/ml/predict",
+        headers={"Authorization": f"Bearer {student_tokens['access_token']}"},
+        json={"model_version": v1},
+    )
+    assert res.status_code == 403
+    res = await client.post(
+        "/ml/counterfactual",
+        headers={"Authorization": f"Bearer {student_tokens['access_token']}"},
+        json={"model_version": v1},
+    )
+    assert res.status_code == 403
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.prediction_audit import PredictionAuditEvent
+from app.services.prediction_audit import PredictionAuditLog
+
+
+async def _login(client, *, email: str, password: str) -> dict:
+    res = await client.post(
+        "/auth/login",
+        data={"username": email, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert res.status_code == 200
+    return res.json()
+
+
+def _event(i: int) -> dict:
+    return {
+        "endpoint": "predict",
+        "caller_user_id": uuid.uuid4(),
+        "caller_role": "teacher",
+        "model_version": "v1",
+        "inference_mode": "full",
+        "degraded": False,
+        "threshold": 0.5,
+        "risk_probability": i / 10.0,
+        "classification": "Not-At-Risk",
+        "inputs": {"gpa": 3.0},
+    }
+
+
+async def _count(session: AsyncSession) -> int:
+    res = await session.execute(select(func.count(PredictionAuditEvent.id)))
+    return int(res.scalar_one())
+
+
+@pytest.mark.anyio
+async def test_audit_log_batches_on_timer_size_and_backpressure(session):
+    SessionLocal = async_sessionmaker(session.bind, expire_on_commit=False)
+    log = PredictionAuditLog(SessionLocal, queue_size=4, flush_batch=3, flush_interval_ms=50)
+
+    # Timer trigger.
+    await log.record(**_event(1))
+    await log.record(**_event(2))
+    assert await _count(session) == 0
+    await asyncio.sleep(0.2)
+    assert await _count(session) == 2
+    assert log.stats.flushes == 1
+
+    # Size trigger: the third pending event starts a flush of all three in one insert.
+    for i in range(3):
+        await log.record(**_event(i))
+    await log._task
+    assert await _count(session) == 5
+    assert log.stats.flushes == 2
+
+    # Backpressure: with the queue full, the caller waits for a flush.
+    slow = PredictionAuditLog(SessionLocal, queue_size=2, flush_batch=100, flush_interval_ms=60_000)
+    for i in range(3):
+        await slow.record(**_event(i))
+    assert slow.stats.backpressure_waits == 1
+    assert slow.pending == 1
+    await slow.close()
+    assert await _count(session) == 8
+    assert slow.stats.dropped == 0
+
+
+@pytest.mark.anyio
+async def test_predictions_are_audited(client, session, bootstrap_token):
+    from app.ml.inference import clear_model_cache
+    from app.ml.train import train_from_dataframe
+
+    rng = np.random.default_rng(51)
+    n = 200
+    df = pd.DataFrame(
+        {
+            "attendance_pct": rng.integers(55, 100, size=n),
+            "assignments_pct": rng.integers(40, 100, size=n),
+            "quizzes_pct": rng.integers(35, 100, size=n),
+            "exams_pct": rng.integers(30, 100, size=n),
+            "gpa": rng.random(size=n) * 4.0,
+        }
+    )
+    version, _ = train_from_dataframe(df, notes="audit")
+    clear_model_cache()
+
+    res = await client.post(
+        "/bootstrap/admin",
+        json={
+            "bootstrap_token": bootstrap_token,
+            "email": "admin-audit@example.com",
+            "password": "SuperSecure123",
+            "full_name": "Admin Audit",
+        },
+    )
+    assert res.status_code == 201
+    admin_tokens = await _login(client, email="admin-audit@example.com", password="SuperSecure123")
+    admin_auth = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+    features = {"attendance_pct": 66, "assignments_pct": 60, "quizzes_pct": 58, "exams_pct": 50, "gpa": 1.8}
+
+    res = await client.post("/ml/predict", headers=admin_auth, json={"features": features})
+    assert res.status_code == 200
+    p = res.json()["risk_probability"]
+    res = await client.post("/ml/assess", headers=admin_auth, json={"features": features})
+    assert res.status_code == 200
+    # Only ensemble-mode explanations show a probability.
+    res = await client.post("/ml/explain", headers=admin_auth, json={"features": features})
+    assert res.status_code == 200
+    res = await client.post("/ml/explain", headers=admin_auth, json={"features": features, "mode": "ensemble"})
+    assert res.status_code == 200
+    base = res.json()["base_probability"]
+    res = await client.post("/ml/counterfactual", headers=admin_auth, json={"features": features})
+    assert res.status_code == 200
+
+    audit = client._transport.app.state.prediction_audit
+    assert audit.pending == 4
+    await audit.close()
+
+    res = await session.execute(select(PredictionAuditEvent).order_by(PredictionAuditEvent.created_at))
+    events = list(res.scalars().all())
+    assert [e.endpoint for e in events] == ["predict", "assess", "explain", "counterfactual"]
+    assert [e.inference_mode for e in events] == ["full"] * 4
+    assert events[2].risk_probability == pytest.approx(base)
+    assert (events[2].threshold, events[2].classification) == (None, None)
+    assert events[3].threshold == 0.5
+    assert events[0].model_version == version
+    assert events[0].caller_role == "admin"
+    assert events[0].student_user_id is None
+    assert events[0].risk_probability == pytest.approx(p)
+    assert events[0].inputs["attendance_pct"] == 66
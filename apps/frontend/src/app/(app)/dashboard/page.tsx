@@ -103,7 +103,7 @@ export default function DashboardPage() {
       const exp = await apiFetchWithRefresh<ExplainResponse>("/ml/explain", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ top_k: 5 })
+        body: JSON.stringify({ top_k: 5, mode: "ensemble" })
       });
       setStudentExplain(exp);
     } catch (e) {
@@ -177,7 +177,7 @@ export default function DashboardPage() {
       const exp = await apiFetchWithRefresh<ExplainResponse>("/ml/explain", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ academic_record_id: recordId, top_k: 5 })
+        body: JSON.stringify({ academic_record_id: recordId, top_k: 5, mode: "ensemble" })
       });
       setSelectedExplain(exp);
     } catch (e) {
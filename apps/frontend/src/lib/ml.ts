@@ -26,6 +26,8 @@ export type ExplainRequest = {
   student_user_id?: string | null;
   features?: PredictFromFeatures | null;
   top_k?: number;
+  // "ensemble": impacts in probability units that add up to risk_probability - base_probability.
+  mode?: "lgbm" | "ensemble";
 };
 
 export type FactorPublic = {
@@ -40,6 +42,8 @@ export type FactorPublic = {
 export type ExplainResponse = {
   model_version: string;
   factors: FactorPublic[];
+  degraded?: boolean;
+  base_probability?: number | null;
 };
 
 export type ModelInfo = {